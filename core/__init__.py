@@ -1,13 +1,14 @@
 # core/__init__.py
 
 import os
-import sys
 import logging
-import sqlite3
 from logging.handlers import RotatingFileHandler
 from flask import Flask, render_template, send_from_directory
 from dotenv import load_dotenv
 from werkzeug.security import generate_password_hash
+from .db.queries import BACKTEST_EQUITY_SCHEMA, BACKTEST_TRADES_SCHEMA
+from .db.connection import connect_db
+from .db.migrations import apply_migrations
 
 class RequestLogFilter(logging.Filter):
     """Filter untuk menghilangkan noise dari terminal log."""
@@ -30,6 +31,7 @@ class RequestLogFilter(logging.Filter):
         noisy_get_paths = [
             # Notification requests (sangat berisik!)
             "GET /api/notifications/unread",
+            "GET /api/notifications/feed",
             
             # Bot polling requests
             "GET /api/bots/analysis",
@@ -64,18 +66,8 @@ class RequestLogFilter(logging.Filter):
 def init_database():
     """Initialize database and create tables if they don't exist."""
     try:
-        # Get the directory where the executable is located
-        if getattr(sys, 'frozen', False):
-            # Running as PyInstaller bundle
-            base_dir = os.path.dirname(sys.executable)
-            db_path = os.path.join(base_dir, 'bots.db')
-        else:
-            # Running as script
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            db_path = os.path.join(base_dir, '..', '..', 'bots.db')
-
-        # Create connection
-        conn = sqlite3.connect(db_path)
+        # Create connection (same resolved bots.db as every other module)
+        conn = connect_db()
         cursor = conn.cursor()
 
         # Create users table
@@ -140,6 +132,12 @@ def init_database():
             )
         ''')
 
+        # Create backtest_trades table (full trade log per backtest run)
+        cursor.execute(BACKTEST_TRADES_SCHEMA)
+
+        # Create backtest_equity table (equity curve per backtest run, one row per point)
+        cursor.execute(BACKTEST_EQUITY_SCHEMA)
+
         # Create trading_sessions table (AI Mentor)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS trading_sessions (
@@ -205,6 +203,9 @@ def init_database():
             )
 
         conn.commit()
+
+        # Terapkan migrasi skema (indeks, kolom baru) ke database lama maupun baru
+        apply_migrations(conn)
         conn.close()
 
     except Exception as e:
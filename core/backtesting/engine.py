@@ -3,6 +3,7 @@
 import math # Import modul math
 import logging # Import modul logging
 from core.strategies.strategy_map import STRATEGY_MAP
+from core.utils.indicator_cache import append_indicator
 
 logger = logging.getLogger(__name__)
 # Completely disable backtesting logs for silent operation
@@ -41,7 +42,7 @@ def run_backtest(strategy_id, params, historical_data_df, symbol_name=None):
     strategy_instance = strategy_class(bot_instance=MockBot(), params=params)
     df = historical_data_df.copy()
     df_with_signals = strategy_instance.analyze_df(df)
-    df_with_signals.ta.atr(length=14, append=True)
+    append_indicator(df_with_signals, 'atr', length=14)
     df_with_signals.dropna(inplace=True)
     df_with_signals.reset_index(inplace=True)
 
@@ -1,10 +1,15 @@
 # core/backtesting/enhanced_engine.py
 # Enhanced Backtesting Engine with ATR-based Risk Management and Spread Modeling
 
+import contextlib
 import math
 import logging
 import os
+import numpy as np
 from core.strategies.strategy_map import STRATEGY_MAP
+from core.utils.indicator_cache import append_indicator
+from core.utils.instrumentation import PROFILE_MODES, PhaseTimer, phase, profiling
+from core.backtesting.intrabar import IntrabarIndex
 
 logger = logging.getLogger(__name__)
 # Set appropriate logging level
@@ -15,6 +20,12 @@ else:
     logger.disabled = True
     logger.propagate = False
 
+# Simulation kernels selectable through engine_config['simulation_mode']
+SIMULATION_MODES = ('array', 'reference')
+
+# Bump whenever a change alters backtest results; it is part of every cached result key
+ENGINE_VERSION = '2'
+
 class InstrumentConfig:
     """Configuration for different trading instruments"""
     
@@ -242,62 +253,17 @@ class EnhancedBacktestEngine:
         
         return spread_cost
 
-def run_enhanced_backtest(strategy_id, params, historical_data_df, symbol_name=None, engine_config=None):
+def _simulate_reference(df_with_signals, engine, config, instrument_symbol,
+                        risk_percent, sl_atr_multiplier, tp_atr_multiplier, initial_capital,
+                        progress_callback=None):
     """
-    Run enhanced backtesting with realistic cost modeling
-    
-    Args:
-        strategy_id: Strategy to test
-        params: Strategy parameters
-        historical_data_df: Historical OHLC data
-        symbol_name: Symbol name for instrument detection
-        engine_config: Engine configuration options
+    Reference simulation: walks every bar as a DataFrame row.
+
+    Kept as the ground truth for the array kernel (``simulation_mode='reference'``).
     """
-    
-    # Initialize engine
-    engine_config = engine_config or {}
-    engine = EnhancedBacktestEngine(
-        enable_spread_costs=engine_config.get('enable_spread_costs', True),
-        enable_slippage=engine_config.get('enable_slippage', True),
-        enable_realistic_execution=engine_config.get('enable_realistic_execution', True)
-    )
-    
-    # Get strategy
-    strategy_class = STRATEGY_MAP.get(strategy_id)
-    if not strategy_class:
-        return {"error": "Strategy not found"}
-    
-    # Detect instrument and get configuration
-    if symbol_name:
-        instrument_symbol = symbol_name
-    elif historical_data_df.columns[0].count('_') > 0:
-        instrument_symbol = historical_data_df.columns[0].split('_')[0]
-    else:
-        instrument_symbol = "UNKNOWN"
-    
-    config = InstrumentConfig.get_config(instrument_symbol)
-    
-    # Initialize strategy
-    class MockBot:
-        def __init__(self):
-            self.market_for_mt5 = instrument_symbol
-            self.timeframe = "H1"
-            self.tf_map = {}
-    
-    strategy_instance = strategy_class(bot_instance=MockBot(), params=params)
-    df = historical_data_df.copy()
-    df_with_signals = strategy_instance.analyze_df(df)
-    df_with_signals.ta.atr(length=14, append=True)
-    df_with_signals.dropna(inplace=True)
-    df_with_signals.reset_index(inplace=True)
-    
-    if df_with_signals.empty:
-        return {"error": "Insufficient data for analysis"}
-    
     # Initialize state
     trades = []
     in_position = False
-    initial_capital = 10000.0
     capital = initial_capital
     equity_curve = [initial_capital]
     peak_equity = initial_capital
@@ -311,20 +277,13 @@ def run_enhanced_backtest(strategy_id, params, historical_data_df, symbol_name=N
     lot_size = 0.0
     entry_time = None
     
-    # Enhanced parameter handling
-    risk_percent = float(params.get('risk_percent', params.get('lot_size', 1.0)))
-    sl_atr_multiplier = float(params.get('sl_atr_multiplier', params.get('sl_pips', 2.0)))
-    tp_atr_multiplier = float(params.get('tp_atr_multiplier', params.get('tp_pips', 4.0)))
-    
-    # Apply instrument-specific parameter limits
-    if config == InstrumentConfig.GOLD:
-        risk_percent = min(risk_percent, 1.0)
-        sl_atr_multiplier = min(sl_atr_multiplier, 1.0)
-        tp_atr_multiplier = min(tp_atr_multiplier, 2.0)
-        logger.debug(f"GOLD PROTECTION: Risk={risk_percent}%, SL={sl_atr_multiplier}x ATR, TP={tp_atr_multiplier}x ATR")
+    n_bars = len(df_with_signals)
+    progress_step = _progress_step(n_bars)
     
     # Main backtesting loop
-    for i in range(1, len(df_with_signals)):
+    for i in range(1, n_bars):
+        if progress_callback and i % progress_step == 0:
+            progress_callback(i, n_bars)
         current_bar = df_with_signals.iloc[i]
         
         if capital <= 0:
@@ -446,6 +405,306 @@ def run_enhanced_backtest(strategy_id, params, historical_data_df, symbol_name=N
                 position_type = signal
                 
                 logger.debug(f"New {signal} position: Entry={entry_price:.4f}, SL={sl_price:.4f}, TP={tp_price:.4f}, Lot={lot_size}")
+
+    if progress_callback:
+        progress_callback(n_bars, n_bars)
+
+    return {
+        "trades": trades,
+        "equity_curve": equity_curve,
+        "capital": capital,
+        "max_drawdown": max_drawdown,
+        "total_spread_costs": total_spread_costs
+    }
+
+def _progress_step(n_bars):
+    """Bars between progress callbacks (about one per percent)"""
+    return max(1, n_bars // 100)
+
+def _first_exit_bar(low, high, start, lower, upper):
+    """
+    Index of the first bar at or after ``start`` whose low touches ``lower`` or
+    whose high touches ``upper``, or -1 if the position is never closed.
+
+    Scans in growing blocks so short trades stay cheap and long ones never fall
+    back to per-bar Python work.
+    """
+    n = len(low)
+    block = 64
+    while start < n:
+        stop = min(n, start + block)
+        hits = np.flatnonzero((low[start:stop] <= lower) | (high[start:stop] >= upper))
+        if hits.size:
+            return start + int(hits[0])
+        start = stop
+        block = min(block * 2, 8192)
+    return -1
+
+def _simulate_arrays(df_with_signals, engine, config, instrument_symbol,
+                     risk_percent, sl_atr_multiplier, tp_atr_multiplier, initial_capital,
+                     progress_callback=None, intrabar=None):
+    """
+    Array simulation kernel (``simulation_mode='array'``).
+
+    Pulls OHLC/ATR/signal into contiguous NumPy arrays once, jumps straight to
+    the next entry signal while flat and searches the SL/TP hit with array
+    comparisons while in a position. Produces the same trades, equity curve
+    and drawdown as `_simulate_reference`.
+
+    With an `IntrabarIndex`, exit bars that touch both SL and TP are resolved
+    from their sub-bars instead of assuming the stop loss.
+    """
+    high = np.ascontiguousarray(df_with_signals['high'].to_numpy())
+    low = np.ascontiguousarray(df_with_signals['low'].to_numpy())
+    close = np.ascontiguousarray(df_with_signals['close'].to_numpy())
+    atr = np.ascontiguousarray(df_with_signals['ATRr_14'].to_numpy())
+    times = df_with_signals['time'].array if 'time' in df_with_signals.columns else None
+    n_bars = len(close)
+
+    if 'signal' in df_with_signals.columns:
+        signals = df_with_signals['signal'].to_numpy()
+        is_buy = signals == 'BUY'
+        entry_bars = np.flatnonzero(is_buy | (signals == 'SELL'))
+    else:
+        is_buy = np.zeros(n_bars, dtype=bool)
+        entry_bars = np.empty(0, dtype=np.int64)
+
+    spread_pips = config['typical_spread_pips']
+    pip_size = config['pip_size']
+    slippage_pips = config.get('slippage_pips', 0)
+    contract_size = config['contract_size']
+    is_gold = config == InstrumentConfig.GOLD
+
+    trades = []
+    capital = initial_capital
+    equity_curve = [initial_capital]
+    peak_equity = initial_capital
+    max_drawdown = 0.0
+    total_spread_costs = 0.0
+
+    progress_step = _progress_step(n_bars)
+    next_report = progress_step
+
+    bar = 1
+    while bar < n_bars:
+        if progress_callback and bar >= next_report:
+            progress_callback(bar, n_bars)
+            next_report = bar + progress_step
+
+        # Flat: jump to the next bar carrying a BUY/SELL signal
+        next_entry = np.searchsorted(entry_bars, bar)
+        if next_entry >= len(entry_bars):
+            break
+        bar = int(entry_bars[next_entry])
+
+        signal = 'BUY' if is_buy[bar] else 'SELL'
+        atr_value = atr[bar]
+        if atr_value <= 0:
+            bar += 1
+            continue
+
+        sl_distance = atr_value * sl_atr_multiplier
+        tp_distance = atr_value * tp_atr_multiplier
+
+        lot_size = engine.calculate_position_size(
+            instrument_symbol, capital, risk_percent, sl_distance, atr_value, config
+        )
+        if lot_size <= 0:
+            bar += 1
+            continue
+
+        if is_gold:
+            estimated_risk = sl_distance * lot_size * contract_size
+            max_risk_dollar = capital * config.get('emergency_brake_percent', 0.05)
+            if estimated_risk > max_risk_dollar:
+                bar += 1
+                continue
+
+        entry_price = engine.calculate_realistic_entry_price(
+            signal, close[bar], spread_pips, pip_size, slippage_pips
+        )
+        if times is None:
+            raise KeyError('time')
+        entry_time = times[bar]
+
+        if signal == 'BUY':
+            sl_price = entry_price - sl_distance
+            tp_price = entry_price + tp_distance
+            exit_bar = _first_exit_bar(low, high, bar + 1, sl_price, tp_price)
+            if exit_bar < 0:
+                break
+            hit_sl = low[exit_bar] <= sl_price
+            ambiguous = hit_sl and high[exit_bar] >= tp_price
+        else:
+            sl_price = entry_price + sl_distance
+            tp_price = entry_price - tp_distance
+            exit_bar = _first_exit_bar(low, high, bar + 1, tp_price, sl_price)
+            if exit_bar < 0:
+                break
+            hit_sl = high[exit_bar] >= sl_price
+            ambiguous = hit_sl and low[exit_bar] <= tp_price
+
+        if ambiguous and intrabar is not None:
+            stop_loss_first = intrabar.stop_loss_first(exit_bar, signal == 'BUY', sl_price, tp_price)
+            if stop_loss_first is not None:
+                hit_sl = stop_loss_first
+
+        exit_price = engine.calculate_realistic_exit_price(
+            signal, sl_price if hit_sl else tp_price, spread_pips, pip_size, slippage_pips
+        )
+
+        profit_multiplier = lot_size * contract_size
+        if signal == 'BUY':
+            profit = (exit_price - entry_price) * profit_multiplier
+        else:
+            profit = (entry_price - exit_price) * profit_multiplier
+
+        spread_cost = engine.calculate_spread_cost(lot_size, spread_pips, config)
+        profit -= spread_cost
+        total_spread_costs += spread_cost
+
+        if not math.isfinite(profit):
+            profit = 0.0
+
+        capital += profit
+        trades.append({
+            'entry_time': str(entry_time),
+            'exit_time': str(times[exit_bar]),
+            'entry': entry_price,
+            'exit': exit_price,
+            'profit': profit,
+            'spread_cost': spread_cost,
+            'reason': 'Stop Loss' if hit_sl else 'Take Profit',
+            'position_type': signal,
+            'lot_size': lot_size
+        })
+
+        equity_curve.append(capital)
+        peak_equity = max(peak_equity, capital)
+        drawdown = (peak_equity - capital) / peak_equity if peak_equity > 0 else 0
+        max_drawdown = max(max_drawdown, drawdown)
+
+        if capital <= 0:
+            break
+
+        # A new position may open on the same bar the previous one closed
+        bar = exit_bar
+
+    if progress_callback:
+        progress_callback(n_bars, n_bars)
+
+    return {
+        "trades": trades,
+        "equity_curve": equity_curve,
+        "capital": capital,
+        "max_drawdown": max_drawdown,
+        "total_spread_costs": total_spread_costs
+    }
+
+class _BacktestBot:
+    """Minimal stand-in for TradingBot so strategies can run outside a live bot"""
+    def __init__(self, market_for_mt5):
+        self.market_for_mt5 = market_for_mt5
+        self.timeframe = "H1"
+        self.tf_map = {}
+
+def detect_instrument_symbol(historical_data_df, symbol_name=None):
+    """Resolve the instrument symbol from an explicit name or the first column prefix"""
+    if symbol_name:
+        return symbol_name
+    elif historical_data_df.columns[0].count('_') > 0:
+        return historical_data_df.columns[0].split('_')[0]
+    else:
+        return "UNKNOWN"
+
+def prepare_signal_frame(strategy_id, params, historical_data_df, instrument_symbol, timer=None):
+    """
+    Run the strategy's analyze_df and append ATR(14), dropping warm-up rows.
+
+    The returned frame can be simulated (in whole or in time slices) with
+    `backtest_signal_frame` without recomputing indicators. An optional
+    `PhaseTimer` records each step.
+    """
+    strategy_class = STRATEGY_MAP[strategy_id]
+    strategy_instance = strategy_class(bot_instance=_BacktestBot(instrument_symbol), params=params)
+    with phase(timer, 'copy'):
+        df = historical_data_df.copy()
+    with phase(timer, 'analyze_df'):
+        df_with_signals = strategy_instance.analyze_df(df)
+    with phase(timer, 'atr'):
+        append_indicator(df_with_signals, 'atr', length=14)
+    with phase(timer, 'dropna_reset'):
+        df_with_signals.dropna(inplace=True)
+        df_with_signals.reset_index(inplace=True)
+    return df_with_signals
+
+def resolve_risk_params(params, config):
+    """Risk percent and SL/TP ATR multipliers from params, with instrument-specific limits"""
+    risk_percent = float(params.get('risk_percent', params.get('lot_size', 1.0)))
+    sl_atr_multiplier = float(params.get('sl_atr_multiplier', params.get('sl_pips', 2.0)))
+    tp_atr_multiplier = float(params.get('tp_atr_multiplier', params.get('tp_pips', 4.0)))
+    
+    # Apply instrument-specific parameter limits
+    if config == InstrumentConfig.GOLD:
+        risk_percent = min(risk_percent, 1.0)
+        sl_atr_multiplier = min(sl_atr_multiplier, 1.0)
+        tp_atr_multiplier = min(tp_atr_multiplier, 2.0)
+        logger.debug(f"GOLD PROTECTION: Risk={risk_percent}%, SL={sl_atr_multiplier}x ATR, TP={tp_atr_multiplier}x ATR")
+    
+    return risk_percent, sl_atr_multiplier, tp_atr_multiplier
+
+def backtest_signal_frame(strategy_id, params, df_with_signals, instrument_symbol, engine_config=None,
+                          progress_callback=None, timer=None):
+    """
+    Simulate trading over an already analyzed frame (see `prepare_signal_frame`).
+
+    Returns the same result dictionary as `run_enhanced_backtest`; an optional
+    `PhaseTimer` records the simulation and summary phases.
+    """
+    engine_config = engine_config or {}
+    simulation_mode = engine_config.get('simulation_mode', 'array')
+    if simulation_mode not in SIMULATION_MODES:
+        return {"error": f"Unknown simulation mode: {simulation_mode}"}
+    if simulation_mode != 'array' and engine_config.get('intrabar_data') is not None:
+        return {"error": "Intrabar exit resolution requires simulation_mode='array'"}
+    engine = EnhancedBacktestEngine(
+        enable_spread_costs=engine_config.get('enable_spread_costs', True),
+        enable_slippage=engine_config.get('enable_slippage', True),
+        enable_realistic_execution=engine_config.get('enable_realistic_execution', True)
+    )
+    strategy_class = STRATEGY_MAP[strategy_id]
+    config = InstrumentConfig.get_config(instrument_symbol)
+    
+    if df_with_signals.empty:
+        return {"error": "Insufficient data for analysis"}
+    
+    risk_percent, sl_atr_multiplier, tp_atr_multiplier = resolve_risk_params(params, config)
+    
+    # Run the selected simulation
+    initial_capital = 10000.0
+    intrabar = None
+    if simulation_mode == 'array':
+        if engine_config.get('intrabar_data') is not None:
+            with phase(timer, 'intrabar_index'):
+                intrabar = IntrabarIndex.from_frames(df_with_signals, engine_config['intrabar_data'])
+        with phase(timer, 'simulate'):
+            simulation = _simulate_arrays(
+                df_with_signals, engine, config, instrument_symbol,
+                risk_percent, sl_atr_multiplier, tp_atr_multiplier, initial_capital,
+                progress_callback, intrabar
+            )
+    else:
+        with phase(timer, 'simulate'):
+            simulation = _simulate_reference(
+                df_with_signals, engine, config, instrument_symbol,
+                risk_percent, sl_atr_multiplier, tp_atr_multiplier, initial_capital,
+                progress_callback
+            )
+    trades = simulation['trades']
+    equity_curve = simulation['equity_curve']
+    capital = simulation['capital']
+    max_drawdown = simulation['max_drawdown']
+    total_spread_costs = simulation['total_spread_costs']
     
     # Calculate final results
     total_profit = capital - initial_capital
@@ -474,15 +733,82 @@ def run_enhanced_backtest(strategy_id, params, historical_data_df, symbol_name=N
         "losses": losses,
         "max_drawdown_percent": max_drawdown_clean,
         "equity_curve": equity_curve,
-        "trades": trades[-20:],  # Last 20 trades
+        "trades": trades if engine_config.get('include_all_trades') else trades[-20:],  # Last 20 trades by default
         "engine_config": {
             "spread_costs_enabled": engine.enable_spread_costs,
             "slippage_enabled": engine.enable_slippage,
             "realistic_execution": engine.enable_realistic_execution,
+            "simulation_mode": simulation_mode,
+            "intrabar": intrabar.stats() if intrabar is not None else None,
             "instrument_config": config
         }
     }
 
+def run_enhanced_backtest(strategy_id, params, historical_data_df, symbol_name=None, engine_config=None,
+                          progress_callback=None):
+    """
+    Run enhanced backtesting with realistic cost modeling
+    
+    Args:
+        strategy_id: Strategy to test
+        params: Strategy parameters
+        historical_data_df: Historical OHLC data
+        symbol_name: Symbol name for instrument detection
+        engine_config: Engine configuration options. ``simulation_mode`` selects
+            the kernel: 'array' (default) or 'reference' (bar-by-bar DataFrame loop);
+            ``include_all_trades`` returns the full trade list instead of the last 20;
+            ``intrabar_data`` (M1/M5 time/high/low DataFrame) resolves bars that touch
+            both SL and TP from their sub-bars (array kernel only);
+            ``timings`` adds a per-phase ``timings`` block (copy, analyze_df, atr,
+            dropna_reset, simulate, plus indicator and strategy sub-timings);
+            ``profile`` ('cprofile' or 'tracemalloc', with optional ``profile_top``
+            and ``profile_path``) adds a ``profile`` report
+        progress_callback: Optional ``callback(bars_done, total_bars)`` called about
+            once per percent of the simulation; an exception raised by it aborts the run
+    """
+    engine_config = engine_config or {}
+    if engine_config.get('simulation_mode', 'array') not in SIMULATION_MODES:
+        return {"error": f"Unknown simulation mode: {engine_config['simulation_mode']}"}
+    profile_mode = engine_config.get('profile')
+    if profile_mode and profile_mode not in PROFILE_MODES:
+        return {"error": f"Unknown profile mode: {profile_mode}"}
+    
+    # Get strategy
+    if strategy_id not in STRATEGY_MAP:
+        return {"error": "Strategy not found"}
+    
+    if not engine_config.get('timings') and not profile_mode:
+        # Detect instrument, then analyze and simulate
+        instrument_symbol = detect_instrument_symbol(historical_data_df, symbol_name)
+        df_with_signals = prepare_signal_frame(strategy_id, params, historical_data_df, instrument_symbol)
+        return backtest_signal_frame(strategy_id, params, df_with_signals, instrument_symbol, engine_config,
+                                     progress_callback)
+    
+    # Instrumented run: same pipeline inside a timer and, optionally, a profiler
+    timer = PhaseTimer()
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(timer.activate())
+        profile = None
+        if profile_mode:
+            profile = stack.enter_context(profiling(
+                profile_mode, engine_config.get('profile_top', 25), engine_config.get('profile_path')
+            ))
+        instrument_symbol = detect_instrument_symbol(historical_data_df, symbol_name)
+        df_with_signals = prepare_signal_frame(strategy_id, params, historical_data_df, instrument_symbol, timer)
+        results = backtest_signal_frame(strategy_id, params, df_with_signals, instrument_symbol, engine_config,
+                                        progress_callback, timer)
+    
+    if engine_config.get('timings'):
+        results['timings'] = {
+            **timer.to_dict(),
+            'bars': len(historical_data_df),
+            'analyzed_bars': len(df_with_signals),
+            'trades': results.get('total_trades', 0),
+        }
+    if profile is not None:
+        results['profile'] = profile
+    return results
+
 # Wrapper function for backward compatibility
 def run_backtest(strategy_id, params, historical_data_df, symbol_name=None):
     """Backward compatible wrapper for enhanced backtesting"""
@@ -0,0 +1,158 @@
+# core/backtesting/intrabar.py
+"""
+🔬 Intrabar Exit Resolution
+
+When one H1 bar touches both the stop loss and the take profit, the bar alone
+cannot tell which was hit first and the engine assumes the stop loss. With a
+lower-timeframe series (M1/M5) for the same symbol, `IntrabarIndex` replays
+just that bar's sub-bars to find the real order.
+
+The parent-bar -> sub-bar ranges are computed once with two binary searches,
+and sub-bars are only read for ambiguous bars, so the extra cost scales with
+the number of ambiguous exits rather than with the size of the M1 series.
+
+Enable it through ``engine_config['intrabar_data']`` (a DataFrame with time,
+high and low columns, e.g. from `load_intrabar_data`).
+"""
+
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.utils.market_store import load_csv_dataset
+
+logger = logging.getLogger(__name__)
+
+# Lower timeframes tried in order, with the file-name spellings used by the lab downloads
+INTRABAR_TIMEFRAMES = (('M1', ('M1', '1')), ('M5', ('M5', '5')))
+
+
+def _time_ns(times) -> np.ndarray:
+    return pd.to_datetime(pd.Series(times)).to_numpy(dtype='datetime64[ns]').view('int64')
+
+
+def _bar_ns(parent_ns):
+    """Parent bar length: the median step between bar opens, or None for a single bar"""
+    steps = np.diff(parent_ns)
+    steps = steps[steps > 0]
+    return int(np.median(steps)) if steps.size else None
+
+
+def intrabar_window(parent_times):
+    """
+    (start, end) of the sub-bars the parent bars cover, for `load_intrabar_data`.
+
+    The last parent bar runs for a full bar length after its open, so `end` is
+    that open plus one bar minus one second. With a single parent bar the
+    length is unknown and `end` is None (everything from `start` onwards).
+    """
+    parent_ns = _time_ns(parent_times)
+    if not len(parent_ns):
+        return None, None
+    bar_ns = _bar_ns(parent_ns)
+    start = pd.Timestamp(parent_ns[0])
+    if bar_ns is None:
+        return start, None
+    return start, pd.Timestamp(parent_ns[-1] + bar_ns) - pd.Timedelta(seconds=1)
+
+
+class IntrabarIndex:
+    """Sub-bar ranges for each parent bar plus the sub-bar high/low arrays"""
+
+    def __init__(self, parent_times, sub_times, sub_high, sub_low, bar_ns=None):
+        parent_ns = _time_ns(parent_times)
+        sub_ns = _time_ns(sub_times)
+        if len(sub_ns) and np.any(sub_ns[1:] < sub_ns[:-1]):
+            order = np.argsort(sub_ns, kind='stable')
+            sub_ns = sub_ns[order]
+            sub_high = np.asarray(sub_high)[order]
+            sub_low = np.asarray(sub_low)[order]
+
+        if bar_ns is None:
+            bar_ns = _bar_ns(parent_ns)
+        if bar_ns is None:
+            # A single parent bar owns every sub-bar from its open onwards
+            bar_ns = max(int(sub_ns[-1] - parent_ns[0]) + 1, 0) if len(sub_ns) and len(parent_ns) else 0
+
+        # A parent bar spans [open, next open) but never more than one bar length (gaps, weekends)
+        ends = parent_ns + bar_ns
+        if len(parent_ns) > 1:
+            ends[:-1] = np.minimum(ends[:-1], parent_ns[1:])
+        self.starts = np.searchsorted(sub_ns, parent_ns, side='left')
+        self.stops = np.searchsorted(sub_ns, ends, side='left')
+        self.high = np.ascontiguousarray(sub_high, dtype=float)
+        self.low = np.ascontiguousarray(sub_low, dtype=float)
+        self.ambiguous = 0
+        self.resolved = 0
+
+    @classmethod
+    def from_frames(cls, parent_df, sub_df):
+        return cls(parent_df['time'].to_numpy(), sub_df['time'].to_numpy(),
+                   sub_df['high'].to_numpy(), sub_df['low'].to_numpy())
+
+    def coverage(self) -> float:
+        """Fraction of parent bars that have at least one sub-bar"""
+        if not len(self.starts):
+            return 0.0
+        return float(np.mean(self.stops > self.starts))
+
+    def stop_loss_first(self, bar, is_buy, sl_price, tp_price):
+        """
+        Whether the stop loss was hit before the take profit inside parent `bar`.
+
+        Returns None when the sub-bars cannot decide (no data for the bar, or
+        both levels touched within the same sub-bar); callers then keep the
+        stop-loss-first rule.
+        """
+        self.ambiguous += 1
+        start, stop = self.starts[bar], self.stops[bar]
+        if stop <= start:
+            return None
+        low = self.low[start:stop]
+        high = self.high[start:stop]
+        if is_buy:
+            sl_hits = np.flatnonzero(low <= sl_price)
+            tp_hits = np.flatnonzero(high >= tp_price)
+        else:
+            sl_hits = np.flatnonzero(high >= sl_price)
+            tp_hits = np.flatnonzero(low <= tp_price)
+        first_sl = sl_hits[0] if sl_hits.size else None
+        first_tp = tp_hits[0] if tp_hits.size else None
+        if (first_sl is None and first_tp is None) or first_sl == first_tp:
+            return None
+        self.resolved += 1
+        if first_sl is None:
+            return False
+        if first_tp is None:
+            return True
+        return bool(first_sl < first_tp)
+
+    def stats(self) -> dict:
+        return {
+            'ambiguous_exits': self.ambiguous,
+            'resolved_exits': self.resolved,
+            'coverage': round(self.coverage(), 4),
+        }
+
+
+def find_intrabar_file(symbol, data_dirs):
+    """First M1 (then M5) CSV for `symbol` in `data_dirs`; returns (path, timeframe) or (None, None)"""
+    for timeframe, spellings in INTRABAR_TIMEFRAMES:
+        for directory in data_dirs:
+            for spelling in spellings:
+                path = os.path.join(directory, f"{symbol}_{spelling}_data.csv")
+                if os.path.exists(path):
+                    return path, timeframe
+    return None, None
+
+
+def load_intrabar_data(symbol, data_dirs, start=None, end=None):
+    """Load the lower-timeframe time/high/low series for `symbol`; returns (df, timeframe) or (None, None)"""
+    path, timeframe = find_intrabar_file(symbol, data_dirs)
+    if path is None:
+        return None, None
+    df = load_csv_dataset(path, start=start, end=end, columns=['high', 'low'])
+    logger.info(f"Intrabar data for {symbol}: {timeframe}, {len(df)} bars from {path}")
+    return df, timeframe
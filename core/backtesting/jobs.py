@@ -0,0 +1,192 @@
+# core/backtesting/jobs.py
+"""
+⏳ Background Backtest Jobs
+
+A bounded worker pool for long backtests so HTTP requests return a job id
+immediately. Jobs report their phase and progress (percent of bars
+simulated), can be cancelled while queued or running, and notify waiters on
+every change so routes can stream updates.
+
+Configuration (environment):
+- BACKTEST_MAX_WORKERS: concurrent jobs (default 2)
+- BACKTEST_MAX_QUEUED: jobs waiting or running before new ones are refused (default 20)
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested"""
+
+
+class QueueFull(Exception):
+    """Raised when the queue already holds its limit of active jobs"""
+
+
+class BacktestJob:
+    """State of one queued/running/finished job"""
+
+    def __init__(self, queue, description=None):
+        self.id = uuid.uuid4().hex
+        self.description = description or {}
+        self.status = 'queued'
+        self.phase = None
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.version = 0
+        self._queue = queue
+        self._cancel_event = threading.Event()
+        self._future = None
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def update(self, **fields):
+        """Set fields and wake anyone waiting on this job"""
+        with self._queue._changed:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self.version += 1
+            self._queue._changed.notify_all()
+
+    def set_phase(self, phase):
+        self.check_cancelled()
+        self.update(phase=phase)
+
+    def report_progress(self, bars_done, total_bars):
+        """Progress callback for the simulation kernels; also the cancellation point"""
+        self.check_cancelled()
+        percent = round(100.0 * bars_done / total_bars, 1) if total_bars else 100.0
+        if percent != self.progress:
+            self.update(progress=percent)
+
+    def to_dict(self, include_result=True):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'phase': self.phase,
+            'progress': self.progress,
+            'description': self.description,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+class BacktestJobQueue:
+    """Bounded thread pool running BacktestJobs"""
+
+    def __init__(self, max_workers=2, max_active=20, max_history=100):
+        self.max_workers = max_workers
+        self.max_active = max_active
+        self.max_history = max_history
+        self._jobs = OrderedDict()
+        self._changed = threading.Condition()
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='backtest-job')
+        return self._executor
+
+    def active_count(self):
+        return sum(1 for job in self._jobs.values() if job.status not in TERMINAL_STATUSES)
+
+    def submit(self, fn, *args, description=None):
+        """
+        Queue `fn(job, *args)`; its return value becomes the job result.
+
+        Raises QueueFull when `max_active` jobs are already queued or running.
+        """
+        with self._changed:
+            if self.active_count() >= self.max_active:
+                raise QueueFull(f"Backtest queue is full ({self.max_active} active jobs)")
+            job = BacktestJob(self, description)
+            self._jobs[job.id] = job
+            self._prune()
+        job._future = self._get_executor().submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job, fn, args):
+        if job.cancel_requested:
+            job.update(status='cancelled', finished_at=time.time())
+            return
+        job.update(status='running', started_at=time.time())
+        try:
+            result = fn(job, *args)
+        except JobCancelled:
+            job.update(status='cancelled', finished_at=time.time())
+            logger.info(f"Backtest job {job.id} cancelled")
+        except Exception as e:
+            logger.error(f"Backtest job {job.id} failed: {e}", exc_info=True)
+            job.update(status='failed', error=str(e), finished_at=time.time())
+        else:
+            job.update(status='completed', result=result, progress=100.0, finished_at=time.time())
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_history"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in TERMINAL_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._changed:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id):
+        """Request cancellation; returns False for unknown or already finished jobs"""
+        job = self._jobs.get(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return False
+        job._cancel_event.set()
+        if job._future is not None and job._future.cancel():
+            job.update(status='cancelled', finished_at=time.time())
+        else:
+            job.update()
+        return True
+
+    def wait_for_change(self, job, seen_version, timeout=15.0):
+        """Block until the job's version moves past `seen_version` or the timeout passes"""
+        with self._changed:
+            self._changed.wait_for(lambda: job.version != seen_version, timeout=timeout)
+            return job.version
+
+    def shutdown(self, wait=False):
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+# Process-wide queue used by the backtest routes
+backtest_job_queue = BacktestJobQueue(
+    max_workers=int(os.getenv('BACKTEST_MAX_WORKERS', '2')),
+    max_active=int(os.getenv('BACKTEST_MAX_QUEUED', '20')),
+)
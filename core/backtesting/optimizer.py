@@ -0,0 +1,339 @@
+# core/backtesting/optimizer.py
+"""
+🔬 Parallel Parameter Sweep Optimizer
+
+Runs grid or random sweeps over a strategy's definable parameters (plus the
+risk/SL/TP multipliers) with `run_enhanced_backtest`, fanned out over a
+process pool, and returns a ranked table of results.
+
+Features:
+- Grid and seeded random sampling over STRATEGY_MAP definable params
+- Process pool with configurable worker count and chunk size
+- Resumable JSON-lines checkpoint so an interrupted sweep skips finished combinations
+"""
+
+import itertools
+import json
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.backtesting.enhanced_engine import run_enhanced_backtest
+from core.strategies.strategy_map import STRATEGY_MAP
+
+logger = logging.getLogger(__name__)
+
+# Engine-level parameters that can be swept alongside the strategy's own params
+RISK_PARAMS = ('risk_percent', 'sl_atr_multiplier', 'tp_atr_multiplier')
+
+# Result fields kept per combination (equity curves and trade logs are dropped)
+SUMMARY_FIELDS = (
+    'total_trades', 'final_capital', 'total_profit_usd', 'total_spread_costs',
+    'win_rate_percent', 'wins', 'losses', 'max_drawdown_percent'
+)
+
+# Metrics where a smaller value ranks higher
+ASCENDING_METRICS = ('max_drawdown_percent', 'total_spread_costs', 'losses')
+
+# Per-process state set by the pool initializer so the DataFrame is sent once per worker
+_worker_state = {}
+
+
+def get_sweepable_params(strategy_id: str) -> List[str]:
+    """Names of parameters that can be swept for a strategy"""
+    strategy_class = STRATEGY_MAP.get(strategy_id)
+    if not strategy_class:
+        raise ValueError(f"Strategy '{strategy_id}' not found")
+    return [p['name'] for p in strategy_class.get_definable_params()] + list(RISK_PARAMS)
+
+
+def _expand_range(name: str, spec: Any, mode: str) -> Any:
+    """
+    Turn a range spec into a list of values (or a (min, max) tuple for
+    continuous random sampling).
+
+    Accepted specs: a list of values, a scalar, or a dict with min/max and
+    an optional step.
+    """
+    if isinstance(spec, (list, tuple)):
+        if not spec:
+            raise ValueError(f"Empty value list for parameter '{name}'")
+        return list(spec)
+    if isinstance(spec, dict):
+        low, high, step = spec.get('min'), spec.get('max'), spec.get('step')
+        if low is None or high is None:
+            raise ValueError(f"Range for '{name}' needs both 'min' and 'max'")
+        if step is None:
+            if mode == 'grid':
+                raise ValueError(f"Grid sweep needs a 'step' for parameter '{name}'")
+            return (low, high)
+        if step <= 0:
+            raise ValueError(f"Step for '{name}' must be positive")
+        if all(isinstance(v, int) for v in (low, high, step)):
+            return list(range(low, high + 1, step))
+        count = int(np.floor((high - low) / step + 1e-9)) + 1
+        return [round(low + i * step, 10) for i in range(count)]
+    return [spec]
+
+
+def build_param_combinations(strategy_id: str, param_ranges: Dict[str, Any], mode: str = 'grid',
+                             n_samples: Optional[int] = None, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Build the list of parameter combinations for a sweep.
+
+    Args:
+        strategy_id: Key in STRATEGY_MAP
+        param_ranges: Parameter name -> list of values or {'min', 'max', 'step'}
+        mode: 'grid' (full cartesian product) or 'random' (seeded sampling)
+        n_samples: Number of combinations to draw in random mode
+        seed: Random seed, so a resumed random sweep draws the same combinations
+    """
+    if mode not in ('grid', 'random'):
+        raise ValueError(f"Unknown sweep mode: {mode}")
+
+    allowed = set(get_sweepable_params(strategy_id))
+    unknown = set(param_ranges) - allowed
+    if unknown:
+        raise ValueError(f"Parameters not definable for {strategy_id}: {sorted(unknown)}")
+
+    names = sorted(param_ranges)
+    values = [_expand_range(name, param_ranges[name], mode) for name in names]
+
+    if mode == 'grid':
+        return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+    if not n_samples or n_samples <= 0:
+        raise ValueError("Random sweep needs a positive n_samples")
+
+    rng = random.Random(seed)
+    discrete = all(isinstance(v, list) for v in values)
+    grid_size = int(np.prod([len(v) for v in values])) if discrete else None
+    target = min(n_samples, grid_size) if discrete else n_samples
+
+    combinations, seen = [], set()
+    attempts = 0
+    while len(combinations) < target and attempts < target * 50:
+        attempts += 1
+        combo = {}
+        for name, choices in zip(names, values):
+            if isinstance(choices, list):
+                combo[name] = rng.choice(choices)
+            elif all(isinstance(v, int) for v in choices):
+                combo[name] = rng.randint(choices[0], choices[1])
+            else:
+                combo[name] = round(rng.uniform(choices[0], choices[1]), 6)
+        key = combination_key(combo)
+        if key not in seen:
+            seen.add(key)
+            combinations.append(combo)
+    return combinations
+
+
+def combination_key(params: Dict[str, Any]) -> str:
+    """Stable key identifying a parameter combination in the checkpoint"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def summarize_results(results: dict) -> dict:
+    """Reduce a backtest result to the SUMMARY_FIELDS metrics"""
+    if results.get('error'):
+        return {'error': results['error']}
+    return {field: results.get(field) for field in SUMMARY_FIELDS}
+
+
+def _sweep_state(strategy_id, base_params, historical_data_df, symbol_name, engine_config):
+    return dict(
+        strategy_id=strategy_id, base_params=base_params, df=historical_data_df,
+        symbol_name=symbol_name, engine_config=engine_config
+    )
+
+
+def _init_worker(*args):
+    _worker_state.update(_sweep_state(*args))
+
+
+def _run_chunk(combinations: List[Dict[str, Any]], state: Optional[dict] = None) -> List[dict]:
+    """Run a chunk of combinations; `state` is passed in-process, worker processes use _worker_state"""
+    state = _worker_state if state is None else state
+    rows = []
+    for combo in combinations:
+        params = {**state['base_params'], **combo}
+        try:
+            results = run_enhanced_backtest(
+                state['strategy_id'], params, state['df'],
+                symbol_name=state['symbol_name'], engine_config=state['engine_config']
+            )
+            metrics = summarize_results(results)
+        except Exception as e:
+            metrics = {'error': str(e)}
+        rows.append({'key': combination_key(combo), 'params': combo, 'metrics': metrics})
+    return rows
+
+
+def _checkpoint_meta(strategy_id, symbol_name, historical_data_df, base_params=None, engine_config=None,
+                     mode='grid', n_samples=None, seed=0, param_ranges=None) -> dict:
+    """
+    Identity of a sweep's inputs, written as the checkpoint's first line.
+
+    Rows are matched by combination alone, so everything else that changes
+    their metrics (data, merged fixed params, engine settings, sampling) must
+    be part of the meta; it is normalized through JSON so it compares equal to
+    the copy read back from the file.
+    """
+    if 'time' in historical_data_df.columns:
+        times = historical_data_df['time']
+    else:
+        times = historical_data_df.index.to_series()
+    has_bars = len(historical_data_df) > 0
+    meta = {
+        'strategy_id': strategy_id,
+        'symbol': symbol_name,
+        'bars': int(len(historical_data_df)),
+        'first_time': str(times.iloc[0]) if has_bars else None,
+        'last_time': str(times.iloc[-1]) if has_bars else None,
+        'base_params': base_params or {},
+        'engine_config': engine_config or {},
+        'mode': mode,
+        'n_samples': n_samples,
+        'seed': seed,
+        'param_ranges': param_ranges or {},
+    }
+    return json.loads(json.dumps(meta, sort_keys=True, default=_json_default))
+
+
+def _json_default(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return str(value)
+
+
+def _load_checkpoint(checkpoint_path: str, meta: dict) -> Dict[str, dict]:
+    """Read finished rows from a checkpoint, refusing one written for another sweep"""
+    done = {}
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A half-written last line from an interrupted run
+                logger.warning(f"Skipping corrupt checkpoint line {line_no + 1} in {checkpoint_path}")
+                continue
+            if 'meta' in record:
+                if record['meta'] != meta:
+                    raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different sweep: {record['meta']}")
+                continue
+            done[record['key']] = record
+    return done
+
+
+def metric_sort_key(metrics: dict, rank_by: str = 'total_profit_usd') -> tuple:
+    """Sort key putting the best value of `rank_by` first and failed runs last"""
+    value = metrics.get(rank_by)
+    if metrics.get('error') or value is None:
+        return (1, 0.0)
+    return (0, value if rank_by in ASCENDING_METRICS else -value)
+
+
+def rank_results(rows: List[dict], rank_by: str = 'total_profit_usd') -> List[dict]:
+    """Flatten sweep rows into a table sorted best-first by `rank_by`; errors go last"""
+    table = [{**row['params'], **row['metrics']} for row in rows]
+    table.sort(key=lambda entry: metric_sort_key(entry, rank_by))
+    for position, entry in enumerate(table, start=1):
+        entry['rank'] = position
+    return table
+
+
+def run_parameter_sweep(strategy_id: str, historical_data_df, param_ranges: Dict[str, Any],
+                        symbol_name: Optional[str] = None, base_params: Optional[Dict[str, Any]] = None,
+                        mode: str = 'grid', n_samples: Optional[int] = None, seed: int = 0,
+                        workers: Optional[int] = None, chunk_size: int = 10,
+                        checkpoint_path: Optional[str] = None, rank_by: str = 'total_profit_usd',
+                        engine_config: Optional[dict] = None) -> dict:
+    """
+    Sweep a strategy's parameters and return a ranked table.
+
+    Args:
+        strategy_id: Key in STRATEGY_MAP
+        historical_data_df: Historical OHLC data shared by every run
+        param_ranges: Parameter name -> values/range (see build_param_combinations)
+        symbol_name: Symbol used for instrument detection
+        base_params: Fixed params applied under every combination
+        mode / n_samples / seed: Grid or random sampling options
+        workers: Process count (defaults to os.cpu_count(); 1 runs in-process)
+        chunk_size: Combinations per task sent to a worker
+        checkpoint_path: JSON-lines file; finished combinations are appended and skipped on resume
+        rank_by: Result metric used for ranking
+        engine_config: Passed through to run_enhanced_backtest
+
+    Returns:
+        dict with the ranked table and run counts
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    combinations = build_param_combinations(strategy_id, param_ranges, mode, n_samples, seed)
+    defaults = {p['name']: p.get('default') for p in STRATEGY_MAP[strategy_id].get_definable_params()}
+    base = {**defaults, **(base_params or {})}
+
+    meta = _checkpoint_meta(strategy_id, symbol_name, historical_data_df, base, engine_config,
+                            mode, n_samples, seed, param_ranges)
+    done = _load_checkpoint(checkpoint_path, meta)
+    pending = [c for c in combinations if combination_key(c) not in done]
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    logger.info(f"Sweep {strategy_id}: {len(combinations)} combinations, {len(done)} from checkpoint, {len(pending)} to run")
+
+    checkpoint_file = None
+    if checkpoint_path:
+        new_file = not os.path.exists(checkpoint_path)
+        checkpoint_file = open(checkpoint_path, 'a', encoding='utf-8')
+        if new_file:
+            checkpoint_file.write(json.dumps({'meta': meta}) + '\n')
+            checkpoint_file.flush()
+
+    def record(rows):
+        for row in rows:
+            done[row['key']] = row
+        if checkpoint_file:
+            for row in rows:
+                checkpoint_file.write(json.dumps(row, default=_json_default) + '\n')
+            checkpoint_file.flush()
+
+    worker_count = workers or os.cpu_count() or 1
+    init_args = (strategy_id, base, historical_data_df, symbol_name, engine_config)
+    try:
+        if worker_count == 1 or len(chunks) <= 1:
+            # No module global in-process, so the DataFrame is not pinned after the sweep
+            state = _sweep_state(*init_args)
+            for chunk in chunks:
+                record(_run_chunk(chunk, state))
+        else:
+            with ProcessPoolExecutor(max_workers=worker_count, initializer=_init_worker, initargs=init_args) as pool:
+                futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    record(future.result())
+    finally:
+        if checkpoint_file:
+            checkpoint_file.close()
+
+    rows = [done[combination_key(c)] for c in combinations if combination_key(c) in done]
+    return {
+        'strategy_id': strategy_id,
+        'symbol': symbol_name,
+        'mode': mode,
+        'total_combinations': len(combinations),
+        'resumed_from_checkpoint': len(combinations) - len(pending),
+        'ranked_by': rank_by,
+        'results': rank_results(rows, rank_by),
+    }
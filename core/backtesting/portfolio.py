@@ -0,0 +1,300 @@
+# core/backtesting/portfolio.py
+"""
+📊 Multi-Symbol Portfolio Backtester
+
+Runs several instruments, each with its own strategy, against one shared
+equity. Every symbol is analyzed once with `prepare_signal_frame`, the bar
+times are merged into a single axis, and the simulation walks only the events
+(entry signals and SL/TP exits) in time order, so cost scales with trades
+rather than symbols x bars.
+
+Per symbol the rules match the single-symbol array kernel: one position at a
+time, SL before TP, exits processed before entries on the same bar and
+re-entry allowed on the exit bar. Position size is taken from the shared
+capital at the moment of entry, using the symbol's own InstrumentConfig.
+"""
+
+import heapq
+import logging
+import math
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.enhanced_engine import (
+    EnhancedBacktestEngine, InstrumentConfig, _first_exit_bar, prepare_signal_frame,
+    resolve_risk_params
+)
+from core.strategies.strategy_map import STRATEGY_MAP
+
+logger = logging.getLogger(__name__)
+
+# Event kinds; exits sort before entries that share a timestamp
+_EXIT, _ENTRY = 0, 1
+
+
+def _normalize_assignment(assignment: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    if isinstance(assignment, str):
+        return {'strategy_id': assignment, 'params': {}}
+    return {'strategy_id': assignment.get('strategy_id'), 'params': assignment.get('params') or {}}
+
+
+def _build_book(symbol: str, strategy_id: str, params: dict, frame: pd.DataFrame) -> dict:
+    """Contiguous arrays and risk settings for one symbol's analyzed frame"""
+    config = InstrumentConfig.get_config(symbol)
+    risk_percent, sl_atr_multiplier, tp_atr_multiplier = resolve_risk_params(params, config)
+    if 'signal' in frame.columns:
+        signals = frame['signal'].to_numpy()
+        is_buy = signals == 'BUY'
+        entry_bars = np.flatnonzero(is_buy | (signals == 'SELL'))
+    else:
+        is_buy = np.zeros(len(frame), dtype=bool)
+        entry_bars = np.empty(0, dtype=np.int64)
+    return {
+        'symbol': symbol,
+        'strategy_id': strategy_id,
+        'config': config,
+        'risk_percent': risk_percent,
+        'sl_atr_multiplier': sl_atr_multiplier,
+        'tp_atr_multiplier': tp_atr_multiplier,
+        'high': np.ascontiguousarray(frame['high'].to_numpy()),
+        'low': np.ascontiguousarray(frame['low'].to_numpy()),
+        'close': np.ascontiguousarray(frame['close'].to_numpy()),
+        'atr': np.ascontiguousarray(frame['ATRr_14'].to_numpy()),
+        'times': frame['time'].array,
+        'ns': pd.to_datetime(frame['time']).to_numpy(dtype='datetime64[ns]').view('int64'),
+        'is_buy': is_buy,
+        'entry_bars': entry_bars,
+        'position': None,
+    }
+
+
+def run_portfolio_backtest(data_by_symbol: Dict[str, pd.DataFrame],
+                           strategy_assignments: Dict[str, Union[str, Dict[str, Any]]],
+                           initial_capital: float = 10000.0, engine_config: Optional[dict] = None,
+                           max_open_positions: Optional[int] = None) -> dict:
+    """
+    Backtest several symbols against one shared capital.
+
+    Args:
+        data_by_symbol: Symbol -> historical OHLC DataFrame with a 'time' column
+        strategy_assignments: Symbol -> strategy_id, or {'strategy_id', 'params'}
+        initial_capital: Starting equity shared by all symbols
+        engine_config: Cost options as in run_enhanced_backtest; ``include_all_trades``
+            returns the full trade list instead of the last 20
+        max_open_positions: Optional cap on concurrent positions across symbols
+
+    Returns:
+        dict with portfolio metrics, the closed-trade equity curve and per-symbol attribution
+    """
+    engine_config = engine_config or {}
+    engine = EnhancedBacktestEngine(
+        enable_spread_costs=engine_config.get('enable_spread_costs', True),
+        enable_slippage=engine_config.get('enable_slippage', True),
+        enable_realistic_execution=engine_config.get('enable_realistic_execution', True)
+    )
+
+    books, errors = [], {}
+    for symbol, assignment in strategy_assignments.items():
+        assignment = _normalize_assignment(assignment)
+        strategy_id = assignment['strategy_id']
+        if strategy_id not in STRATEGY_MAP:
+            errors[symbol] = "Strategy not found"
+            continue
+        if symbol not in data_by_symbol:
+            errors[symbol] = "No data for symbol"
+            continue
+        frame = prepare_signal_frame(strategy_id, assignment['params'], data_by_symbol[symbol], symbol)
+        if frame.empty:
+            errors[symbol] = "Insufficient data for analysis"
+            continue
+        books.append(_build_book(symbol, strategy_id, assignment['params'], frame))
+
+    if not books:
+        return {"error": "No symbols could be backtested", "symbol_errors": errors}
+
+    # Merged time axis; each symbol's bars map to positions on it
+    time_axis = np.unique(np.concatenate([book['ns'] for book in books]))
+    for book in books:
+        book['axis_index'] = np.searchsorted(time_axis, book['ns'])
+
+    events = []
+
+    def schedule_entry(s, start):
+        book = books[s]
+        pos = np.searchsorted(book['entry_bars'], start)
+        if pos < len(book['entry_bars']):
+            bar = int(book['entry_bars'][pos])
+            heapq.heappush(events, (int(book['axis_index'][bar]), _ENTRY, s, bar))
+
+    for s in range(len(books)):
+        schedule_entry(s, 1)
+
+    trades = []
+    capital = initial_capital
+    equity_curve = [initial_capital]
+    equity_times = [str(pd.Timestamp(time_axis[0]))]
+    peak_equity = initial_capital
+    max_drawdown = 0.0
+    total_spread_costs = 0.0
+    open_positions = 0
+
+    while events:
+        _, kind, s, bar = heapq.heappop(events)
+        book = books[s]
+        config = book['config']
+        spread_pips = config['typical_spread_pips']
+        pip_size = config['pip_size']
+        slippage_pips = config.get('slippage_pips', 0)
+
+        if kind == _EXIT:
+            position = book['position']
+            book['position'] = None
+            open_positions -= 1
+            signal = position['signal']
+            exit_price = engine.calculate_realistic_exit_price(
+                signal, position['sl_price'] if position['hit_sl'] else position['tp_price'],
+                spread_pips, pip_size, slippage_pips
+            )
+            profit_multiplier = position['lot_size'] * config['contract_size']
+            if signal == 'BUY':
+                profit = (exit_price - position['entry_price']) * profit_multiplier
+            else:
+                profit = (position['entry_price'] - exit_price) * profit_multiplier
+
+            spread_cost = engine.calculate_spread_cost(position['lot_size'], spread_pips, config)
+            profit -= spread_cost
+            total_spread_costs += spread_cost
+            if not math.isfinite(profit):
+                profit = 0.0
+
+            capital += profit
+            exit_time = str(book['times'][bar])
+            trades.append({
+                'symbol': book['symbol'],
+                'strategy_id': book['strategy_id'],
+                'entry_time': position['entry_time'],
+                'exit_time': exit_time,
+                'entry': position['entry_price'],
+                'exit': exit_price,
+                'profit': profit,
+                'spread_cost': spread_cost,
+                'reason': 'Stop Loss' if position['hit_sl'] else 'Take Profit',
+                'position_type': signal,
+                'lot_size': position['lot_size']
+            })
+            equity_curve.append(capital)
+            equity_times.append(exit_time)
+            peak_equity = max(peak_equity, capital)
+            drawdown = (peak_equity - capital) / peak_equity if peak_equity > 0 else 0
+            max_drawdown = max(max_drawdown, drawdown)
+
+            if capital <= 0:
+                break
+            # A new position may open on the same bar the previous one closed
+            schedule_entry(s, bar)
+            continue
+
+        # Entry signal
+        if max_open_positions and open_positions >= max_open_positions:
+            schedule_entry(s, bar + 1)
+            continue
+
+        signal = 'BUY' if book['is_buy'][bar] else 'SELL'
+        atr_value = book['atr'][bar]
+        if atr_value <= 0:
+            schedule_entry(s, bar + 1)
+            continue
+
+        sl_distance = atr_value * book['sl_atr_multiplier']
+        tp_distance = atr_value * book['tp_atr_multiplier']
+        lot_size = engine.calculate_position_size(
+            book['symbol'], capital, book['risk_percent'], sl_distance, atr_value, config
+        )
+        if lot_size <= 0:
+            schedule_entry(s, bar + 1)
+            continue
+
+        if config == InstrumentConfig.GOLD:
+            estimated_risk = sl_distance * lot_size * config['contract_size']
+            max_risk_dollar = capital * config.get('emergency_brake_percent', 0.05)
+            if estimated_risk > max_risk_dollar:
+                schedule_entry(s, bar + 1)
+                continue
+
+        entry_price = engine.calculate_realistic_entry_price(
+            signal, book['close'][bar], spread_pips, pip_size, slippage_pips
+        )
+        low, high = book['low'], book['high']
+        if signal == 'BUY':
+            sl_price = entry_price - sl_distance
+            tp_price = entry_price + tp_distance
+            exit_bar = _first_exit_bar(low, high, bar + 1, sl_price, tp_price)
+            hit_sl = exit_bar >= 0 and low[exit_bar] <= sl_price
+        else:
+            sl_price = entry_price + sl_distance
+            tp_price = entry_price - tp_distance
+            exit_bar = _first_exit_bar(low, high, bar + 1, tp_price, sl_price)
+            hit_sl = exit_bar >= 0 and high[exit_bar] >= sl_price
+
+        book['position'] = {
+            'signal': signal,
+            'entry_price': entry_price,
+            'entry_time': str(book['times'][bar]),
+            'sl_price': sl_price,
+            'tp_price': tp_price,
+            'hit_sl': hit_sl,
+            'lot_size': lot_size,
+        }
+        open_positions += 1
+        # A position that never hits SL/TP stays open to the end of the data
+        if exit_bar >= 0:
+            heapq.heappush(events, (int(book['axis_index'][exit_bar]), _EXIT, s, exit_bar))
+
+    total_profit = capital - initial_capital
+    wins = sum(1 for t in trades if t['profit'] > 0)
+    win_rate = (wins / len(trades) * 100) if trades else 0
+
+    symbols = {}
+    for book in books:
+        symbol_trades = [t for t in trades if t['symbol'] == book['symbol']]
+        symbol_profit = sum(t['profit'] for t in symbol_trades)
+        symbol_wins = sum(1 for t in symbol_trades if t['profit'] > 0)
+        symbols[book['symbol']] = {
+            'strategy_id': book['strategy_id'],
+            'total_trades': len(symbol_trades),
+            'wins': symbol_wins,
+            'losses': len(symbol_trades) - symbol_wins,
+            'win_rate_percent': round(symbol_wins / len(symbol_trades) * 100, 2) if symbol_trades else 0.0,
+            'profit_usd': round(symbol_profit, 2),
+            'spread_costs': round(sum(t['spread_cost'] for t in symbol_trades), 2),
+            'profit_share_percent': round(symbol_profit / total_profit * 100, 2) if total_profit else 0.0,
+            'open_at_end': book['position'] is not None,
+        }
+
+    logger.info(f"Portfolio Backtest Complete: {len(books)} symbols, {len(trades)} trades, ${total_profit:+.0f} profit")
+
+    return {
+        "symbols_tested": [book['symbol'] for book in books],
+        "symbol_errors": errors,
+        "initial_capital": initial_capital,
+        "total_trades": len(trades),
+        "final_capital": round(capital, 2) if math.isfinite(capital) else initial_capital,
+        "total_profit_usd": round(total_profit, 2) if math.isfinite(total_profit) else 0.0,
+        "total_spread_costs": round(total_spread_costs, 2),
+        "win_rate_percent": round(win_rate, 2),
+        "wins": wins,
+        "losses": len(trades) - wins,
+        "max_drawdown_percent": round(max_drawdown * 100, 2) if math.isfinite(max_drawdown) else 0.0,
+        "equity_curve": equity_curve,
+        "equity_times": equity_times,
+        "symbols": symbols,
+        "trades": trades if engine_config.get('include_all_trades') else trades[-20:],
+        "engine_config": {
+            "spread_costs_enabled": engine.enable_spread_costs,
+            "slippage_enabled": engine.enable_slippage,
+            "realistic_execution": engine.enable_realistic_execution,
+            "max_open_positions": max_open_positions
+        }
+    }
@@ -0,0 +1,279 @@
+# core/backtesting/result_cache.py
+"""
+🗃️ Backtest Result Cache
+
+Memoizes `run_enhanced_backtest` results under a stable SHA-256 key of the
+strategy id, params, symbol, engine config, ENGINE_VERSION, the contents of
+the data slice and the source of the strategy's module plus the modules listed
+in STRATEGY_SHARED_SOURCES / STRATEGY_EXTRA_SOURCES. Editing any of those
+invalidates stored results, including the disk tier that survives restarts;
+engine changes that alter results bump ENGINE_VERSION, and a strategy that
+starts using another helper module adds it to STRATEGY_EXTRA_SOURCES.
+Results live in two tiers:
+
+- memory: LRU of serialized results bounded by bytes (BACKTEST_CACHE_MB, default 64)
+- disk:   SQLite file next to bots.db, bounded by entry count
+          (BACKTEST_CACHE_ENTRIES, default 2000; 0 disables the disk tier),
+          reached through a connection pool from core.db.connection
+
+Both tiers hold the JSON form of the result, so a hit returns a fresh dict
+that callers may modify. Error results are never cached.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.enhanced_engine import ENGINE_VERSION, run_enhanced_backtest
+from core.db.connection import DB_PATH, ConnectionPool
+from core.strategies.strategy_map import STRATEGY_MAP
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = 'backtest_cache.db'
+
+DEFAULT_MAX_MB = float(os.getenv('BACKTEST_CACHE_MB', '64'))
+DEFAULT_MAX_DISK_ENTRIES = int(os.getenv('BACKTEST_CACHE_ENTRIES', '2000'))
+
+DISK_POOL_SIZE = 4
+
+# Modules every strategy builds on; their source is part of every strategy's key
+STRATEGY_SHARED_SOURCES = ('core.strategies.base_strategy', 'core.utils.indicator_cache')
+
+# Helper modules used by individual strategies, by strategy id
+STRATEGY_EXTRA_SOURCES = {
+    'INDEX_BREAKOUT_PRO': ('core.utils.pivots',),
+}
+
+
+def default_cache_path() -> str:
+    """Cache database path, alongside bots.db (see core/db/connection.py)"""
+    return os.path.join(os.path.dirname(DB_PATH), CACHE_FILENAME)
+
+
+def _json_default(value):
+    if isinstance(value, pd.DataFrame):
+        return data_digest(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def data_digest(df: pd.DataFrame) -> str:
+    """Digest of a DataFrame's column names, dtypes and values (index ignored)"""
+    digest = hashlib.sha256()
+    digest.update(str(len(df)).encode())
+    for name in df.columns:
+        values = df[name].to_numpy()
+        digest.update(f"|{name}:{values.dtype.str}|".encode())
+        if values.dtype == object:
+            digest.update(pd.util.hash_array(values).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(values).view(np.uint8).data)
+    return digest.hexdigest()
+
+
+def _source_digest(module_names) -> str:
+    digest = hashlib.sha256()
+    for name in module_names:
+        try:
+            source = inspect.getsource(importlib.import_module(name))
+        except (OSError, TypeError, ImportError):
+            source = ''  # frozen build: no sources, ENGINE_VERSION still applies
+        digest.update(f"|{name}|".encode())
+        digest.update(source.encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _strategy_code_digest(strategy_id: str) -> str:
+    """Digest of a strategy's module and its listed dependencies, so editing them invalidates its results"""
+    strategy_class = STRATEGY_MAP.get(strategy_id)
+    if strategy_class is None:
+        return ''
+    modules = (strategy_class.__module__,) + STRATEGY_SHARED_SOURCES + STRATEGY_EXTRA_SOURCES.get(strategy_id, ())
+    return _source_digest(modules)
+
+
+def make_cache_key(strategy_id, params, df, symbol_name=None, engine_config=None) -> str:
+    descriptor = json.dumps({
+        'engine_version': ENGINE_VERSION,
+        'strategy_id': strategy_id,
+        'strategy_code': _strategy_code_digest(strategy_id),
+        'params': params or {},
+        'symbol_name': symbol_name,
+        'engine_config': engine_config or {},
+    }, sort_keys=True, default=_json_default)
+    return hashlib.sha256(f"{descriptor}|{data_digest(df)}".encode()).hexdigest()
+
+
+class BacktestResultCache:
+    """Two-tier (memory LRU + SQLite) cache of serialized backtest results"""
+
+    def __init__(self, path=None, max_bytes=int(DEFAULT_MAX_MB * 1024 * 1024),
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES):
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_pool = ConnectionPool(self.path, max_size=DISK_POOL_SIZE, timeout=5)
+        self._disk_ready = False
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # --- disk tier -------------------------------------------------------
+
+    def _connect(self):
+        """Pooled connection with the shared pragmas; `with` commits and returns it to the pool"""
+        conn = self._disk_pool.acquire()
+        if not self._disk_ready:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backtest_result_cache (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_backtest_result_cache_last_used "
+                         "ON backtest_result_cache (last_used)")
+            conn.commit()
+            self._disk_ready = True
+        return conn
+
+    def _disk_get(self, key):
+        if self.max_disk_entries <= 0:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT result FROM backtest_result_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE backtest_result_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.warning(f"Backtest cache read failed: {e}")
+            return None
+
+    def _disk_put(self, key, payload):
+        if self.max_disk_entries <= 0:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO backtest_result_cache (key, result, last_used) VALUES (?, ?, ?)",
+                             (key, payload, time.time()))
+                conn.execute("""
+                    DELETE FROM backtest_result_cache WHERE key IN (
+                        SELECT key FROM backtest_result_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_disk_entries,))
+        except sqlite3.Error as e:
+            logger.warning(f"Backtest cache write failed: {e}")
+
+    # --- memory tier -----------------------------------------------------
+
+    def _remember(self, key, payload):
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = payload
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def get(self, key):
+        """Cached result for `key`, or None"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(payload)
+        payload = self._disk_get(key)
+        if payload is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(key, payload)
+        return json.loads(payload)
+
+    def put(self, key, result):
+        if not result or result.get('error'):
+            return
+        payload = json.dumps(result, default=_json_default)
+        self._remember(key, payload)
+        self._disk_put(key, payload)
+
+    def clear(self, disk=True):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.disk_hits = self.misses = 0
+        if disk and self.max_disk_entries > 0:
+            try:
+                with self._connect() as conn:
+                    conn.execute("DELETE FROM backtest_result_cache")
+            except sqlite3.Error as e:
+                logger.warning(f"Backtest cache clear failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._entries),
+                'memory_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'max_disk_entries': self.max_disk_entries,
+            }
+
+
+# Process-wide cache used by the strategy switcher
+backtest_result_cache = BacktestResultCache()
+
+
+def cached_backtest(strategy_id, params, historical_data_df, symbol_name=None, engine_config=None,
+                    cache=None):
+    """
+    `run_enhanced_backtest` through the result cache.
+
+    Same arguments and return value; identical inputs (including data contents)
+    return the stored result without re-running the strategy or simulation.
+    """
+    cache = cache or backtest_result_cache
+    key = make_cache_key(strategy_id, params, historical_data_df, symbol_name, engine_config)
+    result = cache.get(key)
+    if result is not None:
+        return result
+    result = run_enhanced_backtest(strategy_id, params, historical_data_df, symbol_name=symbol_name,
+                                   engine_config=engine_config)
+    cache.put(key, result)
+    return result
+
+
+def get_backtest_cache_stats() -> dict:
+    return backtest_result_cache.stats()
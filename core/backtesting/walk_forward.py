@@ -0,0 +1,238 @@
+# core/backtesting/walk_forward.py
+"""
+🚶 Walk-Forward Optimization
+
+Splits a dataset into rolling (or anchored) train/test windows, optimizes a
+strategy's definable parameters on each in-sample slice and scores the winner
+on the following out-of-sample slice. The out-of-sample equity curves are
+stitched into a single compounded curve.
+
+Features:
+- Windows run in parallel on a process pool (the DataFrame is sent once per worker)
+- Each combination's indicators are computed once over the window's train+test
+  span; the in-sample and out-of-sample simulations reuse that signal frame
+- Walk-forward efficiency and per-window parameter/metric reporting
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.backtesting.enhanced_engine import (
+    backtest_signal_frame, detect_instrument_symbol, prepare_signal_frame
+)
+from core.backtesting.optimizer import (
+    build_param_combinations, combination_key, metric_sort_key, summarize_results
+)
+from core.strategies.strategy_map import STRATEGY_MAP
+
+logger = logging.getLogger(__name__)
+
+# Per-process state set by the pool initializer so the DataFrame is sent once per worker
+_worker_state = {}
+
+
+def build_windows(n_bars: int, train_bars: int, test_bars: int,
+                  step_bars: Optional[int] = None, anchored: bool = False) -> List[Dict[str, int]]:
+    """
+    Positional train/test windows over `n_bars` bars.
+
+    Each window is {'train_start', 'train_end', 'test_end'} (end-exclusive).
+    Rolling windows keep a fixed train length; anchored windows always train
+    from bar 0. Windows advance by `step_bars` (defaults to `test_bars`).
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive")
+    step = step_bars or test_bars
+    if step <= 0:
+        raise ValueError("step_bars must be positive")
+
+    windows = []
+    offset = 0
+    while offset + train_bars + test_bars <= n_bars:
+        train_end = offset + train_bars
+        windows.append({
+            'train_start': 0 if anchored else offset,
+            'train_end': train_end,
+            'test_end': train_end + test_bars,
+        })
+        offset += step
+    return windows
+
+
+def stitch_equity_curves(curves: List[List[float]], initial_capital: float = 10000.0) -> List[float]:
+    """Chain out-of-sample equity curves, compounding each from the previous curve's end"""
+    stitched = [initial_capital]
+    for curve in curves:
+        if not curve or not curve[0]:
+            continue
+        scale = stitched[-1] / curve[0]
+        stitched.extend(value * scale for value in curve[1:])
+    return stitched
+
+
+def _max_drawdown_percent(equity_curve: List[float]) -> float:
+    equity = np.asarray(equity_curve, dtype=float)
+    if equity.size == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(equity)
+    drawdowns = np.where(peaks > 0, (peaks - equity) / peaks, 0.0)
+    return round(float(drawdowns.max()) * 100, 2)
+
+
+def _walk_forward_state(strategy_id, base_params, historical_data_df, instrument_symbol,
+                        combinations, rank_by, engine_config):
+    return dict(
+        strategy_id=strategy_id, base_params=base_params, df=historical_data_df,
+        instrument_symbol=instrument_symbol, combinations=combinations,
+        rank_by=rank_by, engine_config=engine_config
+    )
+
+
+def _init_worker(*args):
+    _worker_state.update(_walk_forward_state(*args))
+
+
+def _run_window(index: int, window: Dict[str, int], state: Optional[dict] = None) -> dict:
+    """Optimize one window in-sample and score the winner out-of-sample; worker processes read _worker_state"""
+    state = _worker_state if state is None else state
+    strategy_id = state['strategy_id']
+    symbol = state['instrument_symbol']
+    engine_config = state['engine_config']
+    rank_by = state['rank_by']
+
+    df = state['df']
+    window_df = df.iloc[window['train_start']:window['test_end']]
+    split_time = df['time'].iloc[window['train_end']]
+
+    best = None
+    best_params = None
+    best_test_frame = None
+    for combo in state['combinations']:
+        params = {**state['base_params'], **combo}
+        try:
+            # Indicators are computed once over train+test and sliced at the split
+            frame = prepare_signal_frame(strategy_id, params, window_df, symbol)
+            split = int(frame['time'].searchsorted(split_time))
+            train_frame = frame.iloc[:split].reset_index(drop=True)
+            results = backtest_signal_frame(strategy_id, params, train_frame, symbol, engine_config)
+            metrics = summarize_results(results)
+        except Exception as e:
+            metrics = {'error': str(e)}
+            frame, split = None, 0
+        row = {'key': combination_key(combo), 'params': combo, 'metrics': metrics}
+        if best is None or metric_sort_key(metrics, rank_by) < metric_sort_key(best['metrics'], rank_by):
+            best = row
+            best_params = params
+            best_test_frame = frame.iloc[split:].reset_index(drop=True) if frame is not None else None
+
+    result = {
+        'window': index,
+        'train_start': str(df['time'].iloc[window['train_start']]),
+        'test_start': str(split_time),
+        'test_end': str(df['time'].iloc[window['test_end'] - 1]),
+        'train_bars': window['train_end'] - window['train_start'],
+        'test_bars': window['test_end'] - window['train_end'],
+        'best_params': best['params'],
+        'in_sample': best['metrics'],
+        'out_of_sample': {'error': 'No valid in-sample combination'},
+        'oos_equity_curve': [],
+    }
+    if best['metrics'].get('error') or best_test_frame is None:
+        return result
+
+    oos = backtest_signal_frame(strategy_id, best_params, best_test_frame, symbol, engine_config)
+    result['out_of_sample'] = summarize_results(oos)
+    result['oos_equity_curve'] = oos.get('equity_curve', [])
+    return result
+
+
+def run_walk_forward(strategy_id: str, historical_data_df, param_ranges: Dict[str, Any],
+                     train_bars: int, test_bars: int, symbol_name: Optional[str] = None,
+                     step_bars: Optional[int] = None, anchored: bool = False,
+                     base_params: Optional[Dict[str, Any]] = None, mode: str = 'grid',
+                     n_samples: Optional[int] = None, seed: int = 0,
+                     workers: Optional[int] = None, rank_by: str = 'total_profit_usd',
+                     engine_config: Optional[dict] = None) -> dict:
+    """
+    Run a walk-forward optimization.
+
+    Args:
+        strategy_id: Key in STRATEGY_MAP
+        historical_data_df: Historical OHLC data with a 'time' column or index
+        param_ranges: Parameter name -> values/range (see build_param_combinations)
+        train_bars / test_bars: In-sample and out-of-sample window lengths in bars
+        symbol_name: Symbol used for instrument detection
+        step_bars: Bars between window starts (defaults to test_bars)
+        anchored: Train every window from the first bar instead of a rolling slice
+        base_params: Fixed params applied under every combination
+        mode / n_samples / seed: Grid or random sampling options
+        workers: Process count (defaults to os.cpu_count(); 1 runs in-process)
+        rank_by: Metric used to pick each window's in-sample winner
+        engine_config: Passed through to the simulation
+
+    Returns:
+        dict with per-window results, the stitched out-of-sample equity curve
+        and aggregate out-of-sample metrics
+    """
+    if strategy_id not in STRATEGY_MAP:
+        raise ValueError(f"Strategy '{strategy_id}' not found")
+
+    df = historical_data_df
+    if 'time' not in df.columns:
+        df = df.reset_index()
+    df = df.reset_index(drop=True)
+
+    windows = build_windows(len(df), train_bars, test_bars, step_bars, anchored)
+    if not windows:
+        raise ValueError(f"Not enough data for one window: {len(df)} bars < {train_bars + test_bars}")
+
+    combinations = build_param_combinations(strategy_id, param_ranges, mode, n_samples, seed)
+    defaults = {p['name']: p.get('default') for p in STRATEGY_MAP[strategy_id].get_definable_params()}
+    base = {**defaults, **(base_params or {})}
+    instrument_symbol = detect_instrument_symbol(historical_data_df, symbol_name)
+
+    logger.info(f"Walk-forward {strategy_id}: {len(windows)} windows x {len(combinations)} combinations")
+
+    worker_count = workers or os.cpu_count() or 1
+    init_args = (strategy_id, base, df, instrument_symbol, combinations, rank_by, engine_config)
+    window_results = []
+    if worker_count == 1 or len(windows) == 1:
+        # No module global in-process, so the train/test frame is not pinned after the run
+        state = _walk_forward_state(*init_args)
+        window_results = [_run_window(i, w, state) for i, w in enumerate(windows)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(worker_count, len(windows)),
+                                 initializer=_init_worker, initargs=init_args) as pool:
+            futures = [pool.submit(_run_window, i, w) for i, w in enumerate(windows)]
+            for future in as_completed(futures):
+                window_results.append(future.result())
+    window_results.sort(key=lambda r: r['window'])
+
+    initial_capital = 10000.0
+    stitched = stitch_equity_curves([r['oos_equity_curve'] for r in window_results], initial_capital)
+    scored = [r for r in window_results if not r['out_of_sample'].get('error')]
+
+    # Walk-forward efficiency: out-of-sample profit rate relative to in-sample, per bar
+    is_rate = sum(r['in_sample']['total_profit_usd'] for r in scored) / max(sum(r['train_bars'] for r in scored), 1)
+    oos_rate = sum(r['out_of_sample']['total_profit_usd'] for r in scored) / max(sum(r['test_bars'] for r in scored), 1)
+    efficiency = round(oos_rate / is_rate, 4) if is_rate > 0 else None
+
+    return {
+        'strategy_id': strategy_id,
+        'symbol': instrument_symbol,
+        'anchored': anchored,
+        'total_windows': len(window_results),
+        'combinations_per_window': len(combinations),
+        'ranked_by': rank_by,
+        'windows': window_results,
+        'stitched_equity_curve': stitched,
+        'oos_final_capital': round(stitched[-1], 2),
+        'oos_total_profit_usd': round(stitched[-1] - initial_capital, 2),
+        'oos_max_drawdown_percent': _max_drawdown_percent(stitched),
+        'oos_total_trades': sum(r['out_of_sample'].get('total_trades', 0) for r in scored),
+        'walk_forward_efficiency': efficiency,
+    }
@@ -0,0 +1,220 @@
+# core/bots/async_runtime.py
+"""
+🔁 asyncio Bot Runtime (opt-in)
+
+The default runtime starts one `TradingBot` thread per bot. With a few hundred
+bots that is a few hundred OS threads contending for the GIL with the Flask
+server in the same process, mostly to sit in ``time.sleep`` or wait on the
+terminal and SQLite.
+
+With BOT_RUNTIME=asyncio the controller starts `AsyncTradingBot` instead: the
+same bot logic as a coroutine on one shared event-loop thread. Every blocking
+step is handed to a bounded executor:
+
+- ``mt5``: terminal calls (symbol info, rates, positions, orders), size from
+  BOT_RUNTIME_MT5_WORKERS (default 4)
+- ``db``: history log writes, BOT_RUNTIME_DB_WORKERS (default 2)
+- ``cpu``: strategy analysis, BOT_RUNTIME_CPU_WORKERS (default 2)
+
+so the process runs a fixed number of threads however many bots are active.
+`AsyncTradingBot` keeps the thread interface the controller and routes use
+(``start``, ``stop``, ``join``, ``is_alive``, ``status``, ``last_analysis``),
+so `mulai_bot`, `hentikan_bot` and `get_bot_analysis_data` are unchanged.
+
+Compare both runtimes with ``python lab/benchmark_bot_runtime.py``.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import MetaTrader5 as mt5
+
+from core.bots.trading_bot import TradingBot
+from core.utils.market_data_hub import market_data
+
+logger = logging.getLogger(__name__)
+
+ASYNC_RUNTIME_ENABLED = os.getenv('BOT_RUNTIME', 'thread').lower() == 'asyncio'
+DEFAULT_WORKERS = {
+    'mt5': int(os.getenv('BOT_RUNTIME_MT5_WORKERS', '4')),
+    'db': int(os.getenv('BOT_RUNTIME_DB_WORKERS', '2')),
+    'cpu': int(os.getenv('BOT_RUNTIME_CPU_WORKERS', '2')),
+}
+
+
+class BotRuntime:
+    """One event-loop thread plus bounded executors, started on first use"""
+
+    def __init__(self, workers=None):
+        self.workers = dict(DEFAULT_WORKERS, **(workers or {}))
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._executors = {}
+
+    @property
+    def loop(self):
+        self.start()
+        return self._loop
+
+    def start(self):
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._executors = {
+                kind: ThreadPoolExecutor(max_workers=count, thread_name_prefix=f'bot-{kind}')
+                for kind, count in self.workers.items()
+            }
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name='bot-runtime', daemon=True)
+            self._thread.start()
+
+    def submit(self, coroutine):
+        """Schedule a coroutine on the runtime loop from any thread (returns a concurrent Future)"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def call(self, kind, fn, *args, **kwargs):
+        """Run a blocking call on the `kind` executor and await its result"""
+        return await self._loop.run_in_executor(self._executors[kind], functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self, timeout=5):
+        with self._lock:
+            loop, thread, executors = self._loop, self._thread, self._executors
+            self._loop, self._thread, self._executors = None, None, {}
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        for executor in executors.values():
+            executor.shutdown(wait=False)
+        loop.close()
+
+    def stats(self):
+        with self._lock:
+            running = self._loop is not None
+            tasks = len(asyncio.all_tasks(self._loop)) if running else 0
+        return {'running': running, 'tasks': tasks, 'workers': dict(self.workers)}
+
+
+bot_runtime = BotRuntime()
+
+
+class AsyncTradingBot(TradingBot):
+    """TradingBot run as a coroutine on `bot_runtime` instead of its own thread"""
+
+    def __init__(self, *args, runtime=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.runtime = runtime or bot_runtime
+        self._loop = None
+        self._wake = None
+        self._started = False
+        self._finished = threading.Event()
+
+    # --- Thread interface used by the controller ---
+
+    def start(self):
+        self._started = True
+        self._loop = self.runtime.loop
+        self.runtime.submit(self._run_async())
+
+    def run(self):
+        """Run the bot on the runtime and block until it stops"""
+        self.start()
+        self.join()
+
+    def is_alive(self):
+        return self._started and not self._finished.is_set()
+
+    def join(self, timeout=None):
+        self._finished.wait(timeout)
+
+    def stop(self):
+        super().stop()
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    # --- Coroutine body: TradingBot.run with every blocking step awaited ---
+
+    async def _run_async(self):
+        call = self.runtime.call
+        self._wake = asyncio.Event()
+        try:
+            self.status = 'Aktif'
+            await call('db', self.log_activity, 'START', f"Bot '{self.name}' dimulai.", is_notification=True)
+            if not await call('mt5', self._setup):
+                return
+            if self.bar_subscription is not None:
+                self.bar_subscription.on_notify = functools.partial(self._loop.call_soon_threadsafe, self._wake.set)
+
+            while not self._stop_event.is_set():
+                try:
+                    symbol_info, df = await call('mt5', self._fetch_cycle_data)
+                    if not symbol_info:
+                        msg = f"Tidak dapat mengambil info untuk simbol {self.market_for_mt5}."
+                        await call('db', self.log_activity, 'WARNING', msg)
+                        self.last_analysis = {"signal": "ERROR", "price": None, "explanation": msg}
+                        await self._sleep(self.check_interval)
+                        continue
+                    if df.empty:
+                        msg = f"Gagal mengambil data harga untuk {self.market_for_mt5}. Periksa koneksi atau ketersediaan data historis."
+                        await call('db', self.log_activity, 'WARNING', msg)
+                        self.last_analysis = {"signal": "ERROR", "explanation": msg}
+                        await self._sleep(self.check_interval)
+                        continue
+
+                    self.last_analysis = await call('cpu', self._analyze, df)
+                    logger.info(f"Bot {self.id} [{self.strategy_name}] - Last Analysis: {self.last_analysis}")
+                    if not await call('mt5', self._execute_signal, self.last_analysis.get("signal", "HOLD")):
+                        logger.info(f"Bot {self.id} [{self.strategy_name}] - Market is closed for {self.market_for_mt5}. Skipping trade execution.")
+                        await call('db', self.log_activity, 'INFO', f"Market closed for {self.market_for_mt5}. Trade execution skipped.")
+
+                    await self._wait_for_next_cycle_async()
+                except Exception as e:
+                    await call('db', self.log_activity, 'ERROR', f"Error pada loop utama: {e}", exc_info=True, is_notification=True)
+                    self.last_analysis = {"signal": "ERROR", "explanation": str(e)}
+                    await self._sleep(self.check_interval * 2)
+
+            await call('db', self._teardown)
+        except Exception as e:
+            logger.error(f"Bot {self.id} berhenti karena error runtime: {e}", exc_info=True)
+            self.status = 'Error'
+        finally:
+            self._finished.set()
+
+    # Terminal steps are grouped so each cycle makes two executor hops, not five
+
+    def _fetch_cycle_data(self):
+        symbol_info = mt5.symbol_info(self.market_for_mt5)  # type: ignore
+        if not symbol_info:
+            return None, None
+        tf_const = self.tf_map.get(self.timeframe, mt5.TIMEFRAME_H1)
+        return symbol_info, market_data.get_rates(self.market_for_mt5, tf_const, 250)
+
+    def _execute_signal(self, signal):
+        """Trade on `signal`; False when the market is closed for the symbol"""
+        current_position = self._get_open_position()
+        if not self._is_market_open_for_symbol():
+            return False
+        self._handle_trade_signal(signal, current_position)
+        return True
+
+    async def _sleep(self, seconds):
+        """Sleep without holding a thread; returns early when the bot is stopped or woken"""
+        if self._stop_event.is_set():
+            return
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _wait_for_next_cycle_async(self):
+        if self.bar_subscription is None:
+            await self._sleep(self.check_interval)
+            return
+        await self._sleep(self._heartbeat())
+        self.bar_subscription.wait(timeout=0)  # consume the wake-up reason
@@ -0,0 +1,214 @@
+# core/bots/bar_scheduler.py
+"""
+⏰ Bar-Close Scheduler for Live Bots
+
+Instead of every bot sleeping `check_interval` seconds and re-analysing a bar
+that has not changed, bots subscribe to their (symbol, timeframe) and block
+until the scheduler wakes them:
+
+- One daemon thread polls the server time of the last tick of each
+  subscribed symbol (one ``symbol_info_tick`` per symbol, shared by all its
+  timeframes) every `poll_interval` seconds. When the tick falls into a new
+  bar, the previous bar has closed: the shared market data buffer for that
+  key is expired and every subscriber is woken with reason ``'bar_close'``.
+- Subscribers that asked for an intrabar cadence are additionally woken with
+  reason ``'tick'`` every `tick_interval` seconds inside the bar.
+
+Bar boundaries follow the terminal's own alignment in server time (M1-D1 on
+multiples of the bar length, W1 on Sundays, MN1 on the 1st of the month).
+While a market is closed no ticks arrive and no bars close, so bots stay
+asleep; `Subscription.wait` takes a timeout as a heartbeat.
+
+    subscription = bar_scheduler.subscribe('EURUSD', mt5.TIMEFRAME_H1)
+    while running:
+        analyse_and_trade()
+        subscription.wait(timeout=3600)
+
+Set BOT_BAR_SCHEDULER=0 to fall back to fixed `check_interval` polling and
+BOT_BAR_SCHEDULER_POLL to change the poll interval (seconds, default 0.5).
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import MetaTrader5 as mt5
+
+from core.utils.market_data_hub import TIMEFRAME_SECONDS, market_data
+
+logger = logging.getLogger(__name__)
+
+BAR_SCHEDULER_ENABLED = os.getenv('BOT_BAR_SCHEDULER', '1') != '0'
+DEFAULT_POLL_INTERVAL = float(os.getenv('BOT_BAR_SCHEDULER_POLL', '0.5'))
+
+WEEK_SECONDS = 604800
+WEEK_START_OFFSET = 3 * 86400  # 1970-01-01 was a Thursday, W1 bars open on Sunday
+
+
+def bar_open_time(server_time, timeframe):
+    """Open time (server epoch seconds) of the bar containing `server_time`, None for unknown timeframes"""
+    server_time = int(server_time)
+    if timeframe == mt5.TIMEFRAME_MN1:  # type: ignore
+        moment = datetime.fromtimestamp(server_time, tz=timezone.utc)
+        return int(moment.replace(day=1, hour=0, minute=0, second=0).timestamp())
+    seconds = TIMEFRAME_SECONDS.get(timeframe)
+    if not seconds:
+        return None
+    offset = WEEK_START_OFFSET if seconds == WEEK_SECONDS else 0
+    return server_time - (server_time - offset) % seconds
+
+
+def bar_length(timeframe, default=3600):
+    """Nominal bar length in seconds (31 days for MN1)"""
+    if timeframe == mt5.TIMEFRAME_MN1:  # type: ignore
+        return 31 * 86400
+    return TIMEFRAME_SECONDS.get(timeframe, default)
+
+
+def _last_tick_time(symbol):
+    tick = mt5.symbol_info_tick(symbol)  # type: ignore
+    return tick.time if tick else None
+
+
+class Subscription:
+    """One bot's wake-up channel"""
+
+    def __init__(self, symbol, timeframe, tick_interval=None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.tick_interval = tick_interval
+        self.next_tick = None
+        self.cancelled = False
+        # Optional callback run on every wake-up (the asyncio runtime bridges it into its loop)
+        self.on_notify = None
+        self._event = threading.Event()
+        self._reason = None
+        self._lock = threading.Lock()
+
+    def notify(self, reason):
+        with self._lock:
+            # A bar close outranks an intrabar tick that was not picked up yet
+            if self._reason != 'bar_close':
+                self._reason = reason
+        self._event.set()
+        if self.on_notify is not None:
+            self.on_notify()
+
+    def cancel(self):
+        self.cancelled = True
+        self.notify('cancelled')
+
+    def wait(self, timeout=None):
+        """Block until woken; returns 'bar_close', 'tick', 'cancelled' or None on timeout"""
+        self._event.wait(timeout)
+        with self._lock:
+            reason, self._reason = self._reason, None
+            self._event.clear()
+        if self.cancelled:
+            return 'cancelled'
+        return reason
+
+
+class BarCloseScheduler:
+    def __init__(self, poll_interval=DEFAULT_POLL_INTERVAL, tick_source=_last_tick_time,
+                 clock=time.monotonic, data_hub=market_data):
+        self.poll_interval = poll_interval
+        self._tick_source = tick_source
+        self._clock = clock
+        self._data_hub = data_hub
+        self._lock = threading.Lock()
+        self._keys = {}  # (symbol, timeframe) -> {'bar_open': int|None, 'subscriptions': [..]}
+        self._thread = None
+        self._stats = {'polls': 0, 'bar_closes': 0, 'wakeups': 0, 'ticks': 0, 'errors': 0}
+
+    def subscribe(self, symbol, timeframe, tick_interval=None):
+        """Register a bot; starts the scheduler thread on first use"""
+        subscription = Subscription(symbol, timeframe, tick_interval)
+        if tick_interval:
+            subscription.next_tick = self._clock() + tick_interval
+        with self._lock:
+            entry = self._keys.setdefault((symbol, timeframe), {'bar_open': None, 'subscriptions': []})
+            entry['subscriptions'].append(subscription)
+        self.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.cancel()
+        with self._lock:
+            key = (subscription.symbol, subscription.timeframe)
+            entry = self._keys.get(key)
+            if entry and subscription in entry['subscriptions']:
+                entry['subscriptions'].remove(subscription)
+                if not entry['subscriptions']:
+                    del self._keys[key]
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='bar-close-scheduler', daemon=True)
+                self._thread.start()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, keys=len(self._keys),
+                        subscriptions=sum(len(e['subscriptions']) for e in self._keys.values()))
+
+    def poll(self):
+        """One scheduling pass: detect closed bars and due intrabar ticks"""
+        with self._lock:
+            keys = {key: (entry, list(entry['subscriptions'])) for key, entry in self._keys.items()}
+            self._stats['polls'] += 1
+
+        tick_times = {}
+        for symbol in {symbol for symbol, _ in keys}:
+            try:
+                tick_times[symbol] = self._tick_source(symbol)
+            except Exception as e:
+                logger.error(f"Bar scheduler gagal membaca tick {symbol}: {e}")
+                self._bump('errors')
+
+        now = self._clock()
+        for (symbol, timeframe), (entry, subscriptions) in keys.items():
+            server_time = tick_times.get(symbol)
+            bar_open = bar_open_time(server_time, timeframe) if server_time else None
+            closed = False
+            if bar_open is not None:
+                # The first tick seen only anchors the bar; bots analyse once on start anyway
+                closed = entry['bar_open'] is not None and bar_open > entry['bar_open']
+                if entry['bar_open'] is None or bar_open > entry['bar_open']:
+                    entry['bar_open'] = bar_open
+
+            if closed:
+                self._data_hub.expire(symbol, timeframe)
+                self._bump('bar_closes')
+            for subscription in subscriptions:
+                if closed:
+                    subscription.notify('bar_close')
+                    self._bump('wakeups')
+                    if subscription.tick_interval:
+                        subscription.next_tick = now + subscription.tick_interval
+                elif subscription.tick_interval and now >= subscription.next_tick:
+                    subscription.notify('tick')
+                    self._bump('ticks')
+                    subscription.next_tick = now + subscription.tick_interval
+
+    def _bump(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._keys:
+                    self._thread = None
+                    return
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error pada bar scheduler: {e}", exc_info=True)
+            time.sleep(self.poll_interval)
+
+
+bar_scheduler = BarCloseScheduler()
@@ -3,15 +3,21 @@
 import json
 import logging
 from core.db import queries
-from .trading_bot import TradingBot
+from core.db.batch_writer import db_writer
+from .trading_bot import TradingBot, analysis_topic
+from .async_runtime import ASYNC_RUNTIME_ENABLED, AsyncTradingBot
 from core.strategies.strategy_map import STRATEGY_MAP
 
 logger = logging.getLogger(__name__)
 
 # Dictionary untuk menyimpan instance thread bot yang aktif
-# Key: bot_id (int), Value: TradingBot instance
+# Key: bot_id (int), Value: TradingBot instance (AsyncTradingBot bila BOT_RUNTIME=asyncio)
 active_bots = {}
 
+# Cache analisis on-demand untuk bot yang tidak aktif, berlaku selama satu bar
+# Key: bot_id, Value: {'config', 'symbol', 'bar_time', 'analysis'}
+inactive_analysis_cache = {}
+
 def auto_migrate_broker_symbols():
     """Automatically migrate bot symbols when broker changes are detected"""
     try:
@@ -126,7 +132,8 @@ def mulai_bot(bot_id: int):
     params_dict = json.loads(bot_data.get('strategy_params', '{}'))
 
     try:
-        bot_thread = TradingBot(
+        bot_class = AsyncTradingBot if ASYNC_RUNTIME_ENABLED else TradingBot
+        bot_thread = bot_class(
             id=bot_data['id'], name=bot_data['name'], market=bot_data['market'],
             risk_percent=bot_data['lot_size'], sl_pips=bot_data['sl_pips'],
             tp_pips=bot_data['tp_pips'], timeframe=bot_data['timeframe'],
@@ -188,8 +195,10 @@ def hentikan_semua_bot():
         hentikan_bot(bot_id)
     return True, f"Sinyal berhenti telah dikirim ke {len(running_bot_ids)} bot."
 
-# Alias untuk dipanggil oleh atexit di run.py, memastikan nama sesuai.
-shutdown_all_bots = hentikan_semua_bot
+def shutdown_all_bots():
+    """Dipanggil oleh atexit di run.py: hentikan semua bot, lalu tulis sisa antrean log ke database."""
+    hentikan_semua_bot()
+    db_writer.close()
 
 def perbarui_bot(bot_id: int, data: dict):
     """Memperbarui konfigurasi bot di database."""
@@ -241,6 +250,8 @@ def perbarui_bot(bot_id: int, data: dict):
 def hapus_bot(bot_id: int):
     """Menghentikan dan menghapus bot."""
     hentikan_bot(bot_id) # Pastikan thread berhenti sebelum dihapus
+    inactive_analysis_cache.pop(bot_id, None)
+    analysis_topic.discard(bot_id)
     return queries.delete_bot(bot_id)
 
 def add_new_bot_to_controller(bot_id: int):
@@ -259,23 +270,36 @@ def get_bot_analysis_data(bot_id: int):
     if bot and hasattr(bot, 'last_analysis'):
         return bot.last_analysis
 
-    # For inactive bots, generate analysis on-demand
+    # For inactive bots, generate analysis on-demand (cached until the next bar opens)
     bot_data = queries.get_bot_by_id(bot_id)
     if not bot_data:
         return None
 
     try:
         import MetaTrader5 as mt5
-        from core.utils.mt5 import find_mt5_symbol, get_rates_mt5, TIMEFRAME_MAP
+        from core.utils.mt5 import find_mt5_symbol, TIMEFRAME_MAP
+        from core.utils.market_data_hub import market_data
+        from .bar_scheduler import bar_open_time
+
+        config = (bot_data['market'], bot_data['timeframe'], bot_data['strategy'], bot_data.get('strategy_params'))
+        cached = inactive_analysis_cache.get(bot_id)
+        if cached and cached['config'] != config:
+            cached = None
 
         # Find the symbol
-        market_for_mt5 = find_mt5_symbol(bot_data['market'])
+        market_for_mt5 = cached['symbol'] if cached else find_mt5_symbol(bot_data['market'])
         if not market_for_mt5:
             return {"signal": "ERROR", "explanation": f"Symbol '{bot_data['market']}' not found in MT5"}
 
-        # Get market data
+        # Same bar as the cached analysis (or market closed, no ticks): nothing to recompute
         tf_const = TIMEFRAME_MAP.get(bot_data['timeframe'], mt5.TIMEFRAME_H1)
-        df = get_rates_mt5(market_for_mt5, tf_const, 250)
+        tick = mt5.symbol_info_tick(market_for_mt5)
+        bar_time = bar_open_time(tick.time, tf_const) if tick else None
+        if cached and (bar_time is None or bar_time == cached['bar_time']):
+            return cached['analysis']
+
+        # Get market data
+        df = market_data.get_rates(market_for_mt5, tf_const, 250)
         if df.empty:
             return {"signal": "ERROR", "explanation": "Unable to fetch market data"}
 
@@ -292,6 +316,13 @@ def get_bot_analysis_data(bot_id: int):
 
         # Generate analysis
         analysis = strategy_instance.analyze(df)
+        if analysis.get('signal') != 'ERROR':
+            inactive_analysis_cache[bot_id] = {
+                'config': config, 'symbol': market_for_mt5, 'bar_time': bar_time, 'analysis': analysis
+            }
+            # Beri tahu stream analisis hanya jika hasilnya berubah
+            if not cached or cached['analysis'] != analysis:
+                analysis_topic.publish(bot_id, analysis)
         return analysis
 
     except Exception as e:
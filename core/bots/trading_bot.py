@@ -1,7 +1,6 @@
 # core/bots/trading_bot.py - VERSI GABUNGAN FINAL
 
 import threading
-import time
 import logging
 from datetime import datetime
 import MetaTrader5 as mt5
@@ -13,9 +12,16 @@ from core.db.models import log_trade_for_ai_analysis
 # Holiday and market hours management
 from core.seasonal.holiday_manager import holiday_manager
 from core.strategies.index_optimizations import get_trading_hours, is_index_symbol
+from core.utils.streaming_indicators import STREAMING_ENABLED, IndicatorStream
+from core.utils.market_data_hub import market_data
+from core.bots.bar_scheduler import BAR_SCHEDULER_ENABLED, bar_length, bar_scheduler
+from core.utils.pubsub import Topic
 
 logger = logging.getLogger(__name__)
 
+# Analisis terbaru per bot (key = bot id), dipublikasikan hanya saat berubah; dipakai stream SSE
+analysis_topic = Topic('bot-analysis')
+
 
 class TradingBot(threading.Thread):
     def __init__(self, id, name, market, risk_percent, sl_pips, tp_pips, timeframe, check_interval, strategy, strategy_params={}, status='Dijeda', enable_strategy_switching=False):
@@ -37,36 +43,33 @@ class TradingBot(threading.Thread):
         self.last_analysis = {"signal": "MEMUAT", "explanation": "Bot sedang memulai, menunggu analisis pertama..."}
         self._stop_event = threading.Event()
         self.strategy_instance = None
+        # State indikator inkremental: dihitung ulang hanya saat bar baru ditutup
+        self.indicator_stream = IndicatorStream() if STREAMING_ENABLED else None
+        # Langganan bar-close scheduler (None = polling tiap check_interval)
+        self.bar_subscription = None
         # Gunakan map yang diimpor untuk menjaga konsistensi
         self.tf_map = TIMEFRAME_MAP
 
+    @property
+    def last_analysis(self):
+        return self._last_analysis
+
+    @last_analysis.setter
+    def last_analysis(self, analysis):
+        try:
+            changed = analysis != self.__dict__.get('_last_analysis')
+        except ValueError:  # nilai array numpy tidak bisa dibandingkan langsung
+            changed = True
+        self._last_analysis = analysis
+        if changed:
+            analysis_topic.publish(self.id, analysis)
+
     def run(self):
         """Metode utama yang dijalankan oleh thread, kini dengan eksekusi trade."""
         self.status = 'Aktif'
         self.log_activity('START', f"Bot '{self.name}' dimulai.", is_notification=True)
 
-        # --- PERBAIKAN: Verifikasi Simbol Cerdas ---
-        from core.utils.mt5 import find_mt5_symbol
-        self.market_for_mt5 = find_mt5_symbol(self.market)
-
-        if not self.market_for_mt5:
-            msg = f"Simbol '{self.market}' atau variasinya tidak dapat ditemukan/diaktifkan di Market Watch MT5."
-            self.log_activity('ERROR', msg, is_notification=True)
-            self.status = 'Error'
-            self.last_analysis = {"signal": "ERROR", "explanation": msg}
-            return # Hentikan eksekusi jika simbol tidak valid
-
-        try:
-            strategy_class = STRATEGY_MAP.get(self.strategy_name)
-            if not strategy_class:
-                raise ValueError(f"Strategi '{self.strategy_name}' tidak ditemukan.")
-
-            # Inisialisasi kelas strategi dengan benar
-            self.strategy_instance = strategy_class(bot_instance=self, params=self.strategy_params)
-
-        except Exception as e:
-            self.log_activity('ERROR', f"Inisialisasi Gagal: {e}", is_notification=True)
-            self.status = 'Error'
+        if not self._setup():
             return
 
         while not self._stop_event.is_set():
@@ -79,22 +82,21 @@ class TradingBot(threading.Thread):
                     msg = f"Tidak dapat mengambil info untuk simbol {self.market_for_mt5}."
                     self.log_activity('WARNING', msg)
                     self.last_analysis = {"signal": "ERROR", "price": None, "explanation": msg}
-                    time.sleep(self.check_interval)
+                    self._stop_event.wait(self.check_interval)
                     continue
 
-                # Bot sekarang yang mengambil data
-                from core.utils.mt5 import get_rates_mt5
+                # Data diambil lewat hub bersama: satu fetch per siklus untuk semua bot di simbol/timeframe yang sama
                 tf_const = self.tf_map.get(self.timeframe, mt5.TIMEFRAME_H1)
-                df = get_rates_mt5(self.market_for_mt5, tf_const, 250)
+                df = market_data.get_rates(self.market_for_mt5, tf_const, 250)
 
                 if df.empty:
                     msg = f"Gagal mengambil data harga untuk {self.market_for_mt5}. Periksa koneksi atau ketersediaan data historis."
                     self.log_activity('WARNING', msg)
                     self.last_analysis = {"signal": "ERROR", "explanation": msg}
-                    time.sleep(self.check_interval)
+                    self._stop_event.wait(self.check_interval)
                     continue
 
-                self.last_analysis = self.strategy_instance.analyze(df)
+                self.last_analysis = self._analyze(df)
                 logger.info(f"Bot {self.id} [{self.strategy_name}] - Last Analysis: {self.last_analysis}")
                 signal = self.last_analysis.get("signal", "HOLD")
 
@@ -107,20 +109,80 @@ class TradingBot(threading.Thread):
                     logger.info(f"Bot {self.id} [{self.strategy_name}] - Market is closed for {self.market_for_mt5}. Skipping trade execution.")
                     self.log_activity('INFO', f"Market closed for {self.market_for_mt5}. Trade execution skipped.", is_notification=False)
 
-                time.sleep(self.check_interval)
+                self._wait_for_next_cycle()
             except Exception as e:
                 error_message = f"Error pada loop utama: {e}"
                 self.log_activity('ERROR', error_message, exc_info=True, is_notification=True)
                 # PERBAIKAN: Perbarui status analisis agar error terlihat di UI
                 self.last_analysis = {"signal": "ERROR", "explanation": str(e)}
-                time.sleep(self.check_interval * 2)
+                self._stop_event.wait(self.check_interval * 2)
+
+        self._teardown()
 
+    def _setup(self):
+        """Verifikasi simbol, inisialisasi strategi dan langganan bar-close. False bila bot tidak bisa jalan."""
+        # --- PERBAIKAN: Verifikasi Simbol Cerdas ---
+        from core.utils.mt5 import find_mt5_symbol
+        self.market_for_mt5 = find_mt5_symbol(self.market)
+
+        if not self.market_for_mt5:
+            msg = f"Simbol '{self.market}' atau variasinya tidak dapat ditemukan/diaktifkan di Market Watch MT5."
+            self.log_activity('ERROR', msg, is_notification=True)
+            self.status = 'Error'
+            self.last_analysis = {"signal": "ERROR", "explanation": msg}
+            return False # Hentikan eksekusi jika simbol tidak valid
+
+        try:
+            strategy_class = STRATEGY_MAP.get(self.strategy_name)
+            if not strategy_class:
+                raise ValueError(f"Strategi '{self.strategy_name}' tidak ditemukan.")
+
+            # Inisialisasi kelas strategi dengan benar
+            self.strategy_instance = strategy_class(bot_instance=self, params=self.strategy_params)
+
+        except Exception as e:
+            self.log_activity('ERROR', f"Inisialisasi Gagal: {e}", is_notification=True)
+            self.status = 'Error'
+            return False
+
+        if BAR_SCHEDULER_ENABLED:
+            # Analisa sekali per bar tertutup; strategi intrabar juga dibangunkan tiap check_interval
+            tick_interval = self.check_interval if getattr(self.strategy_instance, 'intrabar', False) else None
+            tf_const = self.tf_map.get(self.timeframe, mt5.TIMEFRAME_H1)
+            self.bar_subscription = bar_scheduler.subscribe(self.market_for_mt5, tf_const, tick_interval)
+        return True
+
+    def _analyze(self, df):
+        """Menjalankan strategi pada data terbaru (lewat indicator stream bila aktif)."""
+        if self.indicator_stream is not None:
+            self.indicator_stream.sync(df)
+            with self.indicator_stream.activate():
+                return self.strategy_instance.analyze(df)
+        return self.strategy_instance.analyze(df)
+
+    def _teardown(self):
+        if self.bar_subscription is not None:
+            bar_scheduler.unsubscribe(self.bar_subscription)
         self.status = 'Dijeda'
         self.log_activity('STOP', f"Bot '{self.name}' dihentikan.", is_notification=True)
 
     def stop(self):
         """Mengirim sinyal berhenti ke thread."""
         self._stop_event.set()
+        if self.bar_subscription is not None:
+            self.bar_subscription.cancel()
+
+    def _wait_for_next_cycle(self):
+        """Tunggu bar berikutnya tertutup (atau tick intrabar); tanpa scheduler, tunggu check_interval."""
+        if self.bar_subscription is None:
+            self._stop_event.wait(self.check_interval)
+            return
+        self.bar_subscription.wait(timeout=self._heartbeat())
+
+    def _heartbeat(self):
+        """Batas tunggu bar-close: satu bar penuh, agar bot tetap hidup bila tick tidak terbaca."""
+        tf_const = self.tf_map.get(self.timeframe, mt5.TIMEFRAME_H1)
+        return max(self.check_interval, bar_length(tf_const))
 
     def is_stopped(self):
         """Memeriksa apakah thread sudah diberi sinyal berhenti."""
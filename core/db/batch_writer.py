@@ -0,0 +1,237 @@
+# core/db/batch_writer.py
+"""
+Background batched writer for hot SQLite inserts.
+
+Bot events (`add_history_log`) used to open a connection, insert one row and
+commit -- one fsync per event, and "database is locked" errors once many bots
+log at the same time. `BatchWriter` queues the rows in
+memory instead; a single writer thread group-commits them with `executemany`
+in one transaction whenever `batch_size` rows are waiting or the oldest row
+has waited `flush_interval` seconds.
+
+- Rows keep their submission order; consecutive rows with the same statement
+  share one `executemany` call.
+- `flush()` blocks until every row submitted before it is committed;
+  `close()` flushes and stops the thread (`shutdown_all_bots` calls it), after
+  which rows are written synchronously again. A row submitted while `close()`
+  runs is either queued ahead of the stop marker or written synchronously,
+  never left behind in the queue.
+- `submit(..., on_commit=fn)` calls `fn()` once the row's batch is committed
+  (once per batch, however many rows carry the same callback), which lets
+  readers be notified only when the rows are actually visible.
+- `stats()` reports queue depth and flush latency.
+
+Configuration (environment):
+    BOT_DB_BATCHED_WRITES   '0' writes every row synchronously (default '1')
+    BOT_DB_BATCH_SIZE       rows per group commit (default 200)
+    BOT_DB_FLUSH_INTERVAL   max seconds a row waits in the queue (default 0.25)
+    BOT_DB_MAX_QUEUE        queued rows before submitters block (default 10000)
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from .connection import connect_db
+
+logger = logging.getLogger(__name__)
+
+BATCHED_WRITES_ENABLED = os.getenv('BOT_DB_BATCHED_WRITES', '1') != '0'
+DEFAULT_BATCH_SIZE = int(os.getenv('BOT_DB_BATCH_SIZE', '200'))
+DEFAULT_FLUSH_INTERVAL = float(os.getenv('BOT_DB_FLUSH_INTERVAL', '0.25'))
+DEFAULT_MAX_QUEUE = int(os.getenv('BOT_DB_MAX_QUEUE', '10000'))
+
+_STOP = object()
+
+
+def utc_timestamp():
+    """Current UTC time formatted like SQLite's CURRENT_TIMESTAMP"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class BatchWriter:
+    def __init__(self, connect=connect_db, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, max_queue=DEFAULT_MAX_QUEUE,
+                 enabled=BATCHED_WRITES_ENABLED):
+        self.connect = connect
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Condition()
+        self._thread = None
+        self._closed = False
+        # Submitters between the _closed check and their queue.put(); close() waits for them
+        self._pending_puts = 0
+        self._stats = {'submitted': 0, 'rows_written': 0, 'batches': 0, 'errors': 0, 'rows_dropped': 0,
+                       'max_queue_depth': 0, 'last_flush_ms': 0.0, 'max_flush_ms': 0.0, 'total_flush_ms': 0.0}
+
+    def submit(self, statement, params, on_commit=None):
+        """Queue one row for `statement`; written synchronously when batching is off or closed"""
+        with self._lock:
+            self._stats['submitted'] += 1
+            queued = self.enabled and not self._closed
+            if queued:
+                self._ensure_thread()
+                self._pending_puts += 1
+        if not queued:
+            self._write([(statement, params, on_commit)])
+            return
+        self._put((statement, params, on_commit))
+        depth = self._queue.qsize()
+        with self._lock:
+            if depth > self._stats['max_queue_depth']:
+                self._stats['max_queue_depth'] = depth
+
+    def flush(self, timeout=None):
+        """Wait until everything submitted so far is committed; False on timeout"""
+        with self._lock:
+            thread, closing = self._thread, self._closed
+            if thread is not None and not closing:
+                self._pending_puts += 1
+        if thread is None:
+            return True
+        if closing:
+            # close() is already draining the queue
+            thread.join(timeout)
+            return not thread.is_alive()
+        done = threading.Event()
+        self._put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=10):
+        """Flush the queue and stop the writer thread"""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+            # Rows already past the _closed check must land before the stop marker
+            self._lock.wait_for(lambda: self._pending_puts == 0, timeout)
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        total_ms = stats.pop('total_flush_ms')
+        stats['avg_flush_ms'] = round(total_ms / stats['batches'], 3) if stats['batches'] else 0.0
+        stats['queue_depth'] = self._queue.qsize()
+        return stats
+
+    def _put(self, item):
+        try:
+            self._queue.put(item)
+        finally:
+            with self._lock:
+                self._pending_puts -= 1
+                if not self._pending_puts:
+                    self._lock.notify_all()
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='db-batch-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        conn = None
+        while True:
+            item = self._queue.get()
+            batch, markers, stop = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+            # Collect until the batch is full, the oldest row is due, or a flush/stop arrives
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if stop or markers or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                conn = self._write(batch, conn)
+            for marker in markers:
+                marker.set()
+            if stop:
+                # Rows submitted concurrently with close() still get written
+                leftovers = []
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        item.set()
+                    elif item is not _STOP:
+                        leftovers.append(item)
+                if leftovers:
+                    conn = self._write(leftovers, conn)
+                if conn is not None:
+                    conn.close()
+                return
+
+    def _write(self, batch, conn=None):
+        """Commit `batch` in one transaction; returns the (possibly reopened) connection"""
+        started = time.perf_counter()
+        own_connection = conn is None and threading.current_thread() is not self._thread
+        try:
+            if conn is None:
+                conn = self.connect()
+            with conn:
+                start = 0
+                for end in range(1, len(batch) + 1):
+                    if end == len(batch) or batch[end][0] != batch[start][0]:
+                        conn.executemany(batch[start][0], [item[1] for item in batch[start:end]])
+                        start = end
+            written = len(batch)
+        except sqlite3.Error as e:
+            logger.error(f"Gagal menulis {len(batch)} baris ke database: {e}")
+            if conn is not None:
+                conn.close()
+            conn = None
+            written = 0
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            if written:
+                self._stats['rows_written'] += written
+                self._stats['batches'] += 1
+                self._stats['last_flush_ms'] = round(elapsed_ms, 3)
+                self._stats['max_flush_ms'] = round(max(self._stats['max_flush_ms'], elapsed_ms), 3)
+                self._stats['total_flush_ms'] += elapsed_ms
+            else:
+                self._stats['errors'] += 1
+                self._stats['rows_dropped'] += len(batch)
+        if written:
+            self._run_callbacks(batch)
+        if own_connection and conn is not None:
+            conn.close()
+            return None
+        return conn
+
+    def _run_callbacks(self, batch):
+        callbacks = []
+        for _, _, on_commit in batch:
+            if on_commit is not None and on_commit not in callbacks:
+                callbacks.append(on_commit)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Callback setelah commit gagal: {e}", exc_info=True)
+
+
+db_writer = BatchWriter()
@@ -1,24 +1,191 @@
 # core/db/connection.py
+"""
+SQLite connection manager.
+
+Every module reaches bots.db through here:
+
+- `DB_PATH` is resolved once (next to the executable when frozen, the project
+  root otherwise, or BOT_DB_PATH when set), so scripts, routes and bots never
+  open a different file because of the working directory.
+- `get_db_connection()` hands out a connection from a bounded pool instead of
+  opening a new one per call. Use it as before: ``with get_db_connection() as
+  conn:`` commits (or rolls back) and returns the connection to the pool;
+  ``conn.close()`` also returns it.
+- Every connection runs in WAL mode (readers no longer wait for bot writers),
+  with synchronous=NORMAL, a larger page cache, memory-mapped reads, a busy
+  timeout and a bigger prepared-statement cache, which pays off now that
+  connections are reused.
+
+Configuration (environment):
+    BOT_DB_PATH              database file (default: bots.db in the project root)
+    BOT_DB_POOL_SIZE         max pooled connections (default 16)
+    BOT_DB_STATEMENT_CACHE   prepared statements cached per connection (default 256)
+"""
 import sqlite3
 import os
 import sys
+import threading
+import time
 
 # Tentukan nama file database di satu tempat.
 DATABASE_FILENAME = 'bots.db'
 
-def get_db_connection():
-    """Membuat dan mengembalikan koneksi ke database SQLite."""
+DEFAULT_POOL_SIZE = int(os.getenv('BOT_DB_POOL_SIZE', '16'))
+STATEMENT_CACHE_SIZE = int(os.getenv('BOT_DB_STATEMENT_CACHE', '256'))
+BUSY_TIMEOUT_SECONDS = 10
+
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',     # durable across app crashes in WAL mode, fsync only at checkpoints
+    'PRAGMA cache_size=-16000',      # 16 MB page cache
+    'PRAGMA mmap_size=268435456',    # 256 MB memory-mapped reads
+    'PRAGMA temp_store=MEMORY',
+)
+
+
+def resolve_db_path():
+    """Path of bots.db shared by the app, bots and scripts"""
+    if os.getenv('BOT_DB_PATH'):
+        return os.path.abspath(os.getenv('BOT_DB_PATH'))
     # Get the directory where the executable is located
     if getattr(sys, 'frozen', False):
         # Running as PyInstaller bundle
         base_dir = os.path.dirname(sys.executable)
-        db_path = os.path.join(base_dir, DATABASE_FILENAME)
     else:
-        # Running as script
-        BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        db_path = os.path.join(BASE_DIR, '..', '..', DATABASE_FILENAME)
+        # Running as script: core/db -> project root
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_dir, DATABASE_FILENAME)
+
 
-    conn = sqlite3.connect(db_path)
+DB_PATH = resolve_db_path()
+
+
+def connect_db(path=None, check_same_thread=True):
+    """Open a standalone connection with the shared pragmas (not pooled)"""
+    conn = sqlite3.connect(path or DB_PATH, timeout=BUSY_TIMEOUT_SECONDS,
+                           cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=check_same_thread)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
     # Mengatur agar hasil query bisa diakses seperti dictionary
     conn.row_factory = sqlite3.Row
     return conn
+
+
+class PooledConnection:
+    """A pooled sqlite3.Connection; leaving `with` or `close()` returns it to the pool"""
+
+    def __init__(self, pool, conn, generation=0):
+        self._pool = pool
+        self._conn = conn
+        self._generation = generation
+
+    def __getattr__(self, name):
+        conn = self.__dict__.get('_conn')
+        if conn is None:
+            raise sqlite3.ProgrammingError('Cannot operate on a closed database.')
+        return getattr(conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        finally:
+            self.close()
+        return False
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn, self._generation)
+
+    def __del__(self):
+        # A connection that was neither closed nor used in `with` still goes back
+        if self.__dict__.get('_conn') is not None:
+            self.close()
+
+
+class ConnectionPool:
+    def __init__(self, path=None, max_size=DEFAULT_POOL_SIZE, timeout=30):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        # Naik setiap close_all(); koneksi dari generasi lama ditutup saat dikembalikan
+        self._generation = 0
+        self._lock = threading.Condition()
+        self._stats = {'acquired': 0, 'opened': 0, 'waits': 0, 'wait_ms': 0.0}
+
+    def acquire(self):
+        started = None
+        with self._lock:
+            while not self._idle and self._created >= self.max_size:
+                if started is None:
+                    started = time.perf_counter()
+                    self._stats['waits'] += 1
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0 or not self._lock.wait(remaining):
+                    if not self._idle and self._created >= self.max_size:
+                        raise sqlite3.OperationalError(f'No free database connection after {self.timeout}s')
+            if started is not None:
+                self._stats['wait_ms'] += (time.perf_counter() - started) * 1000
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._created += 1
+            self._in_use += 1
+            self._stats['acquired'] += 1
+            generation = self._generation
+        if conn is None:
+            try:
+                conn = connect_db(self.path, check_same_thread=False)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._stats['opened'] += 1
+        return PooledConnection(self, conn, generation)
+
+    def release(self, conn, generation=None):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._in_use -= 1
+            retired = generation is not None and generation != self._generation
+            if retired:
+                self._created -= 1
+            else:
+                self._idle.append(conn)
+            self._lock.notify()
+        if retired:
+            conn.close()
+
+    def close_all(self):
+        """Close idle connections (connections in use are closed when released later)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._generation += 1
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, open=self._created, in_use=self._in_use, idle=len(self._idle),
+                        max_size=self.max_size)
+
+
+db_pool = ConnectionPool()
+
+
+def get_db_connection():
+    """Mengambil koneksi SQLite dari pool (kembali ke pool setelah `with` atau `close()`)."""
+    return db_pool.acquire()
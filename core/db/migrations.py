@@ -0,0 +1,119 @@
+# core/db/migrations.py
+"""
+Versioned schema migrations for bots.db.
+
+The schema version lives in SQLite's `PRAGMA user_version`. Each entry in
+`MIGRATIONS` runs once, in order, inside its own transaction together with
+the version bump, so an interrupted migration is simply retried next time.
+`init_database()` applies pending migrations on startup; `migrate_db.py`
+does the same from the command line for an existing database.
+
+Version 2 adds the secondary indexes the hot queries need, so they stop
+scanning the whole of trade_history once it grows to millions of rows:
+
+- history per bot (`WHERE bot_id = ? ORDER BY timestamp DESC`)
+- the notification feed (`WHERE is_notification = 1 ORDER BY timestamp`)
+- unread notifications (count, toast list and "mark all as read"), as a
+  partial index that only holds the few unread rows
+- the backtest history list, AI mentor sessions by date, and their joins
+
+Version 3 indexes notification ids, for the cursor-based feed and stream
+(`WHERE is_notification = 1 AND id > ?`).
+
+Version 4 creates the backtest_trades table on databases from before it
+existed, so reading a backtest's trades never has to run DDL. Version 5 does
+the same for backtest_equity, the per-point equity curve paged by the
+history endpoint.
+"""
+
+import logging
+
+from .queries import BACKTEST_EQUITY_SCHEMA, BACKTEST_TRADES_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+
+def _table_exists(conn, table):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+
+def _add_strategy_switching_column(conn):
+    if not _table_exists(conn, 'bots'):
+        return
+    columns = [column[1] for column in conn.execute('PRAGMA table_info(bots)')]
+    if 'enable_strategy_switching' not in columns:
+        conn.execute('ALTER TABLE bots ADD COLUMN enable_strategy_switching INTEGER NOT NULL DEFAULT 0')
+
+
+HOT_QUERY_INDEXES = (
+    ('trade_history', 'idx_trade_history_bot_time', '(bot_id, timestamp)'),
+    ('trade_history', 'idx_trade_history_notifications', '(timestamp) WHERE is_notification = 1'),
+    ('trade_history', 'idx_trade_history_unread', '(timestamp) WHERE is_notification = 1 AND is_read = 0'),
+    ('backtest_results', 'idx_backtest_results_timestamp', '(timestamp, id)'),
+    ('trading_sessions', 'idx_trading_sessions_date', '(session_date)'),
+    ('ai_mentor_reports', 'idx_ai_mentor_reports_session', '(session_id)'),
+    ('daily_trading_data', 'idx_daily_trading_data_session', '(session_id)'),
+)
+
+
+def _create_indexes(conn, indexes):
+    # Tabel AI mentor belum tentu ada di database lama
+    for table, name, definition in indexes:
+        if _table_exists(conn, table):
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} {definition}')
+
+
+def _create_hot_query_indexes(conn):
+    _create_indexes(conn, HOT_QUERY_INDEXES)
+
+
+def _create_notification_cursor_index(conn):
+    _create_indexes(conn, (('trade_history', 'idx_trade_history_notification_id', '(id) WHERE is_notification = 1'),))
+
+
+def _create_backtest_trades_table(conn):
+    if _table_exists(conn, 'backtest_results'):
+        conn.execute(BACKTEST_TRADES_SCHEMA)
+
+
+def _create_backtest_equity_table(conn):
+    if _table_exists(conn, 'backtest_results'):
+        conn.execute(BACKTEST_EQUITY_SCHEMA)
+
+
+# (versi, deskripsi, fungsi) -- tambahkan migrasi baru di akhir, jangan ubah yang lama
+MIGRATIONS = (
+    (1, "Add bots.enable_strategy_switching", _add_strategy_switching_column),
+    (2, "Add indexes for history, notification, backtest and AI mentor queries", _create_hot_query_indexes),
+    (3, "Add notification id index for the cursor feed", _create_notification_cursor_index),
+    (4, "Create backtest_trades for databases that predate it", _create_backtest_trades_table),
+    (5, "Create backtest_equity for paged equity curves", _create_backtest_equity_table),
+)
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def apply_migrations(conn):
+    """Run every migration newer than the database's user_version; returns the versions applied"""
+    if conn.in_transaction:
+        conn.commit()
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version <= get_schema_version(conn):
+            continue
+        conn.execute('BEGIN')
+        try:
+            migrate(conn)
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"Migrasi database v{version} gagal: {description}")
+            raise
+        logger.info(f"Migrasi database v{version} diterapkan: {description}")
+        applied.append(version)
+    return applied
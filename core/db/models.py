@@ -1,12 +1,13 @@
 # core/db/models.py
-import sqlite3
 import json
 from datetime import datetime, date
 from typing import Dict, List, Optional, Any
 
+from .connection import get_db_connection
+
 def log_trade_action(bot_id, action, details):
     try:
-        with sqlite3.connect('bots.db') as conn:
+        with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'INSERT INTO trade_history (bot_id, action, details) VALUES (?, ?, ?)',
@@ -28,7 +29,7 @@ def create_trading_session(session_date: date, emotions: str = 'netral',
                           market_conditions: str = 'normal', notes: str = '') -> int:
     """Buat sesi trading baru dan return session_id"""
     try:
-        with sqlite3.connect('bots.db') as conn:
+        with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'INSERT INTO trading_sessions (session_date, emotions, market_conditions, personal_notes) VALUES (?, ?, ?, ?)',
@@ -45,7 +46,7 @@ def get_or_create_today_session() -> int:
     """Ambil session hari ini atau buat baru jika belum ada"""
     today = date.today()
     try:
-        with sqlite3.connect('bots.db') as conn:
+        with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'SELECT id FROM trading_sessions WHERE session_date = ?',
@@ -68,7 +69,7 @@ def log_trade_for_ai_analysis(bot_id: int, symbol: str, profit_loss: float,
     session_id = get_or_create_today_session()
     
     try:
-        with sqlite3.connect('bots.db') as conn:
+        with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''INSERT INTO daily_trading_data 
@@ -95,7 +96,7 @@ def log_trade_for_ai_analysis(bot_id: int, symbol: str, profit_loss: float,
 def get_trading_session_data(session_date: date) -> Optional[Dict[str, Any]]:
     """Ambil data sesi trading untuk analisis AI"""
     try:
-        with sqlite3.connect('bots.db') as conn:
+        with get_db_connection() as conn:
             cursor = conn.cursor()
             
             # Check if table and columns exist
@@ -179,7 +180,7 @@ def get_trading_session_data(session_date: date) -> Optional[Dict[str, Any]]:
 def save_ai_mentor_report(session_id: int, analysis: Dict[str, Any]) -> bool:
     """Simpan laporan AI mentor ke database"""
     try:
-        with sqlite3.connect('bots.db') as conn:
+        with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''INSERT INTO ai_mentor_reports 
@@ -202,7 +203,7 @@ def save_ai_mentor_report(session_id: int, analysis: Dict[str, Any]) -> bool:
 def update_session_emotions_and_notes(session_date: date, emotions: str, notes: str) -> bool:
     """Update emosi dan catatan untuk sesi trading"""
     try:
-        with sqlite3.connect('bots.db') as conn:
+        with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 '''UPDATE trading_sessions 
@@ -219,7 +220,7 @@ def update_session_emotions_and_notes(session_date: date, emotions: str, notes:
 def get_recent_mentor_reports(limit: int = 7) -> List[Dict[str, Any]]:
     """Ambil laporan mentor AI terbaru"""
     try:
-        with sqlite3.connect('bots.db') as conn:
+        with get_db_connection() as conn:
             cursor = conn.cursor()
             
             # First check if columns exist
@@ -1,11 +1,17 @@
 # core/db/queries.py
 
+import json
 import logging
 import sqlite3
 from .connection import get_db_connection
+from .batch_writer import db_writer, utc_timestamp
+from core.utils.pubsub import Topic
 
 logger = logging.getLogger(__name__)
 
+# Dipublikasikan setiap kali notifikasi baru ter-commit atau ditandai sudah dibaca (dipakai stream SSE)
+notification_topic = Topic('notifications')
+
 def get_all_bots():
     """Mengambil semua data bot dari database."""
     try:
@@ -78,16 +84,15 @@ def update_bot_status(bot_id, status):
         logger.error(f"Gagal update status bot {bot_id}: {e}")
 
 def add_history_log(bot_id, action, details, is_notification=False):
-    """Menambahkan log aktivitas/riwayat untuk bot tertentu."""
-    try:
-        with get_db_connection() as conn:
-            conn.execute(
-                'INSERT INTO trade_history (bot_id, action, details, is_notification, is_read) VALUES (?, ?, ?, ?, ?)',
-                (bot_id, action, details, is_notification, False) # is_read selalu False saat dibuat
-            )
-            conn.commit()
-    except sqlite3.Error as e:
-        logger.error(f"Gagal mencatat riwayat untuk bot {bot_id}: {e}")
+    """
+    Menambahkan log aktivitas/riwayat untuk bot tertentu.
+    Baris diantrekan ke db_writer dan di-commit secara batch; timestamp diambil saat log dibuat.
+    """
+    db_writer.submit(
+        'INSERT INTO trade_history (bot_id, action, details, is_notification, is_read, timestamp) VALUES (?, ?, ?, ?, ?, ?)',
+        (bot_id, action, details, is_notification, False, utc_timestamp()), # is_read selalu False saat dibuat
+        on_commit=notification_topic.publish if is_notification else None
+    )
 
 def get_history_by_bot_id(bot_id):
     """Mengambil semua riwayat dari satu bot berdasarkan ID."""
@@ -118,6 +123,33 @@ def get_notifications():
         logger.error(f"Database error saat mengambil notifikasi: {e}")
         return []
 
+def get_notifications_since(after_id=0, limit=100, unread_only=False):
+    """Notifikasi dengan id > after_id (urut id naik), untuk feed inkremental berbasis cursor."""
+    try:
+        with get_db_connection() as conn:
+            notifications = conn.execute(f'''
+                SELECT h.id, h.action, h.details, h.is_read, h.timestamp, b.name as bot_name
+                FROM trade_history h
+                LEFT JOIN bots b ON h.bot_id = b.id
+                WHERE h.is_notification = 1 AND h.id > ?{' AND h.is_read = 0' if unread_only else ''}
+                ORDER BY h.id
+                LIMIT ?
+            ''', (after_id, limit)).fetchall()
+            return [dict(row) for row in notifications]
+    except sqlite3.Error as e:
+        logger.error(f"Database error saat mengambil feed notifikasi: {e}")
+        return []
+
+def get_latest_notification_id():
+    """Id notifikasi terbaru (0 jika belum ada), titik awal cursor untuk klien baru."""
+    try:
+        with get_db_connection() as conn:
+            row = conn.execute('SELECT MAX(id) FROM trade_history WHERE is_notification = 1').fetchone()
+            return row[0] or 0
+    except sqlite3.Error as e:
+        logger.error(f"Database error saat mengambil id notifikasi terbaru: {e}")
+        return 0
+
 def get_unread_notifications_count():
     """Menghitung jumlah notifikasi yang belum dibaca."""
     try:
@@ -158,7 +190,8 @@ def mark_notifications_as_read(notification_ids=None):
             else: # This is the case where it's called without arguments (mark all) or with None
                 conn.execute('UPDATE trade_history SET is_read = 1 WHERE is_notification = 1 AND is_read = 0')
             conn.commit()
-            return True
+        notification_topic.publish()
+        return True
     except sqlite3.Error as e:
         logger.error(f"Database error saat menandai notifikasi: {e}")
         return False
@@ -172,3 +205,173 @@ def get_all_backtest_history():
     except sqlite3.Error as e:
         logger.error(f"Database error saat mengambil riwayat backtest: {e}")
         return []
+
+# Ringkasan tanpa kolom berat (equity_curve, trade_log) untuk daftar riwayat
+BACKTEST_SUMMARY_COLUMNS = (
+    'id, timestamp, strategy_name, data_filename, total_profit_usd, total_trades, '
+    'win_rate_percent, max_drawdown_percent, wins, losses, parameters'
+)
+
+BACKTEST_TRADES_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS backtest_trades (
+        backtest_id INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        entry_time TEXT,
+        exit_time TEXT,
+        position_type TEXT,
+        entry_price REAL,
+        exit_price REAL,
+        profit REAL,
+        spread_cost REAL,
+        lot_size REAL,
+        reason TEXT,
+        PRIMARY KEY (backtest_id, seq),
+        FOREIGN KEY (backtest_id) REFERENCES backtest_results (id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+'''
+
+BACKTEST_EQUITY_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS backtest_equity (
+        backtest_id INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        equity REAL NOT NULL,
+        PRIMARY KEY (backtest_id, seq),
+        FOREIGN KEY (backtest_id) REFERENCES backtest_results (id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+'''
+
+def ensure_backtest_detail_tables(conn):
+    """
+    Membuat tabel backtest_trades dan backtest_equity pada database lama yang belum memilikinya.
+    Startup sudah membuatnya (migrasi v4/v5); hanya dipanggil saat menyimpan, bukan saat membaca.
+    """
+    conn.execute(BACKTEST_TRADES_SCHEMA)
+    conn.execute(BACKTEST_EQUITY_SCHEMA)
+
+def insert_backtest_trades(conn, backtest_id, trades):
+    """Menyimpan seluruh trade log satu backtest (dalam transaksi milik pemanggil)."""
+    ensure_backtest_detail_tables(conn)
+    conn.executemany(
+        '''INSERT INTO backtest_trades (
+               backtest_id, seq, entry_time, exit_time, position_type, entry_price,
+               exit_price, profit, spread_cost, lot_size, reason
+           ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        [
+            (backtest_id, seq, trade.get('entry_time'), trade.get('exit_time'), trade.get('position_type'),
+             trade.get('entry'), trade.get('exit'), trade.get('profit'), trade.get('spread_cost'),
+             trade.get('lot_size'), trade.get('reason'))
+            for seq, trade in enumerate(trades)
+        ]
+    )
+
+def insert_backtest_equity(conn, backtest_id, equity_curve):
+    """Menyimpan equity curve satu backtest, satu baris per titik (dalam transaksi milik pemanggil)."""
+    ensure_backtest_detail_tables(conn)
+    conn.executemany(
+        'INSERT INTO backtest_equity (backtest_id, seq, equity) VALUES (?, ?, ?)',
+        [(backtest_id, seq, float(value)) for seq, value in enumerate(equity_curve)]
+    )
+
+def delete_backtest_result(backtest_id):
+    """
+    Menghapus satu hasil backtest beserta trade log dan equity curve-nya.
+    foreign_keys tidak diaktifkan (log sistem memakai bot_id=0), jadi baris anak dihapus eksplisit.
+    """
+    try:
+        with get_db_connection() as conn:
+            conn.execute('DELETE FROM backtest_trades WHERE backtest_id = ?', (backtest_id,))
+            conn.execute('DELETE FROM backtest_equity WHERE backtest_id = ?', (backtest_id,))
+            deleted = conn.execute('DELETE FROM backtest_results WHERE id = ?', (backtest_id,)).rowcount
+            conn.commit()
+            return deleted > 0
+    except sqlite3.Error as e:
+        logger.error(f"Gagal menghapus backtest {backtest_id} dari DB: {e}", exc_info=True)
+        return False
+
+def get_backtest_history_summaries(limit=None, offset=0):
+    """Mengambil ringkasan riwayat backtest (tanpa equity curve dan trade log)."""
+    try:
+        with get_db_connection() as conn:
+            query = f'SELECT {BACKTEST_SUMMARY_COLUMNS} FROM backtest_results ORDER BY timestamp DESC, id DESC'
+            if limit is not None:
+                rows = conn.execute(query + ' LIMIT ? OFFSET ?', (int(limit), int(offset))).fetchall()
+            else:
+                rows = conn.execute(query).fetchall()
+            return [dict(row) for row in rows]
+    except sqlite3.Error as e:
+        logger.error(f"Database error saat mengambil ringkasan riwayat backtest: {e}")
+        return []
+
+def get_backtest_summary(backtest_id):
+    """Mengambil ringkasan satu hasil backtest berdasarkan ID."""
+    try:
+        with get_db_connection() as conn:
+            row = conn.execute(
+                f'SELECT {BACKTEST_SUMMARY_COLUMNS} FROM backtest_results WHERE id = ?', (backtest_id,)
+            ).fetchone()
+            return dict(row) if row else None
+    except sqlite3.Error as e:
+        logger.error(f"Database error saat mengambil backtest {backtest_id}: {e}")
+        return None
+
+def get_backtest_trades(backtest_id, limit, offset=0):
+    """
+    Mengambil satu halaman trade log backtest, berurutan dari trade pertama.
+    Mengembalikan (trades, total). Hasil lama yang hanya punya kolom trade_log
+    (JSON 20 trade terakhir) dibaca dari kolom tersebut.
+    """
+    try:
+        with get_db_connection() as conn:
+            total = conn.execute(
+                'SELECT COUNT(*) FROM backtest_trades WHERE backtest_id = ?', (backtest_id,)
+            ).fetchone()[0]
+            if total:
+                rows = conn.execute(
+                    '''SELECT entry_time, exit_time, position_type, entry_price AS entry, exit_price AS exit,
+                              profit, spread_cost, lot_size, reason
+                       FROM backtest_trades WHERE backtest_id = ? ORDER BY seq LIMIT ? OFFSET ?''',
+                    (backtest_id, int(limit), int(offset))
+                ).fetchall()
+                return [dict(row) for row in rows], total
+
+            row = conn.execute('SELECT trade_log FROM backtest_results WHERE id = ?', (backtest_id,)).fetchone()
+            try:
+                legacy = json.loads(row['trade_log']) if row and row['trade_log'] else []
+            except (json.JSONDecodeError, TypeError):
+                legacy = []
+            if not isinstance(legacy, list):
+                legacy = []
+            return legacy[offset:offset + limit], len(legacy)
+    except sqlite3.Error as e:
+        logger.error(f"Database error saat mengambil trade backtest {backtest_id}: {e}")
+        return [], 0
+
+def get_backtest_equity_curve(backtest_id, limit, offset=0):
+    """
+    Mengambil satu halaman equity curve backtest, berurutan dari titik pertama.
+    Mengembalikan (equity, total). Hasil lama yang menyimpan kolom equity_curve
+    (JSON) dibaca dari kolom tersebut.
+    """
+    try:
+        with get_db_connection() as conn:
+            total = conn.execute(
+                'SELECT COUNT(*) FROM backtest_equity WHERE backtest_id = ?', (backtest_id,)
+            ).fetchone()[0]
+            if total:
+                rows = conn.execute(
+                    'SELECT equity FROM backtest_equity WHERE backtest_id = ? ORDER BY seq LIMIT ? OFFSET ?',
+                    (backtest_id, int(limit), int(offset))
+                ).fetchall()
+                return [row[0] for row in rows], total
+
+            row = conn.execute('SELECT equity_curve FROM backtest_results WHERE id = ?', (backtest_id,)).fetchone()
+            try:
+                legacy = json.loads(row['equity_curve']) if row and row['equity_curve'] else []
+            except (json.JSONDecodeError, TypeError):
+                legacy = []
+            if not isinstance(legacy, list):
+                legacy = []
+            return legacy[offset:offset + limit], len(legacy)
+    except sqlite3.Error as e:
+        logger.error(f"Database error saat mengambil equity curve backtest {backtest_id}: {e}")
+        return [], 0
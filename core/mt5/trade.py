@@ -4,7 +4,8 @@ import logging
 import math
 import MetaTrader5 as mt5
 import pandas_ta as ta
-from core.utils.mt5 import get_rates_mt5, TIMEFRAME_MAP
+from core.utils.mt5 import TIMEFRAME_MAP
+from core.utils.market_data_hub import market_data
 
 logger = logging.getLogger(__name__)
 
@@ -81,7 +82,7 @@ def place_trade(symbol, order_type, risk_percent, sl_atr_multiplier, tp_atr_mult
         digits = symbol_info.digits
 
         timeframe_const = TIMEFRAME_MAP.get(timeframe_str, mt5.TIMEFRAME_H1)
-        df = get_rates_mt5(symbol, timeframe_const, 30)
+        df = market_data.get_rates(symbol, timeframe_const, 30)
         if df is None or df.empty or len(df) < 15: return None, "Insufficient data for ATR"
 
         atr = ta.atr(df['high'], df['low'], df['close'], length=14).iloc[-1]
@@ -2,18 +2,29 @@
 
 import numpy as np
 import pandas as pd
+import io
 import json
 import logging
 import subprocess
 import os
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from core.backtesting.enhanced_engine import run_enhanced_backtest as run_backtest
-from core.db.queries import get_all_backtest_history
+from core.backtesting.intrabar import intrabar_window, load_intrabar_data
+from core.backtesting.jobs import TERMINAL_STATUSES, QueueFull, backtest_job_queue
+from core.db.queries import (
+    delete_backtest_result, get_backtest_equity_curve, get_backtest_history_summaries, get_backtest_summary,
+    get_backtest_trades, insert_backtest_equity, insert_backtest_trades
+)
 from core.db.connection import get_db_connection
+from core.utils.instrumentation import PROFILE_MODES
+from core.utils.market_store import load_csv_dataset
 
 api_backtest = Blueprint('api_backtest', __name__)
 logger = logging.getLogger(__name__)
 
+# Directories searched for lab datasets requested by name
+LAB_DATA_DIRS = (os.path.join('lab', 'backtest_data'), 'lab')
+
 def save_backtest_result(strategy_name, filename, params, results):
     # Sanitasi data sebelum menyimpan
     for key, value in results.items():
@@ -60,118 +71,288 @@ def save_backtest_result(strategy_name, filename, params, results):
                 results.get('max_drawdown_percent', 0),
                 results.get('wins', 0),
                 results.get('losses', 0),
-                json.dumps(results.get('equity_curve', [])),
-                json.dumps(results.get('trades', [])),
+                None,  # Equity curve disimpan per titik di backtest_equity
+                None,  # Trade log lengkap disimpan per baris di backtest_trades
                 json.dumps(enhanced_params)
             ))
+            backtest_id = cursor.lastrowid
+            insert_backtest_trades(conn, backtest_id, results.get('trades', []))
+            insert_backtest_equity(conn, backtest_id, results.get('equity_curve', []))
             conn.commit()
+            return backtest_id
     except Exception as e:
         logger.error(f"[DB ERROR] Gagal menyimpan hasil backtest: {e}", exc_info=True)
+        return None
+
+def resolve_lab_dataset(name):
+    """Path of a lab CSV by file name, searched in LAB_DATA_DIRS (None if not found)"""
+    filename = os.path.basename(name or '')
+    if not filename.endswith('.csv'):
+        return None
+    for directory in LAB_DATA_DIRS:
+        path = os.path.join(directory, filename)
+        if os.path.isfile(path):
+            return path
+    return None
+
+def execute_backtest_job(job, source, data_filename, strategy_id, params, use_intrabar=False,
+                         instrumentation=None):
+    """Job body: load data, run the enhanced backtest and save the result"""
+    job.set_phase('loading')
+    if 'path' in source:
+        df = load_csv_dataset(source['path'], start=source.get('start'), end=source.get('end'))
+    else:
+        df = pd.read_csv(io.BytesIO(source['raw']), parse_dates=['time'])
+    
+    # Map web interface parameter names to enhanced engine parameter names
+    enhanced_params = params.copy()
+    
+    # Map old parameter names to new enhanced engine names
+    if 'lot_size' in params and 'risk_percent' not in params:
+        enhanced_params['risk_percent'] = float(params['lot_size'])
+        
+    if 'sl_pips' in params and 'sl_atr_multiplier' not in params:
+        enhanced_params['sl_atr_multiplier'] = float(params['sl_pips'])
+        
+    if 'tp_pips' in params and 'tp_atr_multiplier' not in params:
+        enhanced_params['tp_atr_multiplier'] = float(params['tp_pips'])
+    
+    logger.info(f"Parameter mapping: {params} -> {enhanced_params}")
+    
+    # Extract symbol name from filename for accurate XAUUSD detection
+    symbol_name = None
+    if data_filename:
+        # Try to extract symbol from filename (e.g., "XAUUSD_H1_data.csv" -> "XAUUSD")
+        filename_parts = data_filename.replace('.csv', '').split('_')
+        if filename_parts:
+            symbol_name = filename_parts[0].upper()
+            logger.info(f"Detected symbol from filename: {symbol_name}")
+    
+    # Enhanced backtesting with realistic cost modeling and risk management
+    # Use enhanced engine for more accurate results
+    engine_config = {
+        'enable_spread_costs': True,    # Model realistic spread costs
+        'enable_slippage': True,        # Include slippage simulation
+        'enable_realistic_execution': True,  # Realistic bid/ask execution
+        'include_all_trades': True,     # Full trade log is persisted; the response keeps the last 20
+        **(instrumentation or {})       # Optional timings / profile blocks
+    }
+    
+    if use_intrabar and symbol_name:
+        # The last parent bar's sub-bars run up to one bar length after its open time
+        start, end = intrabar_window(df['time'])
+        intrabar_df, timeframe = load_intrabar_data(symbol_name, LAB_DATA_DIRS, start=start, end=end)
+        if intrabar_df is not None:
+            engine_config['intrabar_data'] = intrabar_df
+            logger.info(f"Intrabar exit resolution with {timeframe} data for {symbol_name}")
+        else:
+            logger.warning(f"No M1/M5 data found for {symbol_name}; using the stop-loss-first rule")
+    
+    def on_progress(bars_done, total_bars):
+        if job.phase != 'simulating':
+            job.set_phase('simulating')
+        job.report_progress(bars_done, total_bars)
+    
+    job.set_phase('analyzing')
+    results = run_backtest(strategy_id, enhanced_params, df, symbol_name=symbol_name,
+                           engine_config=engine_config, progress_callback=on_progress)
+
+    # Simpan hasil jika berhasil
+    if results and not results.get('error'):
+        job.set_phase('saving')
+        strategy_name = results.get('strategy_name', strategy_id)
+        results['backtest_id'] = save_backtest_result(strategy_name, data_filename, params, results)
+        results['trades'] = results.get('trades', [])[-20:]
+
+    return results
 
 @api_backtest.route('/api/backtest/run', methods=['POST'])
 def run_backtest_route():
+    """Queue a backtest and return its job id; poll /api/backtest/jobs/<id> for the result"""
+    # Data comes from an uploaded CSV or from a lab dataset read through the columnar store
     if 'file' not in request.files:
-        return jsonify({"error": "Tidak ada file data yang diunggah"}), 400
-    
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({"error": "Nama file kosong"}), 400
+        dataset = request.form.get('dataset')
+        if not dataset:
+            return jsonify({"error": "Tidak ada file data yang diunggah"}), 400
+        dataset_path = resolve_lab_dataset(dataset)
+        if not dataset_path:
+            return jsonify({"error": f"Dataset tidak ditemukan: {dataset}"}), 404
+        source = {
+            'path': dataset_path,
+            'start': request.form.get('start') or None,
+            'end': request.form.get('end') or None
+        }
+        # Tanggal tidak valid ditolak di sini, bukan gagal di dalam job saat memuat data
+        for bound in ('start', 'end'):
+            if source[bound] is not None:
+                try:
+                    valid = not pd.isna(pd.Timestamp(source[bound]))
+                except ValueError:
+                    valid = False
+                if not valid:
+                    return jsonify({"error": f"Nilai {bound} bukan tanggal yang valid: {source[bound]}"}), 400
+        data_filename = os.path.basename(dataset_path)
+    else:
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({"error": "Nama file kosong"}), 400
+        # The upload stream closes with the request, so keep the raw bytes for the worker
+        source = {'raw': file.read()}
+        data_filename = file.filename
 
     try:
-        df = pd.read_csv(file.stream, parse_dates=['time'])
         strategy_id = request.form.get('strategy')
         params = json.loads(request.form.get('params', '{}'))
-        
-        # Map web interface parameter names to enhanced engine parameter names
-        enhanced_params = params.copy()
-        
-        # Map old parameter names to new enhanced engine names
-        if 'lot_size' in params and 'risk_percent' not in params:
-            enhanced_params['risk_percent'] = float(params['lot_size'])
-            
-        if 'sl_pips' in params and 'sl_atr_multiplier' not in params:
-            enhanced_params['sl_atr_multiplier'] = float(params['sl_pips'])
-            
-        if 'tp_pips' in params and 'tp_atr_multiplier' not in params:
-            enhanced_params['tp_atr_multiplier'] = float(params['tp_pips'])
-        
-        logger.info(f"Parameter mapping: {params} -> {enhanced_params}")
-        
-        # Extract symbol name from filename for accurate XAUUSD detection
-        symbol_name = None
-        if file.filename:
-            # Try to extract symbol from filename (e.g., "XAUUSD_H1_data.csv" -> "XAUUSD")
-            filename_parts = file.filename.replace('.csv', '').split('_')
-            if filename_parts:
-                symbol_name = filename_parts[0].upper()
-                logger.info(f"Detected symbol from filename: {symbol_name}")
-        
-        # Enhanced backtesting with realistic cost modeling and risk management
-        # Use enhanced engine for more accurate results
-        engine_config = {
-            'enable_spread_costs': True,    # Model realistic spread costs
-            'enable_slippage': True,        # Include slippage simulation
-            'enable_realistic_execution': True  # Realistic bid/ask execution
-        }
-        
-        results = run_backtest(strategy_id, enhanced_params, df, symbol_name=symbol_name, engine_config=engine_config)
+    except json.JSONDecodeError as e:
+        return jsonify({"error": f"Parameter tidak valid: {str(e)}"}), 400
 
-        # Simpan hasil jika berhasil
-        if results and not results.get('error'):
-            strategy_name = results.get('strategy_name', strategy_id)
-            save_backtest_result(strategy_name, file.filename, params, results)
+    use_intrabar = request.form.get('intrabar', '').lower() in ('1', 'true', 'on')
 
-        return jsonify(results)
-    except Exception as e:
-        return jsonify({"error": f"Terjadi kesalahan saat backtesting: {str(e)}"}), 500
+    # Opt-in instrumentation: per-phase timings and a cProfile/tracemalloc report
+    instrumentation = {}
+    if request.form.get('timings', '').lower() in ('1', 'true', 'on'):
+        instrumentation['timings'] = True
+    profile_mode = request.form.get('profile')
+    if profile_mode:
+        if profile_mode not in PROFILE_MODES:
+            return jsonify({"error": f"Mode profil tidak dikenal: {profile_mode}"}), 400
+        instrumentation['profile'] = profile_mode
+
+    try:
+        job = backtest_job_queue.submit(
+            execute_backtest_job, source, data_filename, strategy_id, params, use_intrabar, instrumentation,
+            description={'strategy': strategy_id, 'filename': data_filename}
+        )
+    except QueueFull as e:
+        return jsonify({"error": str(e)}), 429
+
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/backtest/jobs/{job.id}",
+        "events_url": f"/api/backtest/jobs/{job.id}/events"
+    }), 202
+
+@api_backtest.route('/api/backtest/jobs', methods=['GET'])
+def list_backtest_jobs_route():
+    return jsonify([job.to_dict(include_result=False) for job in backtest_job_queue.list_jobs()])
+
+@api_backtest.route('/api/backtest/jobs/<job_id>', methods=['GET'])
+def get_backtest_job_route(job_id):
+    job = backtest_job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job tidak ditemukan"}), 404
+    return jsonify(job.to_dict())
+
+@api_backtest.route('/api/backtest/jobs/<job_id>/events', methods=['GET'])
+def stream_backtest_job_route(job_id):
+    """Server-Sent Events stream of job updates; ends after the final result"""
+    job = backtest_job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job tidak ditemukan"}), 404
+
+    def generate():
+        seen_version = None
+        while True:
+            if job.version != seen_version:
+                seen_version = job.version
+                finished = job.status in TERMINAL_STATUSES
+                payload = json.dumps(job.to_dict(include_result=finished), default=_json_default)
+                yield f"data: {payload}\n\n"
+                if finished:
+                    return
+            else:
+                yield ": keep-alive\n\n"
+            backtest_job_queue.wait_for_change(job, seen_version)
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@api_backtest.route('/api/backtest/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_backtest_job_route(job_id):
+    job = backtest_job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job tidak ditemukan"}), 404
+    if not backtest_job_queue.cancel(job_id):
+        return jsonify({"error": f"Job sudah selesai ({job.status})"}), 409
+    return jsonify({"success": True, "job_id": job_id, "status": job.status})
+
+def _json_default(value):
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    return str(value)
+
+def _parse_parameters(record):
+    try:
+        params = json.loads(record['parameters']) if record.get('parameters') else {}
+    except (json.JSONDecodeError, TypeError):
+        params = {}
+    record['parameters'] = params if isinstance(params, dict) else {}
+    return record
+
+def _page_args(default_per_page, max_per_page):
+    """page (mulai dari 1) dan per_page dari query string, dibatasi max_per_page"""
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', default_per_page, type=int), 1), max_per_page)
+    return page, per_page
 
 @api_backtest.route('/api/backtest/history', methods=['GET'])
 def get_history_route():
+    """Ringkasan riwayat backtest; trade log dan equity curve diambil per run"""
     try:
-        history = get_all_backtest_history()
-        processed_history = []
-        for record in history:
-            # Create a mutable copy (dictionary) from the database record
-            new_record = dict(record)
-            
-            # Parse JSON fields safely
-            if 'trade_log' in new_record and new_record['trade_log']:
-                try:
-                    trades = json.loads(new_record['trade_log'])
-                    if isinstance(trades, list):
-                        new_record['trade_log'] = trades
-                except (json.JSONDecodeError, TypeError):
-                    new_record['trade_log'] = []
-            else:
-                new_record['trade_log'] = []
-            
-            if 'equity_curve' in new_record and new_record['equity_curve']:
-                try:
-                    equity = json.loads(new_record['equity_curve'])
-                    if isinstance(equity, list):
-                        new_record['equity_curve'] = equity
-                except (json.JSONDecodeError, TypeError):
-                    new_record['equity_curve'] = []
-            else:
-                new_record['equity_curve'] = []
-                
-            if 'parameters' in new_record and new_record['parameters']:
-                try:
-                    params = json.loads(new_record['parameters'])
-                    if isinstance(params, dict):
-                        new_record['parameters'] = params
-                except (json.JSONDecodeError, TypeError):
-                    new_record['parameters'] = {}
-            else:
-                new_record['parameters'] = {}
-            
-            processed_history.append(new_record)
-            
-        return jsonify(processed_history)
+        limit = request.args.get('limit', type=int)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        history = get_backtest_history_summaries(limit=limit, offset=offset)
+        return jsonify([_parse_parameters(record) for record in history])
     except Exception as e:
         logger.error(f"Error processing history: {str(e)}", exc_info=True)
         return jsonify({"error": f"Terjadi kesalahan saat mengambil riwayat: {str(e)}"}), 500
 
+@api_backtest.route('/api/backtest/history/<int:backtest_id>', methods=['GET'])
+def get_history_detail_route(backtest_id):
+    record = get_backtest_summary(backtest_id)
+    if record is None:
+        return jsonify({"error": "Hasil backtest tidak ditemukan"}), 404
+    return jsonify(_parse_parameters(record))
+
+@api_backtest.route('/api/backtest/history/<int:backtest_id>', methods=['DELETE'])
+def delete_history_route(backtest_id):
+    """Menghapus satu hasil backtest beserta trade log dan equity curve-nya"""
+    if get_backtest_summary(backtest_id) is None:
+        return jsonify({"error": "Hasil backtest tidak ditemukan"}), 404
+    if delete_backtest_result(backtest_id):
+        return jsonify({"message": "Hasil backtest berhasil dihapus."}), 200
+    return jsonify({"error": "Gagal menghapus hasil backtest dari database"}), 500
+
+@api_backtest.route('/api/backtest/history/<int:backtest_id>/trades', methods=['GET'])
+def get_history_trades_route(backtest_id):
+    if get_backtest_summary(backtest_id) is None:
+        return jsonify({"error": "Hasil backtest tidak ditemukan"}), 404
+    page, per_page = _page_args(default_per_page=100, max_per_page=1000)
+    trades, total = get_backtest_trades(backtest_id, limit=per_page, offset=(page - 1) * per_page)
+    return jsonify({
+        "backtest_id": backtest_id,
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": (total + per_page - 1) // per_page,
+        "trades": trades
+    })
+
+@api_backtest.route('/api/backtest/history/<int:backtest_id>/equity', methods=['GET'])
+def get_history_equity_route(backtest_id):
+    if get_backtest_summary(backtest_id) is None:
+        return jsonify({"error": "Hasil backtest tidak ditemukan"}), 404
+    page, per_page = _page_args(default_per_page=5000, max_per_page=50000)
+    equity, total = get_backtest_equity_curve(backtest_id, limit=per_page, offset=(page - 1) * per_page)
+    return jsonify({
+        "backtest_id": backtest_id,
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": (total + per_page - 1) // per_page,
+        "equity_curve": equity
+    })
+
 @api_backtest.route('/api/download-data', methods=['POST'])
 def download_data_route():
     """Download historical market data using the standalone script"""
@@ -2,17 +2,28 @@
 
 import json
 import logging
-from flask import Blueprint, jsonify, request
+import time
+from flask import Blueprint, Response, jsonify, request
 import MetaTrader5 as mt5
+import numpy as np
 from core.bots import controller
+from core.bots.trading_bot import analysis_topic
 from core.db import queries
-from core.utils.mt5 import get_rates_mt5
+from core.utils.market_data_hub import market_data
 from core.utils.mt5 import TIMEFRAME_MAP
 from core.strategies.strategy_map import STRATEGY_MAP
 
 api_bots = Blueprint('api_bots', __name__)
 logger = logging.getLogger(__name__)
 
+ANALYSIS_STREAM_KEEPALIVE_SECONDS = 15.0
+ANALYSIS_STREAM_COALESCE_SECONDS = 0.25
+
+def _json_default(value):
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    return str(value)
+
 @api_bots.route('/api/strategies', methods=['GET'])
 def get_strategies_route():
     try:
@@ -175,6 +186,52 @@ def get_analysis_route(bot_id):
     data = controller.get_bot_analysis_data(bot_id)
     return jsonify(data if data else {"signal": "Data belum tersedia"})
 
+@api_bots.route('/api/bots/analysis/stream', methods=['GET'])
+def stream_analysis_route():
+    """
+    Server-Sent Events: event `analysis` ({bot_id, analysis}) setiap kali analisis bot berubah.
+    `?ids=1,2` membatasi bot yang dipantau (tanpa ids: semua bot aktif). Update yang datang
+    beruntun digabung per klien, sehingga tiap bot dikirim sekali dengan nilai terbarunya.
+    """
+    ids = {int(i) for i in request.args.get('ids', '').split(',') if i.strip().isdigit()}
+
+    def event(bot_id, analysis):
+        data = json.dumps({'bot_id': bot_id, 'analysis': analysis}, default=_json_default)
+        return f"event: analysis\ndata: {data}\n\n"
+
+    def generate():
+        seen_version = analysis_topic.version
+        if ids:
+            sent = {bot_id: controller.get_bot_analysis_data(bot_id) for bot_id in ids}
+        else:
+            sent = {bot_id: bot.last_analysis for bot_id, bot in list(controller.active_bots.items())}
+        yield "retry: 5000\n\n"
+        for bot_id, analysis in sent.items():
+            if analysis is not None:
+                yield event(bot_id, analysis)
+        while True:
+            version = analysis_topic.wait_for_change(seen_version, ANALYSIS_STREAM_KEEPALIVE_SECONDS)
+            if version == seen_version:
+                # Bot tidak aktif yang dipantau: analisis on-demand di-cache per bar,
+                # hanya bar baru yang dihitung ulang (dan dipublikasikan bila berubah)
+                for bot_id in ids:
+                    if bot_id not in controller.active_bots:
+                        controller.get_bot_analysis_data(bot_id)
+                if analysis_topic.version == seen_version:
+                    yield ": keep-alive\n\n"
+                    continue
+            # Tunggu sebentar agar update beruntun terkirim sekali saja
+            time.sleep(ANALYSIS_STREAM_COALESCE_SECONDS)
+            seen_version, changes = analysis_topic.changes_since(seen_version)
+            for bot_id, analysis in changes.items():
+                if (ids and bot_id not in ids) or sent.get(bot_id) == analysis:
+                    continue
+                sent[bot_id] = analysis
+                yield event(bot_id, analysis)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @api_bots.route('/api/bots/<int:bot_id>/history', methods=['GET'])
 def get_bot_history_route(bot_id):
     """Mengembalikan riwayat aktivitas untuk bot."""
@@ -189,7 +246,7 @@ def get_rsi_data_route():
     
     timeframe = TIMEFRAME_MAP.get(timeframe_str.upper(), mt5.TIMEFRAME_H1)
     
-    df = get_rates_mt5(symbol, timeframe, 100)
+    df = market_data.get_rates(symbol, timeframe, 100)
     
     if df is None or df.empty:
         return jsonify({"error": f"Tidak dapat mengambil data untuk {symbol}"}), 404
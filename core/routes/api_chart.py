@@ -1,7 +1,7 @@
 # core/routes/api_chart.py
 
 from flask import Blueprint, jsonify, request
-from core.utils.mt5 import get_rates_mt5
+from core.utils.market_data_hub import market_data
 import MetaTrader5 as mt5
 
 api_chart = Blueprint('api_chart', __name__)
@@ -9,7 +9,7 @@ api_chart = Blueprint('api_chart', __name__)
 @api_chart.route('/api/chart/data')
 def api_chart_data():
     symbol = request.args.get('symbol', 'EURUSD')
-    df = get_rates_mt5(symbol, mt5.TIMEFRAME_H1, 100)
+    df = market_data.get_rates(symbol, mt5.TIMEFRAME_H1, 100)
     
     if df is None or df.empty:
         return jsonify({"error": "Gagal mengambil data grafik"}), 500
@@ -1,7 +1,8 @@
 # core/routes/api_dashboard.py
 
 from flask import Blueprint, jsonify, request
-from core.utils.mt5 import get_account_info_mt5, get_todays_profit_mt5, get_rates_mt5
+from core.utils.mt5 import get_account_info_mt5, get_todays_profit_mt5
+from core.utils.market_data_hub import market_data
 from core.db import queries
 from datetime import datetime, timedelta
 import MetaTrader5 as mt5
@@ -95,7 +96,7 @@ def api_market_data(symbol):
     """Get market data including price and RSI for charts"""
     try:
         # Get historical data for the symbol
-        df = get_rates_mt5(symbol, mt5.TIMEFRAME_H1, 50)
+        df = market_data.get_rates(symbol, mt5.TIMEFRAME_H1, 50)
         
         if df is None or df.empty:
             return jsonify({
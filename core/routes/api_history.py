@@ -1,14 +1,10 @@
 # core/routes/api_history.py
 
-import os
 from flask import Blueprint, jsonify
 from core.utils.mt5 import get_trade_history_mt5
 
 api_history = Blueprint('api_history', __name__)
 
-# Gunakan path absolut untuk file database untuk menghindari masalah CWD
-DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bots.db")
-
 @api_history.route('/api/history')
 def api_global_history():
     history = get_trade_history_mt5()
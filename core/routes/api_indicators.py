@@ -1,7 +1,7 @@
 # core/routes/api_indicators.py
 
 from flask import Blueprint, request, jsonify
-from core.utils.mt5 import get_rates_mt5
+from core.utils.market_data_hub import market_data
 import MetaTrader5 as mt5
 import pandas_ta as ta
 
@@ -22,7 +22,7 @@ def get_rsi_data():
     }
     timeframe = tf_map.get(tf.upper(), mt5.TIMEFRAME_H1)
 
-    df = get_rates_mt5(symbol, timeframe, 100)
+    df = market_data.get_rates(symbol, timeframe, 100)
     if df is None or len(df) < 20:
         return jsonify({'timestamps': [], 'rsi_values': []})
 
@@ -30,6 +30,6 @@ def get_rsi_data():
     df = df.dropna().tail(20)
 
     return jsonify({
-        'timestamps': [x.strftime('%H:%M') for x in df['time']],
+        'timestamps': [x.strftime('%H:%M') for x in df.index],
         'rsi_values': df['RSI'].round(2).tolist()
     })
@@ -1,10 +1,21 @@
 # core/routes/api_notifications.py
 
+import json
+
 from core.db import queries
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 
 api_notifications = Blueprint('api_notifications', __name__)
 
+FEED_PAGE_SIZE = 100
+UNREAD_BACKLOG_LIMIT = 500
+STREAM_KEEPALIVE_SECONDS = 15.0
+
+def _sse_event(event, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, default=str)}"]
+    return '\n'.join(lines) + '\n\n'
+
 @api_notifications.route('/api/notifications', methods=['GET'])
 def get_notifications_route():
     """Mengembalikan daftar notifikasi penting."""
@@ -34,6 +45,67 @@ def get_unread_notifications_route():
     except Exception as e:
         return jsonify({"error": f"Gagal mengambil notifikasi belum dibaca: {e}"}), 500
 
+@api_notifications.route('/api/notifications/feed', methods=['GET'])
+def get_notification_feed_route():
+    """Notifikasi yang lebih baru dari cursor `after` (id terakhir yang sudah dilihat klien)."""
+    try:
+        after = max(request.args.get('after', 0, type=int), 0)
+        limit = min(max(request.args.get('limit', FEED_PAGE_SIZE, type=int), 1), UNREAD_BACKLOG_LIMIT)
+        unread_only = request.args.get('unread') == '1'
+        notifications = queries.get_notifications_since(after, limit, unread_only)
+        return jsonify({
+            'notifications': notifications,
+            'cursor': notifications[-1]['id'] if notifications else after,
+            'has_more': len(notifications) == limit
+        })
+    except Exception as e:
+        return jsonify({"error": f"Gagal mengambil feed notifikasi: {e}"}), 500
+
+@api_notifications.route('/api/notifications/stream', methods=['GET'])
+def stream_notifications_route():
+    """
+    Server-Sent Events: `notification` untuk setiap notifikasi baru (id = cursor) dan
+    `unread-count` saat jumlahnya berubah. Tanpa `after`/Last-Event-ID, stream dimulai
+    dengan notifikasi yang belum dibaca. Klien yang diam hanya menunggu di notification_topic.
+    """
+    after = request.headers.get('Last-Event-ID', type=int)
+    if after is None:
+        after = request.args.get('after', type=int)
+    topic = queries.notification_topic
+
+    def generate():
+        # Versi diambil sebelum query awal agar notifikasi yang masuk di antaranya tidak terlewat
+        seen_version = topic.version
+        cursor, backlog = after, []
+        if cursor is None:
+            # Klien baru: tampilkan dulu yang belum dibaca, lalu lanjut dari notifikasi terbaru
+            cursor = queries.get_latest_notification_id()
+            backlog = queries.get_notifications_since(0, UNREAD_BACKLOG_LIMIT, unread_only=True)
+        yield "retry: 5000\n\n"
+        for row in backlog:
+            yield _sse_event('notification', row, event_id=row['id'])
+            cursor = max(cursor, row['id'])
+        unread_count = None
+        while True:
+            rows = queries.get_notifications_since(cursor, FEED_PAGE_SIZE)
+            for row in rows:
+                yield _sse_event('notification', row, event_id=row['id'])
+                cursor = row['id']
+            if len(rows) == FEED_PAGE_SIZE:
+                continue
+            count = queries.get_unread_notifications_count().get('unread_count', 0)
+            if count != unread_count:
+                unread_count = count
+                yield _sse_event('unread-count', {'unread_count': count})
+            version = topic.wait_for_change(seen_version, STREAM_KEEPALIVE_SECONDS)
+            while version == seen_version:
+                yield ": keep-alive\n\n"
+                version = topic.wait_for_change(seen_version, STREAM_KEEPALIVE_SECONDS)
+            seen_version = version
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @api_notifications.route('/api/notifications/mark-as-read', methods=['POST'])
 def mark_notifications_as_read_route():
     """Menandai notifikasi spesifik sebagai sudah dibaca."""
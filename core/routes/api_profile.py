@@ -1,15 +1,13 @@
 # core/routes/api_profile.py
 
 from flask import Blueprint, jsonify, request
-import sqlite3
+from core.db.connection import get_db_connection
 from werkzeug.security import generate_password_hash
 
 api_profile = Blueprint('api_profile', __name__)
 
 def get_db():
-    conn = sqlite3.connect('bots.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_db_connection()
 
 @api_profile.route('/api/profile', methods=['GET'])
 def get_profile():
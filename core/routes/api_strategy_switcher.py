@@ -7,7 +7,6 @@ the automatic strategy switching system.
 """
 
 from flask import Blueprint, jsonify, request
-import pandas as pd
 import os
 from datetime import datetime
 
@@ -19,8 +18,9 @@ from ..strategies.strategy_switcher import (
 )
 from ..strategies.market_condition_detector import get_market_condition
 from ..strategies.performance_scorer import calculate_strategy_score, rank_strategies
-from ..backtesting.enhanced_engine import run_enhanced_backtest
+from ..backtesting.result_cache import cached_backtest
 from ..strategies.strategy_map import STRATEGY_MAP
+from ..utils.market_store import load_csv_dataset
 
 # Create blueprint
 api_strategy_switcher = Blueprint('api_strategy_switcher', __name__, url_prefix='/api/strategy-switcher')
@@ -68,7 +68,7 @@ def evaluate_switch():
             file_path = os.path.join(data_directory, f'{symbol}_H1_data.csv')
             if os.path.exists(file_path):
                 try:
-                    df = pd.read_csv(file_path, parse_dates=['time'])
+                    df = load_csv_dataset(file_path)
                     current_data[symbol] = df
                 except Exception as e:
                     print(f"Error loading data for {symbol}: {e}")
@@ -108,7 +108,7 @@ def get_strategy_rankings():
             file_path = os.path.join(data_directory, f'{symbol}_H1_data.csv')
             if os.path.exists(file_path):
                 try:
-                    df = pd.read_csv(file_path, parse_dates=['time'])
+                    df = load_csv_dataset(file_path)
                     current_data[symbol] = df
                 except Exception as e:
                     print(f"Error loading data for {symbol}: {e}")
@@ -143,7 +143,7 @@ def get_strategy_rankings():
                     strategy_params = strategy_switcher._get_strategy_parameters(strategy_id, symbol)
                     
                     # Run backtest
-                    backtest_results = run_enhanced_backtest(
+                    backtest_results = cached_backtest(
                         strategy_id,
                         strategy_params,
                         test_df,
@@ -189,7 +189,7 @@ def get_market_conditions():
             file_path = os.path.join(data_directory, f'{symbol}_H1_data.csv')
             if os.path.exists(file_path):
                 try:
-                    df = pd.read_csv(file_path, parse_dates=['time'])
+                    df = load_csv_dataset(file_path)
                     current_data[symbol] = df
                 except Exception as e:
                     print(f"Error loading data for {symbol}: {e}")
@@ -297,7 +297,7 @@ def test_strategy_combination():
             }), 404
         
         try:
-            df = pd.read_csv(file_path, parse_dates=['time'])
+            df = load_csv_dataset(file_path)
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -318,7 +318,7 @@ def test_strategy_combination():
         
         # Run backtest
         test_df = df.tail(strategy_switcher.config['performance_evaluation_period']).copy()
-        backtest_results = run_enhanced_backtest(
+        backtest_results = cached_backtest(
             strategy_id,
             strategy_params,
             test_df,
@@ -362,7 +362,7 @@ def manual_trigger():
             file_path = os.path.join(data_directory, f'{symbol}_H1_data.csv')
             if os.path.exists(file_path):
                 try:
-                    df = pd.read_csv(file_path, parse_dates=['time'])
+                    df = load_csv_dataset(file_path)
                     current_data[symbol] = df
                 except Exception as e:
                     print(f"Error loading data for {symbol}: {e}")
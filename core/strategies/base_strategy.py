@@ -2,11 +2,17 @@
 
 from abc import ABC, abstractmethod
 
+from ..utils.instrumentation import strategy_section
+
 class BaseStrategy(ABC):
     """
     Kelas dasar abstrak untuk semua strategi trading.
     Setiap strategi harus mewarisi kelas ini dan mengimplementasikan metode `analyze`.
     """
+    # Bot live menganalisa sekali per bar tertutup. Strategi yang perlu bereaksi
+    # di dalam bar (mis. scalping) set True agar juga dibangunkan tiap check_interval.
+    intrabar = False
+
     def __init__(self, bot_instance, params: dict = {}):
         self.bot = bot_instance
         self.params = params
@@ -26,4 +32,11 @@ class BaseStrategy(ABC):
         Metode kelas yang mengembalikan daftar parameter yang bisa diatur oleh pengguna.
         Setiap strategi turunan harus meng-override ini jika memiliki parameter.
         """
-        return []
\ No newline at end of file
+        return []
+
+    def timed(self, section):
+        """
+        Context manager yang mencatat waktu satu bagian analisa strategi
+        ke blok `timings` backtest (hanya aktif bila timings diminta).
+        """
+        return strategy_section(section)
@@ -1,5 +1,5 @@
 # /core/strategies/bollinger_reversion.py
-import pandas_ta as ta
+from ..utils.indicator_cache import ta, append_indicator
 import numpy as np
 from .base_strategy import BaseStrategy
 
@@ -28,7 +28,7 @@ class BollingerBandsStrategy(BaseStrategy):
         bbl_col = f'BBL_{bb_length}_{bb_std:.1f}'
         trend_filter_col = f'SMA_{trend_filter_period}'
 
-        df.ta.bbands(length=bb_length, std=bb_std, append=True)
+        append_indicator(df, 'bbands', length=bb_length, std=bb_std)
         df[trend_filter_col] = ta.sma(df['close'], length=trend_filter_period)
         df.dropna(inplace=True)
         
@@ -62,7 +62,7 @@ class BollingerBandsStrategy(BaseStrategy):
         bbl_col = f'BBL_{bb_length}_{bb_std:.1f}'
         trend_filter_col = f'SMA_{trend_filter_period}'
 
-        df.ta.bbands(length=bb_length, std=bb_std, append=True)
+        append_indicator(df, 'bbands', length=bb_length, std=bb_std)
         df[trend_filter_col] = ta.sma(df['close'], length=trend_filter_period)
 
         is_uptrend = df['close'] > df[trend_filter_col]
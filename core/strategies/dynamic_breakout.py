@@ -1,5 +1,5 @@
 # /core/strategies/dynamic_breakout.py
-import pandas_ta as ta
+from ..utils.indicator_cache import ta, append_indicator
 import numpy as np
 from .base_strategy import BaseStrategy
 
@@ -30,7 +30,7 @@ class DynamicBreakoutStrategy(BaseStrategy):
 
         # --- 1. Hitung Indikator ---
         # Donchian Channels
-        df.ta.donchian(lower_length=donchian_period, upper_length=donchian_period, append=True)
+        append_indicator(df, 'donchian', lower_length=donchian_period, upper_length=donchian_period)
         donchian_upper_col = f'DCU_{donchian_period}_{donchian_period}'
         donchian_lower_col = f'DCL_{donchian_period}_{donchian_period}'
 
@@ -40,7 +40,7 @@ class DynamicBreakoutStrategy(BaseStrategy):
 
         # ATR Volatility Filter
         atr_col = f'ATRr_{atr_period}'
-        df.ta.atr(length=atr_period, append=True)
+        append_indicator(df, 'atr', length=atr_period)
 
         # --- 2. Tentukan Kondisi & Filter ---
         # Kondisi Breakout: harga menembus channel dari bar sebelumnya
@@ -1,6 +1,6 @@
 # core/strategies/ichimoku_cloud.py
 import numpy as np
-import pandas_ta as ta
+from ..utils.indicator_cache import append_indicator
 from .base_strategy import BaseStrategy
 
 class IchimokuCloudStrategy(BaseStrategy):
@@ -28,7 +28,7 @@ class IchimokuCloudStrategy(BaseStrategy):
             return {"signal": "HOLD", "price": None, "explanation": "Data tidak cukup."}
 
         # Hitung Indikator Ichimoku
-        df.ta.ichimoku(tenkan=tenkan_period, kijun=kijun_period, senkou=senkou_period, append=True)
+        append_indicator(df, 'ichimoku', tenkan=tenkan_period, kijun=kijun_period, senkou=senkou_period)
         df.dropna(inplace=True)
         
         if len(df) < 2:
@@ -89,7 +89,7 @@ class IchimokuCloudStrategy(BaseStrategy):
             return df
 
         # Hitung Indikator Ichimoku
-        df.ta.ichimoku(tenkan=tenkan_period, kijun=kijun_period, senkou=senkou_period, append=True)
+        append_indicator(df, 'ichimoku', tenkan=tenkan_period, kijun=kijun_period, senkou=senkou_period)
         df.dropna(inplace=True)
         df = df.reset_index(drop=True)
 
@@ -1,7 +1,9 @@
 # core/strategies/index_breakout_pro.py
 
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from ..utils.indicator_cache import ta
+from ..utils.pivots import cluster_levels, pivot_levels
 from .base_strategy import BaseStrategy
 import logging
 
@@ -258,25 +260,9 @@ class IndexBreakoutProStrategy(BaseStrategy):
     def _identify_support_resistance(self, df):
         """Identify key support and resistance levels"""
         try:
-            levels = []
-            lookback = self.params['breakout_period']
-            
-            # Find pivot highs and lows
-            for i in range(lookback, len(df) - lookback):
-                # Pivot high
-                if (df['high'].iloc[i] > df['high'].iloc[i-lookback:i].max() and
-                    df['high'].iloc[i] > df['high'].iloc[i+1:i+lookback+1].max()):
-                    levels.append({'level': df['high'].iloc[i], 'type': 'resistance', 'strength': 1})
-                
-                # Pivot low
-                if (df['low'].iloc[i] < df['low'].iloc[i-lookback:i].min() and
-                    df['low'].iloc[i] < df['low'].iloc[i+1:i+lookback+1].min()):
-                    levels.append({'level': df['low'].iloc[i], 'type': 'support', 'strength': 1})
-            
-            # Consolidate nearby levels
-            consolidated_levels = self._consolidate_levels(levels)
-            
-            return consolidated_levels
+            # Pivot highs/lows over the breakout lookback, then merge nearby levels
+            levels = pivot_levels(df, self.params['breakout_period'])
+            return self._consolidate_levels(levels)
             
         except Exception as e:
             logger.error(f"Support/Resistance identification error: {e}")
@@ -284,26 +270,7 @@ class IndexBreakoutProStrategy(BaseStrategy):
 
     def _consolidate_levels(self, levels):
         """Consolidate nearby support/resistance levels"""
-        if not levels:
-            return []
-        
-        consolidated = []
-        tolerance = 0.002  # 0.2% tolerance for level grouping
-        
-        for level in levels:
-            added = False
-            for i, existing in enumerate(consolidated):
-                if abs(level['level'] - existing['level']) / existing['level'] < tolerance:
-                    # Merge levels
-                    consolidated[i]['strength'] += level['strength']
-                    consolidated[i]['level'] = (existing['level'] + level['level']) / 2
-                    added = True
-                    break
-            
-            if not added:
-                consolidated.append(level)
-        
-        return sorted(consolidated, key=lambda x: x['strength'], reverse=True)[:10]
+        return cluster_levels(levels, tolerance=0.002, max_levels=10)
 
     def _volume_price_analysis(self, df):
         """Advanced Volume-Price Analysis"""
@@ -479,6 +446,136 @@ class IndexBreakoutProStrategy(BaseStrategy):
         if len(df) < 60:
             return df
             
+        try:
+            # Calculate indicators for entire DataFrame
+            df = self._calculate_advanced_indicators(df)
+            
+            # Same decisions as _simplified_analysis on every bar, computed column-wise
+            with self.timed('signals'):
+                signals, strengths, explanations = self._simplified_signals(df)
+            
+            df['signal'] = signals
+            df['signal_strength'] = strengths
+            df['explanation'] = explanations
+            
+            return df
+            
+        except Exception as e:
+            logger.error(f"IndexBreakoutProStrategy analyze_df error: {e}")
+            return df
+
+    def _simplified_signals(self, df):
+        """
+        Vectorized _simplified_analysis for every bar from the 60th on.
+
+        Reproduces the bar-by-bar loop in _analyze_df_reference exactly: the
+        breakout range is the rolling high/low of the last
+        min(breakout_period, i) bars, and the if/elif chain becomes a sequence
+        of mutually exclusive masks evaluated in the same order.
+        """
+        n = len(df)
+        position = np.arange(n)
+        close = df['close'].to_numpy(dtype=float)
+        atr = df['atr'].to_numpy(dtype=float)
+        volume_ratio = df['volume_ratio'].to_numpy(dtype=float)
+        ema_20 = df['ema_20'].to_numpy(dtype=float)
+        ema_50 = df['ema_50'].to_numpy(dtype=float)
+        momentum = df['momentum'].to_numpy(dtype=float)
+        
+        # Bars the loop skips keep HOLD with an empty explanation
+        active = ((position >= 60) & ~np.isnan(atr) & ~np.isnan(volume_ratio) &
+                  ~np.isnan(ema_20) & ~np.isnan(ema_50))
+        
+        lookback = self.params.get('breakout_period', 20)
+        recent_high = df['high'].rolling(lookback, min_periods=1).max().to_numpy(dtype=float)
+        recent_low = df['low'].rolling(lookback, min_periods=1).min().to_numpy(dtype=float)
+        if lookback > 60:
+            # Before bar `lookback` the loop's window is bars 1..i, not 0..i
+            early = position < lookback
+            recent_high[early] = np.r_[np.nan, df['high'].iloc[1:].expanding().max().to_numpy(dtype=float)][early]
+            recent_low[early] = np.r_[np.nan, df['low'].iloc[1:].expanding().min().to_numpy(dtype=float)][early]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_range = recent_high - recent_low
+            price_position = np.where(price_range > 0, (close - recent_low) / price_range, 0.5)
+            
+            volume_threshold = self.params.get('volume_surge_multiplier', 1.5) * 0.8
+            volume_confirmed = volume_ratio >= volume_threshold
+            bullish_trend = ema_20 > ema_50
+            bearish_trend = ema_20 < ema_50
+            
+            close_5 = df['close'].shift(4).to_numpy(dtype=float)
+            close_10 = df['close'].shift(9).to_numpy(dtype=float)
+            momentum_5 = (close - close_5) / close_5
+            momentum_10 = (close - close_10) / close_10
+            
+            breakout_threshold = np.where(atr > 0, atr * self.params.get('min_breakout_size', 0.2) * 0.5,
+                                          price_range * 0.002)
+            range_pct = price_range / close
+        
+        above = close > recent_high + breakout_threshold
+        below = ~above & (close < recent_low - breakout_threshold)
+        range_top = ~above & ~below & (price_position > 0.85) & bullish_trend & (momentum_5 > 0.001)
+        range_bottom = (~above & ~below & ~range_top &
+                        (price_position < 0.15) & bearish_trend & (momentum_5 < -0.001))
+        strong = (~above & ~below & ~range_top & ~range_bottom &
+                  (np.abs(momentum_5) > 0.005) & (np.abs(momentum_10) > 0.008))
+        
+        rules = [
+            (above & volume_confirmed & bullish_trend, 'BUY',
+             "Strong bullish breakout: price {price:.2f} > high {high:.2f}, vol {vol:.2f}x, trend up"),
+            (above & volume_confirmed, 'BUY',
+             "Volume breakout: price {price:.2f} > high {high:.2f}, vol {vol:.2f}x"),
+            (above & (momentum_5 > 0.003), 'BUY',
+             "Momentum breakout: price {price:.2f} > high {high:.2f}, momentum {m5:.1%}"),
+            (below & volume_confirmed & bearish_trend, 'SELL',
+             "Strong bearish breakdown: price {price:.2f} < low {low:.2f}, vol {vol:.2f}x, trend down"),
+            (below & volume_confirmed, 'SELL',
+             "Volume breakdown: price {price:.2f} < low {low:.2f}, vol {vol:.2f}x"),
+            (below & (momentum_5 < -0.003), 'SELL',
+             "Momentum breakdown: price {price:.2f} < low {low:.2f}, momentum {m5:.1%}"),
+            (range_top, 'BUY',
+             "Range top breakout setup: {position:.0%} of range, trend up, momentum {m5:.1%}"),
+            (range_bottom, 'SELL',
+             "Range bottom breakdown setup: {position:.0%} of range, trend down, momentum {m5:.1%}"),
+            (strong & (momentum_5 > 0) & (momentum_10 > 0) & bullish_trend, 'BUY',
+             "Strong momentum: 5-period {m5:.1%}, 10-period {m10:.1%}, trend aligned"),
+            (strong & (momentum_5 < 0) & (momentum_10 < 0) & bearish_trend, 'SELL',
+             "Strong negative momentum: 5-period {m5:.1%}, 10-period {m10:.1%}, trend aligned"),
+            # HOLD explanations
+            (~volume_confirmed, 'HOLD',
+             "Low volume: {vol:.2f}x (need {threshold:.2f}x), price at {position:.0%} of range"),
+            (range_pct < 0.01, 'HOLD',
+             "Narrow range: ${range:.2f} ({range_pct:.1%}), waiting for volatility"),
+            (np.ones(n, dtype=bool), 'HOLD',
+             "No clear signal: {position:.0%} range position, vol {vol:.2f}x, momentum {m5:.1%}"),
+        ]
+        rule = np.select([mask for mask, _, _ in rules], np.arange(len(rules)))
+        
+        signal_names = np.array([name for _, name, _ in rules], dtype=object)
+        signals = np.where(active, signal_names[rule], 'HOLD').astype(object)
+        
+        trade = active & (signals != 'HOLD')
+        volume_strength = np.minimum(2.0, volume_ratio) - 1.0
+        momentum_strength = np.where(np.isnan(momentum), 0.0, np.abs(momentum))
+        strengths = np.where(trade, np.minimum(1.0, (volume_strength + momentum_strength) * 0.4 + 0.6), 0.0)
+        
+        explanations = np.full(n, '', dtype=object)
+        templates = [template for _, _, template in rules]
+        for i in np.flatnonzero(active):
+            explanations[i] = templates[rule[i]].format(
+                price=close[i], high=recent_high[i], low=recent_low[i], vol=volume_ratio[i],
+                m5=momentum_5[i], m10=momentum_10[i], position=price_position[i],
+                range=price_range[i], range_pct=range_pct[i], threshold=volume_threshold,
+            )
+        
+        return signals, strengths, explanations
+
+    def _analyze_df_reference(self, df):
+        """Original bar-by-bar backtesting loop, kept as the reference for analyze_df"""
+        if len(df) < 60:
+            return df
+            
         try:
             # Calculate indicators for entire DataFrame
             df = self._calculate_advanced_indicators(df)
@@ -517,7 +614,7 @@ class IndexBreakoutProStrategy(BaseStrategy):
             return df
             
         except Exception as e:
-            logger.error(f"IndexBreakoutProStrategy analyze_df error: {e}")
+            logger.error(f"IndexBreakoutProStrategy reference analyze_df error: {e}")
             return df
 
     def _simplified_analysis(self, df):
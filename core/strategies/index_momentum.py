@@ -1,7 +1,8 @@
 # core/strategies/index_momentum.py
 
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from ..utils.indicator_cache import ta
 from datetime import datetime
 from .base_strategy import BaseStrategy
 import logging
@@ -264,6 +265,99 @@ class IndexMomentumStrategy(BaseStrategy):
         if len(df) < 30:
             return df
             
+        try:
+            # Calculate indicators for entire DataFrame
+            df = self._calculate_indicators(df)
+            
+            with self.timed('signals'):
+                signals, strengths, explanations = self._momentum_signals(df)
+            
+            df['signal'] = signals
+            df['signal_strength'] = strengths
+            df['explanation'] = explanations
+            
+            return df
+            
+        except Exception as e:
+            logger.error(f"IndexMomentumStrategy analyze_df error: {e}")
+            return df
+
+    def _momentum_signals(self, df):
+        """
+        Vectorized per-bar signal logic of analyze_df.
+
+        Same decisions as the bar-by-bar loop in _analyze_df_reference, as
+        masks: gap signal, momentum + volume entries, then the RSI overrides.
+        """
+        n = len(df)
+        close = df['close'].to_numpy(dtype=float)
+        current_open = df['open'].to_numpy(dtype=float)
+        rsi = df['rsi'].to_numpy(dtype=float)
+        volume_ratio = df['volume_ratio'].to_numpy(dtype=float)
+        price_change = df['price_change'].to_numpy(dtype=float)
+        overbought = self.params['momentum_overbought']
+        oversold = self.params['momentum_oversold']
+        
+        # Bars the loop skips keep HOLD with an empty explanation
+        active = (np.arange(n) >= 30) & ~np.isnan(rsi) & ~np.isnan(volume_ratio) & ~np.isnan(price_change)
+        
+        # Gap from the previous close
+        prev_close = np.r_[np.nan, close[:-1]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gap_size = np.abs(current_open - prev_close) / prev_close * 100
+        gap_up = current_open > prev_close
+        has_gap = gap_size > self.params['gap_threshold']
+        
+        # _analyze_gap_opportunity
+        small_gap = has_gap & (gap_size < 1.0)
+        large_gap = has_gap & ~small_gap & (gap_size > 2.0)
+        fade = bool(self.params['gap_fade_mode'])
+        gap_buy = (small_gap & fade & ~gap_up) | (large_gap & gap_up & (rsi < 70))
+        gap_sell = (small_gap & fade & gap_up) | (large_gap & ~gap_up & (rsi > 30))
+        
+        volume_confirmed = volume_ratio >= self.params['volume_multiplier']
+        bullish_momentum = (rsi > 50) & (rsi < overbought) & (price_change > 0)
+        bearish_momentum = (rsi < 50) & (rsi > oversold) & (price_change < 0)
+        
+        buy = (bullish_momentum & volume_confirmed) | gap_buy
+        sell = ~buy & ((bearish_momentum & volume_confirmed) | gap_sell)
+        is_overbought = rsi > overbought
+        is_oversold = ~is_overbought & (rsi < oversold)
+        buy &= active & ~is_overbought & ~is_oversold
+        sell &= active & ~is_overbought & ~is_oversold
+        
+        signals = np.full(n, 'HOLD', dtype=object)
+        signals[buy] = 'BUY'
+        signals[sell] = 'SELL'
+        strengths = np.where(buy | sell, np.minimum(1.0, (volume_ratio - 1.0) * 0.5 + 0.5), 0.0)
+        
+        explanations = np.full(n, '', dtype=object)
+        explanations[active] = "Waiting for clear momentum signal"
+        for i in np.flatnonzero(active & (buy | sell | is_overbought | is_oversold)):
+            if is_overbought[i]:
+                explanations[i] = f"Overbought condition (RSI: {rsi[i]:.1f})"
+            elif is_oversold[i]:
+                explanations[i] = f"Oversold condition (RSI: {rsi[i]:.1f})"
+            else:
+                side = signals[i]
+                momentum = bullish_momentum[i] if side == 'BUY' else bearish_momentum[i]
+                gap_signal = gap_buy[i] if side == 'BUY' else gap_sell[i]
+                reasons = []
+                if momentum:
+                    reasons.append(f"{'Bullish' if side == 'BUY' else 'Bearish'} momentum (RSI: {rsi[i]:.1f})")
+                if volume_confirmed[i]:
+                    reasons.append(f"Volume confirmed ({volume_ratio[i]:.2f}x)")
+                if gap_signal:
+                    reasons.append(f"Gap opportunity ({'up' if gap_up[i] else 'down'} {gap_size[i]:.2f}%)")
+                explanations[i] = f"{side}: {', '.join(reasons)}"
+        
+        return signals, strengths, explanations
+
+    def _analyze_df_reference(self, df):
+        """Original bar-by-bar backtesting loop, kept as the reference for analyze_df"""
+        if len(df) < 30:
+            return df
+            
         try:
             # Calculate indicators for entire DataFrame
             df = self._calculate_indicators(df)
@@ -367,7 +461,7 @@ class IndexMomentumStrategy(BaseStrategy):
             return df
             
         except Exception as e:
-            logger.error(f"IndexMomentumStrategy analyze_df error: {e}")
+            logger.error(f"IndexMomentumStrategy reference analyze_df error: {e}")
             return df
 
     @classmethod
@@ -1,5 +1,5 @@
 # core/strategies/mercy_edge.py
-import pandas_ta as ta
+from ..utils.indicator_cache import ta, append_indicator
 import numpy as np
 from .base_strategy import BaseStrategy
 
@@ -34,8 +34,8 @@ class MercyEdgeStrategy(BaseStrategy):
 
         # 1. Hitung semua indikator pada data yang diterima
         df_h1['trend_proxy_sma'] = ta.sma(df_h1['close'], length=200)
-        df_h1.ta.macd(fast=macd_fast, slow=macd_slow, signal=macd_signal_p, append=True)
-        df_h1.ta.stoch(k=stoch_k, d=stoch_d, smooth_k=stoch_smooth, append=True)
+        append_indicator(df_h1, 'macd', fast=macd_fast, slow=macd_slow, signal=macd_signal_p)
+        append_indicator(df_h1, 'stoch', k=stoch_k, d=stoch_d, smooth_k=stoch_smooth)
         
         df_h1.dropna(inplace=True)
         if len(df_h1) < 2:
@@ -92,8 +92,8 @@ class MercyEdgeStrategy(BaseStrategy):
         df['trend_proxy_sma'] = ta.sma(df['close'], length=200)
 
         # Indikator H1
-        df.ta.macd(fast=macd_fast, slow=macd_slow, signal=macd_signal_p, append=True)
-        df.ta.stoch(k=stoch_k, d=stoch_d, smooth_k=stoch_smooth, append=True)
+        append_indicator(df, 'macd', fast=macd_fast, slow=macd_slow, signal=macd_signal_p)
+        append_indicator(df, 'stoch', k=stoch_k, d=stoch_d, smooth_k=stoch_smooth)
         
         # Nama kolom indikator untuk referensi
         macd_hist_col = f'MACDh_{macd_fast}_{macd_slow}_{macd_signal_p}'
@@ -18,6 +18,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import logging
 
+from core.backtesting.monte_carlo import run_monte_carlo
+
 logger = logging.getLogger(__name__)
 
 class PerformanceScorer:
@@ -313,6 +315,29 @@ class PerformanceScorer:
             'timestamp': datetime.now().isoformat()
         }
     
+    def calculate_confidence_bands(self, backtest_results: dict, initial_capital: float = 10000.0,
+                                   n_paths: int = 10000, method: str = 'bootstrap', seed: int = None) -> dict:
+        """
+        Monte Carlo confidence bands for a single backtest path
+        
+        Args:
+            backtest_results: Enhanced engine results run with include_all_trades
+            initial_capital: Capital the backtest started from (engine results do not carry it)
+            n_paths: Number of resampled paths
+            method: 'bootstrap', 'shuffle' or 'skip'
+            seed: Random seed for reproducible bands
+            
+        Returns:
+            dict: Final-capital/drawdown percentiles and risk of ruin
+        """
+        trades = backtest_results.get('trades', [])
+        if len(trades) < backtest_results.get('total_trades', 0):
+            logger.warning("Confidence bands computed from a truncated trade list; run the backtest with include_all_trades")
+        return run_monte_carlo(
+            trades, initial_capital=initial_capital,
+            n_paths=n_paths, method=method, seed=seed
+        )
+    
     def rank_strategy_combinations(self, performance_scores: List[dict]) -> List[dict]:
         """
         Rank strategy/instrument combinations by composite score
@@ -1,6 +1,6 @@
 # d:\dev\quantumbotx\core\strategies\quantum_velocity.py
 
-import pandas_ta as ta
+from ..utils.indicator_cache import ta, append_indicator
 import numpy as np
 from .base_strategy import BaseStrategy
 
@@ -35,7 +35,7 @@ class QuantumVelocityStrategy(BaseStrategy):
         bbm_col = f'BBM_{bb_length}_{bb_std:.1f}'
         bbl_col = f'BBL_{bb_length}_{bb_std:.1f}'
 
-        df.ta.bbands(length=bb_length, std=bb_std, append=True)
+        append_indicator(df, 'bbands', length=bb_length, std=bb_std)
         df['BB_BANDWIDTH'] = np.where(df[bbm_col] != 0, (df[bbu_col] - df[bbl_col]) / df[bbm_col] * 100, 0)
         df['AVG_BANDWIDTH'] = df['BB_BANDWIDTH'].rolling(window=squeeze_window).mean()
         df['SQUEEZE_LEVEL'] = df['AVG_BANDWIDTH'] * squeeze_factor
@@ -77,7 +77,7 @@ class QuantumVelocityStrategy(BaseStrategy):
         bbm_col = f'BBM_{bb_length}_{bb_std:.1f}'
         bbl_col = f'BBL_{bb_length}_{bb_std:.1f}'
 
-        df.ta.bbands(length=bb_length, std=bb_std, append=True)
+        append_indicator(df, 'bbands', length=bb_length, std=bb_std)
         df['BB_BANDWIDTH'] = np.where(df[bbm_col] != 0, (df[bbu_col] - df[bbl_col]) / df[bbm_col] * 100, 0)
         df['AVG_BANDWIDTH'] = df['BB_BANDWIDTH'].rolling(window=squeeze_window).mean()
         df['SQUEEZE_LEVEL'] = df['AVG_BANDWIDTH'] * squeeze_factor
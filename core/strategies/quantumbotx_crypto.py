@@ -1,6 +1,6 @@
 # /core/strategies/quantumbotx_crypto.py
 import pandas as pd
-import pandas_ta as ta
+from ..utils.indicator_cache import ta, append_indicator
 import numpy as np
 from .base_strategy import BaseStrategy
 
@@ -51,12 +51,12 @@ class QuantumBotXCryptoStrategy(BaseStrategy):
         bbl_col = f'BBL_{bb_length}_{bb_std:.1f}'
         trend_filter_col = f'SMA_{trend_filter_period}'
 
-        df.ta.adx(length=adx_period, append=True)
+        append_indicator(df, 'adx', length=adx_period)
         df[f'SMA_{ma_fast_period}'] = ta.sma(df['close'], length=ma_fast_period)
         df[f'SMA_{ma_slow_period}'] = ta.sma(df['close'], length=ma_slow_period)
-        df.ta.bbands(length=bb_length, std=bb_std, append=True)
+        append_indicator(df, 'bbands', length=bb_length, std=bb_std)
         df[trend_filter_col] = ta.sma(df['close'], length=trend_filter_period)
-        df.ta.rsi(length=rsi_period, append=True)
+        append_indicator(df, 'rsi', length=rsi_period)
         
         # Crypto volatility indicator
         df['volatility'] = df['close'].rolling(24).std() / df['close'].rolling(24).mean()
@@ -152,12 +152,12 @@ class QuantumBotXCryptoStrategy(BaseStrategy):
         bbl_col = f'BBL_{bb_length}_{bb_std:.1f}'
         trend_filter_col = f'SMA_{trend_filter_period}'
 
-        df.ta.adx(length=adx_period, append=True)
+        append_indicator(df, 'adx', length=adx_period)
         df[f'SMA_{ma_fast_period}'] = ta.sma(df['close'], length=ma_fast_period)
         df[f'SMA_{ma_slow_period}'] = ta.sma(df['close'], length=ma_slow_period)
-        df.ta.bbands(length=bb_length, std=bb_std, append=True)
+        append_indicator(df, 'bbands', length=bb_length, std=bb_std)
         df[trend_filter_col] = ta.sma(df['close'], length=trend_filter_period)
-        df.ta.rsi(length=rsi_period, append=True)
+        append_indicator(df, 'rsi', length=rsi_period)
         
         # Crypto-specific indicators
         df['volatility'] = df['close'].rolling(24).std() / df['close'].rolling(24).mean()
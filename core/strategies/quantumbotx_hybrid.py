@@ -1,5 +1,5 @@
 # /core/strategies/quantumbotx_hybrid.py
-import pandas_ta as ta
+from ..utils.indicator_cache import ta, append_indicator
 import numpy as np
 from .base_strategy import BaseStrategy
 
@@ -77,10 +77,10 @@ class QuantumBotXHybridStrategy(BaseStrategy):
         bbl_col = f'BBL_{bb_length}_{bb_std:.1f}'
         trend_filter_col = f'SMA_{trend_filter_period}'
 
-        df.ta.adx(length=adx_period, append=True)
+        append_indicator(df, 'adx', length=adx_period)
         df[f'SMA_{ma_fast_period}'] = ta.sma(df['close'], length=ma_fast_period)
         df[f'SMA_{ma_slow_period}'] = ta.sma(df['close'], length=ma_slow_period)
-        df.ta.bbands(length=bb_length, std=bb_std, append=True)
+        append_indicator(df, 'bbands', length=bb_length, std=bb_std)
         df[trend_filter_col] = ta.sma(df['close'], length=trend_filter_period)
         
         df.dropna(inplace=True)
@@ -156,10 +156,10 @@ class QuantumBotXHybridStrategy(BaseStrategy):
         bbl_col = f'BBL_{bb_length}_{bb_std:.1f}'
         trend_filter_col = f'SMA_{trend_filter_period}'
 
-        df.ta.adx(length=adx_period, append=True)
+        append_indicator(df, 'adx', length=adx_period)
         df[f'SMA_{ma_fast_period}'] = ta.sma(df['close'], length=ma_fast_period)
         df[f'SMA_{ma_slow_period}'] = ta.sma(df['close'], length=ma_slow_period)
-        df.ta.bbands(length=bb_length, std=bb_std, append=True)
+        append_indicator(df, 'bbands', length=bb_length, std=bb_std)
         df[trend_filter_col] = ta.sma(df['close'], length=trend_filter_period)
         
         # Add volatility filter for crypto markets
@@ -1,5 +1,5 @@
 # /core/strategies/rsi_crossover.py
-import pandas_ta as ta
+from ..utils.indicator_cache import ta
 import numpy as np
 from .base_strategy import BaseStrategy
 
@@ -23,7 +23,7 @@ import os
 
 from .market_condition_detector import get_market_condition
 from .performance_scorer import calculate_strategy_score, rank_strategies
-from ..backtesting.enhanced_engine import run_enhanced_backtest
+from ..backtesting.result_cache import cached_backtest, get_backtest_cache_stats
 from .strategy_map import STRATEGY_MAP
 
 logger = logging.getLogger(__name__)
@@ -157,7 +157,7 @@ class StrategySwitcher:
                     strategy_params = self._get_strategy_parameters(strategy_id, symbol)
                     
                     # Run backtest
-                    backtest_results = run_enhanced_backtest(
+                    backtest_results = cached_backtest(
                         strategy_id,
                         strategy_params,
                         test_df,
@@ -382,7 +382,8 @@ class StrategySwitcher:
             'monitored_instruments': self.monitored_instruments,
             'test_strategies': self.test_strategies,
             'performance_history_count': len(self.performance_history),
-            'switch_log_count': len(self.switch_log)
+            'switch_log_count': len(self.switch_log),
+            'backtest_cache': get_backtest_cache_stats()
         }
     
     def get_recent_switches(self, count: int = 5) -> List[dict]:
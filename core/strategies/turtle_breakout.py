@@ -1,4 +1,5 @@
 # core/strategies/turtle_breakout.py
+import numpy as np
 import pandas as pd
 from .base_strategy import BaseStrategy
 
@@ -69,7 +70,69 @@ class TurtleBreakoutStrategy(BaseStrategy):
         return {"signal": signal, "price": price, "explanation": explanation}
 
     def analyze_df(self, df):
-        """Metode untuk BACKTESTING (stateful)."""
+        """Metode untuk BACKTESTING (stateful, state machine di atas array NumPy)."""
+        entry_period = self.params.get('entry_period', 20)
+        exit_period = self.params.get('exit_period', 10)
+
+        # Hitung Channel (menggunakan shift(1) untuk menghindari look-ahead)
+        df['entry_upper'] = df['high'].rolling(window=entry_period).max().shift(1)
+        df['entry_lower'] = df['low'].rolling(window=entry_period).min().shift(1)
+        df['exit_upper'] = df['high'].rolling(window=exit_period).max().shift(1)
+        df['exit_lower'] = df['low'].rolling(window=exit_period).min().shift(1)
+        
+        df.dropna(inplace=True)
+        df = df.reset_index(drop=True)
+
+        with self.timed('signals'):
+            df['signal'] = self._channel_signals(
+                df['close'].to_numpy(dtype=float),
+                df['entry_upper'].to_numpy(dtype=float), df['entry_lower'].to_numpy(dtype=float),
+                df['exit_upper'].to_numpy(dtype=float), df['exit_lower'].to_numpy(dtype=float),
+            )
+        return df
+
+    @staticmethod
+    def _channel_signals(close, entry_upper, entry_lower, exit_upper, exit_lower):
+        """
+        Sinyal masuk/keluar Turtle tanpa iterasi per bar.
+
+        Semua kondisi dihitung sebagai mask, lalu state machine hanya melompat
+        dari satu event ke event berikutnya (masuk -> keluar -> masuk ...),
+        sehingga jumlah iterasi sama dengan jumlah transaksi, bukan jumlah bar.
+        Hasilnya identik dengan loop di _analyze_df_reference.
+        """
+        n = len(close)
+        valid = ~np.isnan(entry_upper) & ~np.isnan(exit_lower)
+        long_entry = valid & (close > entry_upper)
+        short_entry = valid & ~long_entry & (close < entry_lower)
+        long_exit = valid & (close < exit_lower)
+        short_exit = valid & (close > exit_upper)
+
+        def next_event(mask):
+            # Indeks event pertama pada atau setelah setiap bar (n bila tidak ada)
+            positions = np.where(mask, np.arange(n), n)
+            return np.r_[np.minimum.accumulate(positions[::-1])[::-1], n]
+
+        next_entry = next_event(long_entry | short_entry)
+        next_long_exit = next_event(long_exit)
+        next_short_exit = next_event(short_exit)
+
+        signals = np.full(n, 'HOLD', dtype=object)
+        i = next_entry[0]
+        while i < n:
+            is_long = long_entry[i]
+            signals[i] = 'BUY' if is_long else 'SELL'
+            # Keluar pada bar berikutnya yang melewati channel exit
+            j = (next_long_exit if is_long else next_short_exit)[i + 1]
+            if j >= n:
+                break
+            signals[j] = 'SELL' if is_long else 'BUY'
+            # Setelah keluar, bar yang sama boleh langsung masuk lagi
+            i = next_entry[j]
+        return signals
+
+    def _analyze_df_reference(self, df):
+        """Loop bar-per-bar asli, disimpan sebagai acuan untuk analyze_df."""
         entry_period = self.params.get('entry_period', 20)
         exit_period = self.params.get('exit_period', 10)
 
@@ -116,4 +179,4 @@ class TurtleBreakoutStrategy(BaseStrategy):
                     position_type = 'SELL'
         
         df['signal'] = signals
-        return df
\ No newline at end of file
+        return df
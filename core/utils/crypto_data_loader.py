@@ -9,6 +9,8 @@ import numpy as np
 from pathlib import Path
 import logging
 
+from core.utils.market_store import load_csv_dataset
+
 logger = logging.getLogger(__name__)
 # Disable crypto data loader logs for silent backtesting
 logger.disabled = True
@@ -25,8 +27,8 @@ def load_crypto_csv(file_path, symbol_name="BTCUSD"):
         pandas.DataFrame: Processed dataframe ready for backtesting
     """
     try:
-        # Load the CSV file
-        df = pd.read_csv(file_path)
+        # Load the CSV file through the columnar store
+        df = load_csv_dataset(file_path)
         
         logger.info(f"Loading {symbol_name} data from {file_path}")
         logger.info(f"Original data shape: {df.shape}")
@@ -0,0 +1,235 @@
+# core/utils/indicator_cache.py
+"""
+🧮 Shared Indicator Cache
+
+A memory-bounded LRU cache in front of pandas_ta. Results are keyed by a
+fingerprint of the input arrays plus the indicator name and parameters, so
+strategies and engines analyzing the same data reuse each other's SMA/EMA/
+RSI/BBANDS/ATR instead of recomputing them.
+
+Usage mirrors pandas_ta:
+
+    from core.utils.indicator_cache import ta, append_indicator
+
+    df['ma_fast'] = ta.sma(df['close'], length=20)      # was ta.sma(...)
+    append_indicator(df, 'bbands', length=20, std=2.0)  # was df.ta.bbands(..., append=True)
+
+Cached values are stored without their index and rebuilt on the caller's
+index, and every hit returns fresh copies, so callers can mutate results.
+
+Inside a live bot's ``IndicatorStream.activate()`` block, calls the stream
+recognises are answered incrementally by the stream instead (see
+core/utils/streaming_indicators.py).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pandas_ta as pandas_ta_lib
+
+from core.utils.instrumentation import active_timer
+from core.utils.streaming_indicators import NOT_STREAMED, active_stream
+
+logger = logging.getLogger(__name__)
+
+# Columns the pandas_ta DataFrame accessor reads
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+DEFAULT_MAX_MB = float(os.getenv('INDICATOR_CACHE_MB', '256'))
+
+
+def _fingerprint(values) -> bytes:
+    """Digest of an input array's dtype, length and contents"""
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy()
+    values = np.asarray(values)
+    digest = hashlib.sha256()
+    digest.update(f"{values.dtype.str}:{values.shape}".encode())
+    if values.dtype == object:
+        digest.update(pd.util.hash_array(values.ravel()).tobytes())
+    else:
+        digest.update(np.ascontiguousarray(values).view(np.uint8).data)
+    return digest.digest()
+
+
+def _freeze(params: dict) -> tuple:
+    return tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+
+def _pack(result, input_index):
+    """Index-free copy of a pandas_ta result and its size in bytes"""
+    if result is None:
+        return None, 0
+    if isinstance(result, tuple):
+        parts = [_pack(part, input_index) for part in result]
+        return ('tuple', [p for p, _ in parts]), sum(size for _, size in parts)
+    index = None if result.index.equals(input_index) else result.index.copy()
+    if isinstance(result, pd.Series):
+        values = result.to_numpy(copy=True)
+        return ('series', result.name, values, index), values.nbytes
+    columns = list(result.columns)
+    arrays = [result[c].to_numpy(copy=True) for c in columns]
+    return ('frame', columns, arrays, index), sum(a.nbytes for a in arrays)
+
+
+def _unpack(packed, input_index):
+    if packed is None:
+        return None
+    if packed[0] == 'tuple':
+        return tuple(_unpack(part, input_index) for part in packed[1])
+    kind, names, values, index = packed
+    index = input_index if index is None else index
+    if kind == 'series':
+        return pd.Series(values.copy(), index=index, name=names)
+    return pd.DataFrame({c: a.copy() for c, a in zip(names, values)}, index=index, columns=names)
+
+
+class IndicatorCache:
+    """LRU cache of indicator results bounded by total array bytes"""
+
+    def __init__(self, max_bytes=int(DEFAULT_MAX_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _store(self, key, packed, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (packed, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def _compute(self, name, inputs, params):
+        func = getattr(pandas_ta_lib, name)
+        index = next((s.index for s in inputs if isinstance(s, pd.Series)), None)
+        key = ('fn', name, tuple(_fingerprint(s) for s in inputs if s is not None), _freeze(params))
+        entry = self._lookup(key)
+        if entry is not None:
+            return _unpack(entry[0], index), True
+        result = func(*inputs, **params)
+        packed, size = _pack(result, index)
+        self._store(key, packed, size)
+        return result, False
+
+    def _compute_frame(self, df, name, params):
+        columns = [c for c in df.columns if isinstance(c, str) and c.lower() in OHLCV_COLUMNS]
+        key = ('df', name, tuple((c, _fingerprint(df[c])) for c in columns), _freeze(params))
+        entry = self._lookup(key)
+        if entry is not None:
+            return _unpack(entry[0], df.index), True
+        result = getattr(df.ta, name)(**params)
+        packed, size = _pack(result, df.index)
+        self._store(key, packed, size)
+        return result, False
+
+    def compute(self, name, *inputs, **params):
+        """Cached equivalent of ``pandas_ta.<name>(*inputs, **params)``"""
+        stream = active_stream()
+        if stream is not None:
+            result = stream.compute(name, inputs, params)
+            if result is not NOT_STREAMED:
+                return result
+        timer = active_timer()
+        if timer is None:
+            return self._compute(name, inputs, params)[0]
+        started = time.perf_counter()
+        result, cached = self._compute(name, inputs, params)
+        timer.record_indicator(name, time.perf_counter() - started, cached)
+        return result
+
+    def compute_frame(self, df, name, **params):
+        """Cached equivalent of ``df.ta.<name>(**params)`` (without append)"""
+        stream = active_stream()
+        if stream is not None:
+            result = stream.compute_frame(df, name, params)
+            if result is not NOT_STREAMED:
+                return result
+        timer = active_timer()
+        if timer is None:
+            return self._compute_frame(df, name, params)[0]
+        started = time.perf_counter()
+        result, cached = self._compute_frame(df, name, params)
+        timer.record_indicator(f"df.{name}", time.perf_counter() - started, cached)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+class CachedTA:
+    """Drop-in stand-in for the pandas_ta module whose functions go through a cache"""
+
+    def __init__(self, cache):
+        self._cache = cache
+
+    def __getattr__(self, name):
+        if not callable(getattr(pandas_ta_lib, name, None)):
+            raise AttributeError(f"module 'pandas_ta' has no attribute '{name}'")
+
+        def cached(*inputs, **params):
+            return self._cache.compute(name, *inputs, **params)
+        cached.__name__ = name
+        return cached
+
+
+# Process-wide cache shared by strategies and backtest engines
+indicator_cache = IndicatorCache()
+ta = CachedTA(indicator_cache)
+
+
+def append_indicator(df, name, **params):
+    """Cached equivalent of ``df.ta.<name>(append=True, **params)``"""
+    result = indicator_cache.compute_frame(df, name, **params)
+    appended = result[0] if isinstance(result, tuple) else result
+    if isinstance(appended, pd.DataFrame):
+        for column in appended.columns:
+            df[column] = appended[column]
+    elif isinstance(appended, pd.Series):
+        df[appended.name] = appended
+    return result
+
+
+def get_indicator_cache_stats() -> dict:
+    return indicator_cache.stats()
@@ -0,0 +1,156 @@
+# core/utils/instrumentation.py
+"""
+⏱️ Backtest Instrumentation
+
+Opt-in timing and profiling for the backtest pipeline:
+
+- `PhaseTimer` accumulates wall time per named phase. While a timer is
+  active on the current thread (``with timer.activate():``) the indicator
+  cache reports every indicator call to it and strategies can time their own
+  sections with ``with self.timed('signals'):``.
+- `profiling(mode)` wraps a block in cProfile or tracemalloc and returns a
+  compact report. tracemalloc is process-wide, so tracemalloc blocks are
+  serialized: a second concurrent run waits until the first has finished and
+  each run reports its own peak.
+
+Nothing here runs unless a caller asks for it: with no active timer,
+`phase` and `active_timer` are a single thread-local lookup.
+"""
+
+import cProfile
+import contextlib
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+_local = threading.local()
+# tracemalloc start/stop and its peak counter are global to the process
+_tracemalloc_lock = threading.Lock()
+
+
+def active_timer():
+    """The PhaseTimer active on this thread, or None"""
+    return getattr(_local, 'timer', None)
+
+
+class PhaseTimer:
+    """Accumulates per-phase wall time plus indicator and strategy sub-timings"""
+
+    def __init__(self):
+        self.phases = {}
+        self.indicators = {}
+        self.strategy = {}
+        self._started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name, bucket=None):
+        bucket = self.phases if bucket is None else bucket
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            bucket[name] = bucket.get(name, 0.0) + time.perf_counter() - started
+
+    def record_indicator(self, name, seconds, cached):
+        entry = self.indicators.setdefault(name, {'calls': 0, 'cache_hits': 0, 'seconds': 0.0})
+        entry['calls'] += 1
+        entry['cache_hits'] += int(cached)
+        entry['seconds'] += seconds
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Make this timer the target of indicator and strategy sub-timings on this thread"""
+        previous = getattr(_local, 'timer', None)
+        _local.timer = self
+        try:
+            yield self
+        finally:
+            _local.timer = previous
+
+    def to_dict(self) -> dict:
+        return {
+            'total_seconds': round(time.perf_counter() - self._started, 6),
+            'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            'indicators': {
+                name: {**entry, 'seconds': round(entry['seconds'], 6)} for name, entry in self.indicators.items()
+            },
+            'strategy': {name: round(seconds, 6) for name, seconds in self.strategy.items()},
+        }
+
+
+def phase(timer, name):
+    """``timer.phase(name)`` when a timer is given, otherwise a no-op context"""
+    return timer.phase(name) if timer is not None else contextlib.nullcontext()
+
+
+def strategy_section(name):
+    """Time a strategy's own section on the active timer, if any"""
+    timer = active_timer()
+    return timer.phase(name, timer.strategy) if timer is not None else contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def profiling(mode, top=25, path=None):
+    """
+    Profile the enclosed block.
+
+    Args:
+        mode: 'cprofile' (function hotspots) or 'tracemalloc' (allocation sites)
+        top: Number of rows kept in the report
+        path: Optional file for the raw output (pstats dump or tracemalloc snapshot)
+
+    Yields a dict that holds the report once the block exits.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}")
+    report = {'mode': mode}
+
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            stats = pstats.Stats(profiler, stream=io.StringIO())
+            stats.sort_stats('cumulative')
+            rows = []
+            for (filename, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+                rows.append({
+                    'function': f"{filename}:{line}({function})",
+                    'ncalls': ncalls,
+                    'tottime': round(tottime, 6),
+                    'cumtime': round(cumtime, 6),
+                })
+            rows.sort(key=lambda row: row['cumtime'], reverse=True)
+            report['top'] = rows[:top]
+            if path:
+                profiler.dump_stats(path)
+                report['path'] = path
+        return
+
+    with _tracemalloc_lock:
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            yield report
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if not already_tracing:
+                tracemalloc.stop()
+            report['current_mb'] = round(current / (1024 * 1024), 3)
+            report['peak_mb'] = round(peak / (1024 * 1024), 3)
+            report['top'] = [
+                {'location': str(stat.traceback), 'size_kb': round(stat.size / 1024, 1), 'count': stat.count}
+                for stat in snapshot.statistics('lineno')[:top]
+            ]
+            if path:
+                snapshot.dump(path)
+                report['path'] = path
@@ -0,0 +1,177 @@
+# core/utils/market_data_hub.py
+"""
+🛰️ Shared Market Data Hub
+
+One rolling bar buffer per (symbol, timeframe), shared by every bot thread
+and dashboard route instead of each of them calling
+``mt5.copy_rates_from_pos`` for the same bars:
+
+- A buffer refreshed less than `max_age` seconds ago is served as is, so ten
+  bots on EURUSD H1 polling in the same cycle cost one terminal call.
+- A stale buffer only asks the terminal for the bars that can have changed
+  since the last fetch (the previously forming bar plus everything opened
+  since), merges them by bar time and drops the oldest bars. A tail that does
+  not overlap the buffer (terminal reconnect, history gap) or a request for
+  more bars than are buffered falls back to a full fetch.
+- `get_rates` returns a time-indexed DataFrame shaped like `get_rates_mt5`
+  built from the buffer, so callers may keep mutating their frame (strategies
+  ``dropna(inplace=True)``). `get_arrays` hands out the buffer itself as a
+  read-only structured array view.
+
+    from core.utils.market_data_hub import market_data
+    df = market_data.get_rates('EURUSD', mt5.TIMEFRAME_H1, 250)
+
+Set BOT_MARKET_DATA_MAX_AGE (seconds, default 5) to tune how long a fetch is
+shared; 0 refreshes on every call (still incrementally).
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+
+import MetaTrader5 as mt5
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = float(os.environ.get('BOT_MARKET_DATA_MAX_AGE', '5'))
+DEFAULT_MAX_BARS = 5000
+
+# Bar length per timeframe; timeframes not listed (MN1) always fetch in full
+TIMEFRAME_SECONDS = {
+    mt5.TIMEFRAME_M1: 60, mt5.TIMEFRAME_M5: 300, mt5.TIMEFRAME_M15: 900,  # type: ignore
+    mt5.TIMEFRAME_M30: 1800, mt5.TIMEFRAME_H1: 3600, mt5.TIMEFRAME_H4: 14400,  # type: ignore
+    mt5.TIMEFRAME_D1: 86400, mt5.TIMEFRAME_W1: 604800,  # type: ignore
+}
+
+
+class _Buffer:
+    """Bars of one (symbol, timeframe), oldest first"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rates = None
+        self.fetched_at = None
+        self.capacity = 0
+        self.expired = False
+
+
+class MarketDataHub:
+    def __init__(self, max_age=DEFAULT_MAX_AGE, max_bars=DEFAULT_MAX_BARS, clock=time.monotonic):
+        self.max_age = max_age
+        self.max_bars = max_bars
+        self._clock = clock
+        self._buffers = {}
+        self._guard = threading.Lock()
+        self._stats = {'requests': 0, 'hits': 0, 'full_fetches': 0,
+                       'incremental_fetches': 0, 'bars_fetched': 0, 'errors': 0}
+
+    def get_arrays(self, symbol, timeframe, count=100, max_age=None):
+        """Last `count` bars as a read-only structured array (None when the terminal has no data)"""
+        buffer = self._buffer(symbol, timeframe)
+        with buffer.lock:
+            self._bump('requests')
+            count = min(int(count), self.max_bars)
+            buffer.capacity = max(buffer.capacity, count)
+            age_limit = self.max_age if max_age is None else max_age
+            fresh = (buffer.rates is not None and len(buffer.rates) >= count and not buffer.expired
+                     and self._clock() - buffer.fetched_at < age_limit)
+            if fresh:
+                self._bump('hits')
+            elif not self._refresh(symbol, timeframe, buffer, count):
+                return None
+            return buffer.rates[-count:]
+
+    def get_rates(self, symbol, timeframe, count=100, max_age=None):
+        """Last `count` bars as a time-indexed DataFrame, like `get_rates_mt5`"""
+        rates = self.get_arrays(symbol, timeframe, count, max_age)
+        if rates is None or len(rates) == 0:
+            return pd.DataFrame()
+        df = pd.DataFrame(rates)
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        df.set_index('time', inplace=True)
+        return df
+
+    def expire(self, symbol, timeframe):
+        """Make the next request refresh (incrementally), e.g. right after a bar closed"""
+        buffer = self._buffer(symbol, timeframe)
+        with buffer.lock:
+            buffer.expired = True
+
+    def invalidate(self, symbol=None, timeframe=None):
+        """Drop buffered bars (all of them, or one symbol / one key)"""
+        with self._guard:
+            for key in list(self._buffers):
+                if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe):
+                    del self._buffers[key]
+
+    def stats(self):
+        with self._guard:
+            return dict(self._stats, buffers=len(self._buffers))
+
+    def _buffer(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        with self._guard:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = _Buffer()
+            return buffer
+
+    def _bump(self, name, amount=1):
+        with self._guard:
+            self._stats[name] += amount
+
+    def _refresh(self, symbol, timeframe, buffer, count):
+        now = self._clock()
+        merged = None
+        bar_seconds = TIMEFRAME_SECONDS.get(timeframe)
+        if buffer.rates is not None and len(buffer.rates) >= count and bar_seconds:
+            # The old forming bar plus every bar opened since the last fetch
+            tail = math.ceil((now - buffer.fetched_at) / bar_seconds) + 2
+            if tail < len(buffer.rates):
+                fetched = self._fetch(symbol, timeframe, tail)
+                if fetched is None:
+                    return False
+                merged = self._merge(buffer.rates, fetched)
+                if merged is not None:
+                    self._bump('incremental_fetches')
+
+        if merged is None:
+            merged = self._fetch(symbol, timeframe, buffer.capacity)
+            if merged is None:
+                return False
+            self._bump('full_fetches')
+
+        merged = merged[-buffer.capacity:]
+        merged.flags.writeable = False
+        buffer.rates = merged
+        buffer.fetched_at = now
+        buffer.expired = False
+        return True
+
+    def _fetch(self, symbol, timeframe, count):
+        try:
+            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)  # type: ignore
+        except Exception as e:
+            logger.error(f"Error saat mengambil rates {symbol} (Timeframe: {timeframe}): {e}", exc_info=True)
+            rates = None
+        if rates is None or len(rates) == 0:
+            logger.warning(f"Gagal mengambil data harga untuk {symbol} (Timeframe: {timeframe}).")
+            self._bump('errors')
+            return None
+        self._bump('bars_fetched', len(rates))
+        return np.array(rates)
+
+    @staticmethod
+    def _merge(rates, fetched):
+        """Replace the buffer from the fetched tail's first bar on; None if they don't overlap"""
+        start = np.searchsorted(rates['time'], fetched['time'][0])
+        if start >= len(rates) or rates['time'][start] != fetched['time'][0] or rates.dtype != fetched.dtype:
+            return None
+        return np.concatenate([rates[:start], fetched])
+
+
+market_data = MarketDataHub()
@@ -0,0 +1,258 @@
+# core/utils/market_store.py
+"""
+🗄️ Columnar Market Data Store
+
+Stores each OHLCV dataset as one typed ``.npy`` file per column (int64 epoch
+nanoseconds for ``time``, float64/float32 prices, int64 volumes, integer codes
+for text columns such as a symbol or comment) plus a ``meta.json`` that also
+holds the text labels. Numeric columns are opened memory-mapped copy-on-write,
+so loading is near zero-copy, callers may still modify the returned DataFrame,
+and a time range is located by binary search on the mapped time column without
+reading the rest of the file.
+
+CSV files stay the source of truth: `load_csv_dataset` converts a CSV into
+``<csv dir>/.columnar/<csv name>/`` on first use and again whenever the CSV
+changes, then serves every later load from the columnar copy.
+
+Convert the lab datasets up front with:
+
+    python -m core.utils.market_store lab lab/backtest_data
+"""
+
+import glob
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STORE_DIRNAME = '.columnar'
+FORMAT_VERSION = 2
+
+_convert_locks = {}
+_convert_locks_guard = threading.Lock()
+
+
+def store_path_for(csv_path: str) -> str:
+    """Columnar dataset directory backing a CSV file"""
+    directory, filename = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, STORE_DIRNAME, os.path.splitext(filename)[0])
+
+
+def _source_signature(csv_path: str) -> dict:
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_dataset(df: pd.DataFrame, dataset_dir: str, price_dtype: str = 'float64',
+                  source: dict = None) -> dict:
+    """
+    Write a DataFrame with a 'time' column as a columnar dataset.
+
+    Float columns are stored as `price_dtype`, integer columns as int64 and
+    text columns as integer codes into a label list kept in the metadata.
+    Columns of any other type are skipped with a warning. The directory is
+    replaced atomically.
+    """
+    if 'time' not in df.columns:
+        raise ValueError("Dataset needs a 'time' column")
+
+    times = pd.to_datetime(df['time']).to_numpy(dtype='datetime64[ns]').view('int64')
+    columns = {'time': 'int64'}
+    labels = {}
+    tmp_dir = f"{dataset_dir}.tmp-{os.getpid()}-{threading.get_ident()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    try:
+        np.save(os.path.join(tmp_dir, 'time.npy'), times)
+        for name in df.columns:
+            if name == 'time':
+                continue
+            series = df[name]
+            if pd.api.types.is_float_dtype(series):
+                values = series.to_numpy(dtype=price_dtype)
+            elif pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series):
+                values = series.to_numpy(dtype='int64')
+            else:
+                # Text columns as codes (-1 = missing); pickled object arrays are never written
+                codes, uniques = pd.factorize(series)
+                uniques = list(uniques)
+                if not all(isinstance(label, str) for label in uniques):
+                    logger.warning(f"Column '{name}' ({series.dtype}) cannot be stored and is skipped")
+                    continue
+                values = codes.astype('int64')
+                labels[name] = uniques
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), values)
+            columns[name] = values.dtype.str
+
+        meta = {
+            'version': FORMAT_VERSION,
+            'rows': int(len(df)),
+            'columns': columns,
+            'labels': labels,
+            'sorted': bool(np.all(times[1:] >= times[:-1])) if len(times) else True,
+            'first_time': str(pd.Timestamp(times[0])) if len(times) else None,
+            'last_time': str(pd.Timestamp(times[-1])) if len(times) else None,
+            'source': source,
+        }
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.exists(dataset_dir):
+            shutil.rmtree(dataset_dir)
+        os.replace(tmp_dir, dataset_dir)
+    finally:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return meta
+
+
+def convert_csv(csv_path: str, price_dtype: str = 'float64') -> dict:
+    """Convert a CSV (with a 'time' column) into its columnar dataset"""
+    signature = _source_signature(csv_path)
+    df = pd.read_csv(csv_path, parse_dates=['time'])
+    source = {'path': os.path.abspath(csv_path), **signature}
+    meta = write_dataset(df, store_path_for(csv_path), price_dtype, source)
+    logger.info(f"Converted {csv_path}: {meta['rows']} rows")
+    return meta
+
+
+def read_meta(dataset_dir: str) -> dict:
+    with open(os.path.join(dataset_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_stale(csv_path: str) -> bool:
+    """True when a CSV has no columnar copy or has changed since conversion"""
+    meta_path = os.path.join(store_path_for(csv_path), 'meta.json')
+    if not os.path.exists(meta_path):
+        return True
+    try:
+        meta = read_meta(store_path_for(csv_path))
+    except (OSError, json.JSONDecodeError):
+        return True
+    source = meta.get('source') or {}
+    signature = _source_signature(csv_path)
+    return (meta.get('version') != FORMAT_VERSION
+            or source.get('size') != signature['size']
+            or source.get('mtime_ns') != signature['mtime_ns'])
+
+
+def _to_ns(value) -> int:
+    return pd.Timestamp(value).value
+
+
+def load_dataset(dataset_dir: str, start=None, end=None, tail: int = None, columns=None) -> pd.DataFrame:
+    """
+    Load a columnar dataset as a DataFrame backed by memory-mapped columns.
+
+    Args:
+        dataset_dir: Dataset directory written by `write_dataset`
+        start / end: Inclusive time bounds (anything pd.Timestamp accepts)
+        tail: Keep only the last N rows of the selected range
+        columns: Columns to load besides 'time' (default: all)
+    """
+    meta = read_meta(dataset_dir)
+    names = [c for c in meta['columns'] if c != 'time']
+    if columns is not None:
+        missing = [c for c in columns if c not in meta['columns']]
+        if missing:
+            raise KeyError(f"Columns not in dataset: {missing}")
+        names = [c for c in columns if c != 'time']
+
+    def open_column(name):
+        return np.load(os.path.join(dataset_dir, f'{name}.npy'), mmap_mode='c').view(np.ndarray)
+
+    times = open_column('time')
+    if meta.get('sorted', True):
+        lo = 0 if start is None else int(np.searchsorted(times, _to_ns(start), side='left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, _to_ns(end), side='right'))
+        selection = slice(lo, max(lo, hi))
+    else:
+        mask = np.ones(len(times), dtype=bool)
+        if start is not None:
+            mask &= times >= _to_ns(start)
+        if end is not None:
+            mask &= times <= _to_ns(end)
+        selection = np.flatnonzero(mask)
+    if tail is not None:
+        if isinstance(selection, slice):
+            selection = slice(max(selection.start, selection.stop - tail), selection.stop)
+        else:
+            selection = selection[-tail:] if tail > 0 else selection[:0]
+
+    data = {'time': times[selection].view('datetime64[ns]')}
+    labels = meta.get('labels', {})
+    for name in names:
+        values = open_column(name)[selection]
+        if name in labels:
+            # Code -1 picks the trailing NaN, as read_csv leaves empty text cells
+            values = np.asarray(labels[name] + [np.nan], dtype=object)[values]
+        data[name] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def _convert_lock(csv_path: str) -> threading.Lock:
+    key = os.path.abspath(csv_path)
+    with _convert_locks_guard:
+        return _convert_locks.setdefault(key, threading.Lock())
+
+
+def load_csv_dataset(csv_path: str, start=None, end=None, tail: int = None, columns=None) -> pd.DataFrame:
+    """
+    Load a CSV through its columnar copy, converting it first if missing or stale.
+
+    Returns the same columns and values as ``pd.read_csv(csv_path,
+    parse_dates=['time'])`` (optionally time-sliced); text columns come back as
+    object columns and any column `write_dataset` cannot store is logged and
+    left out. Falls back to parsing the CSV when the store cannot be written.
+    `start`/`end` must be valid timestamps (ValueError otherwise).
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+    try:
+        with _convert_lock(csv_path):
+            if is_stale(csv_path):
+                convert_csv(csv_path)
+        return load_dataset(store_path_for(csv_path), start, end, tail, columns)
+    except OSError as e:
+        logger.warning(f"Columnar store unavailable for {csv_path} ({e}); reading CSV directly")
+        df = pd.read_csv(csv_path, parse_dates=['time'])
+        if start is not None:
+            df = df[df['time'] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df['time'] <= pd.Timestamp(end)]
+        if tail is not None:
+            df = df.tail(tail)
+        if columns is not None:
+            df = df[['time'] + [c for c in columns if c != 'time']]
+        return df.reset_index(drop=True)
+
+
+def convert_directory(directory: str, pattern: str = '*.csv', force: bool = False) -> list:
+    """Convert every matching CSV in a directory; returns the converted paths"""
+    converted = []
+    for csv_path in sorted(glob.glob(os.path.join(directory, pattern))):
+        try:
+            header = pd.read_csv(csv_path, nrows=0).columns
+        except Exception as e:
+            logger.warning(f"Skipping {csv_path}: {e}")
+            continue
+        if 'time' not in header:
+            continue
+        if force or is_stale(csv_path):
+            convert_csv(csv_path)
+            converted.append(csv_path)
+    return converted
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    for target in sys.argv[1:] or ['lab', os.path.join('lab', 'backtest_data')]:
+        done = convert_directory(target)
+        print(f"✅ {target}: {len(done)} file(s) converted")
@@ -0,0 +1,74 @@
+# core/utils/pubsub.py
+"""
+📣 In-process Pub/Sub
+
+A `Topic` is a versioned channel between publishers (bot threads, the DB
+writer) and long-lived readers such as Server-Sent Events routes:
+
+- `publish(key, value)` bumps the topic version, optionally stores the latest
+  value for `key`, and wakes every waiting reader.
+- Readers remember the version they have seen and block in
+  `wait_for_change(seen_version, timeout)`; an idle reader costs a sleeping
+  thread and nothing else.
+- `changes_since(seen_version)` returns only the keys published after that
+  version, with their latest value. A slow reader therefore gets each key
+  once, however many updates it missed (updates are coalesced per reader).
+
+    from core.utils.pubsub import Topic
+    prices = Topic('prices')
+    prices.publish('EURUSD', 1.0845)                     # publisher
+    version = prices.wait_for_change(seen, timeout=15)   # reader
+    version, changes = prices.changes_since(seen)
+"""
+
+import threading
+
+
+class Topic:
+    def __init__(self, name):
+        self.name = name
+        self.version = 0
+        self._changed = threading.Condition()
+        self._latest = {}
+        self._key_versions = {}
+        self._stats = {'published': 0, 'waiting': 0, 'wakeups': 0}
+
+    def publish(self, key=None, value=None):
+        """Record a change (the latest `value` per `key`, if given) and wake readers"""
+        with self._changed:
+            self.version += 1
+            if key is not None:
+                self._latest[key] = value
+                self._key_versions[key] = self.version
+            self._stats['published'] += 1
+            self._changed.notify_all()
+        return self.version
+
+    def discard(self, key):
+        """Forget a key (e.g. a deleted bot); readers are not notified"""
+        with self._changed:
+            self._latest.pop(key, None)
+            self._key_versions.pop(key, None)
+
+    def wait_for_change(self, seen_version, timeout=15.0):
+        """Block until the version moves past `seen_version` or `timeout` passes; returns the version"""
+        with self._changed:
+            if self.version == seen_version:
+                self._stats['waiting'] += 1
+                try:
+                    if self._changed.wait_for(lambda: self.version != seen_version, timeout=timeout):
+                        self._stats['wakeups'] += 1
+                finally:
+                    self._stats['waiting'] -= 1
+            return self.version
+
+    def changes_since(self, seen_version):
+        """(version, {key: latest value}) for the keys published after `seen_version`"""
+        with self._changed:
+            changes = {key: self._latest[key] for key, version in self._key_versions.items()
+                       if version > seen_version}
+            return self.version, changes
+
+    def stats(self):
+        with self._changed:
+            return dict(self._stats, name=self.name, version=self.version, keys=len(self._latest))
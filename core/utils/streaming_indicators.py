@@ -0,0 +1,534 @@
+# core/utils/streaming_indicators.py
+"""
+📡 Streaming Indicator State for Live Bots
+
+A live bot polls the same 250-bar window every few seconds, but only the
+forming (last) bar changes between polls. `IndicatorStream` keeps one
+incremental state per indicator and advances it once per closed bar; on each
+poll it only projects the forming bar, so the cost of an indicator call no
+longer depends on the window length.
+
+Usage (one stream per bot):
+
+    stream = IndicatorStream()
+    stream.sync(df)                 # df from get_rates_mt5, last row = forming bar
+    with stream.activate():
+        strategy.analyze(df)        # ta.* / append_indicator calls are served by the stream
+
+While a stream is active on the current thread, the indicator cache hands it
+every call. Calls it recognises (SMA, EMA, RSI, ATR, BBANDS, MACD, STOCH, ADX
+on the frame's own high/low/close columns) return the same columns pandas_ta
+would; anything else (derived series, other indicators, extra options) falls
+through to the normal cached computation.
+
+Values follow pandas_ta's default definitions over every bar the stream has
+seen, i.e. they equal a recomputation over the bot's whole bar history.
+Windowed indicators (SMA, BBANDS, STOCH) match a recomputation on the polled
+window once that window is past its warm-up rows; recursive ones (EMA, RSI,
+ATR, MACD, ADX) converge to it as the window's start-up seed decays.
+"""
+
+import contextlib
+import math
+import os
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+STREAMING_ENABLED = os.getenv('BOT_STREAMING_INDICATORS', '1') != '0'
+DEFAULT_MAX_BARS = int(os.getenv('BOT_STREAMING_MAX_BARS', '2000'))
+
+NAN = float('nan')
+
+_local = threading.local()
+
+
+def active_stream():
+    """The IndicatorStream active on this thread, or None"""
+    return getattr(_local, 'stream', None)
+
+
+# --- Incremental primitives -------------------------------------------------
+
+class _Window:
+    """The last `length` values of a series"""
+
+    def __init__(self, length):
+        self.length = length
+        self.values = deque(maxlen=length)
+
+    def clone(self):
+        other = _Window(self.length)
+        other.values = deque(self.values, maxlen=self.length)
+        return other
+
+    def push(self, value):
+        self.values.append(value)
+
+    def full(self):
+        return len(self.values) == self.length and not any(v != v for v in self.values)
+
+    def mean(self):
+        return math.fsum(self.values) / self.length if self.full() else NAN
+
+    def std(self, ddof):
+        if not self.full() or self.length - ddof <= 0:
+            return NAN
+        mean = math.fsum(self.values) / self.length
+        return math.sqrt(math.fsum((v - mean) ** 2 for v in self.values) / (self.length - ddof))
+
+    def max(self):
+        return max(self.values) if self.full() else NAN
+
+    def min(self):
+        return min(self.values) if self.full() else NAN
+
+
+class _Ewm:
+    """Step-by-step ``Series.ewm(alpha=..., adjust=..., min_periods=...).mean()``"""
+
+    def __init__(self, alpha, adjust, min_periods=0):
+        self.factor = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.weighted = NAN
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def clone(self):
+        other = object.__new__(_Ewm)
+        other.__dict__.update(self.__dict__)
+        return other
+
+    def push(self, value):
+        # Same update order as pandas' ewm kernel (ignore_na=False)
+        is_observation = value == value
+        self.nobs += is_observation
+        if self.weighted == self.weighted:
+            self.old_wt *= self.factor
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * value) / (self.old_wt + self.new_wt)
+                self.old_wt = self.old_wt + self.new_wt if self.adjust else 1.0
+        elif is_observation:
+            self.weighted = value
+        return self.weighted if self.nobs >= self.min_periods else NAN
+
+
+class _Ema:
+    """pandas_ta ``ema``: SMA of the first `length` values, then ewm(span, adjust=False)"""
+
+    def __init__(self, length):
+        self.length = length
+        self.seen = 0
+        self.seed = []
+        self.ewm = _Ewm(2.0 / (length + 1), adjust=False)
+
+    def clone(self):
+        other = object.__new__(_Ema)
+        other.length, other.seen, other.seed = self.length, self.seen, list(self.seed)
+        other.ewm = self.ewm.clone()
+        return other
+
+    def push(self, value):
+        self.seen += 1
+        if self.seen < self.length:
+            self.seed.append(value)
+            return self.ewm.push(NAN)
+        if self.seen == self.length:
+            self.seed.append(value)
+            valid = np.array([v for v in self.seed if v == v], dtype=float)
+            value = valid.sum() / len(valid) if len(valid) else NAN
+            self.seed = []
+        return self.ewm.push(value)
+
+
+def _rma(length):
+    """pandas_ta ``rma``: Wilder smoothing as ewm(alpha=1/length, min_periods=length)"""
+    return _Ewm(1.0 / length, adjust=True, min_periods=length)
+
+
+def _divide(numerator, denominator):
+    if denominator == 0 or numerator != numerator or denominator != denominator:
+        return NAN
+    return numerator / denominator
+
+
+# --- Indicators ---------------------------------------------------------------
+
+class _Indicator:
+    """An indicator advanced one bar at a time; `parts` lists the stateful attributes"""
+
+    parts = ()
+    inputs = ('close',)
+
+    def clone(self):
+        other = object.__new__(type(self))
+        other.__dict__.update(self.__dict__)
+        for name in self.parts:
+            setattr(other, name, getattr(self, name).clone())
+        return other
+
+    def peek(self, high, low, close):
+        """Values for a bar without advancing the state (the forming bar)"""
+        return self.clone().push(high, low, close)
+
+
+class _SMA(_Indicator):
+    parts = ('window',)
+
+    def __init__(self, length):
+        self.window = _Window(length)
+        self.columns = [f"SMA_{length}"]
+        self.min_bars = length
+
+    def push(self, high, low, close):
+        self.window.push(close)
+        return (self.window.mean(),)
+
+
+class _EMA(_Indicator):
+    parts = ('ema',)
+
+    def __init__(self, length):
+        self.ema = _Ema(length)
+        self.columns = [f"EMA_{length}"]
+        self.min_bars = length
+
+    def push(self, high, low, close):
+        return (self.ema.push(close),)
+
+
+class _RSI(_Indicator):
+    parts = ('gain', 'loss')
+
+    def __init__(self, length):
+        self.gain = _rma(length)
+        self.loss = _rma(length)
+        self.prev_close = None
+        self.columns = [f"RSI_{length}"]
+        self.min_bars = length
+
+    def push(self, high, low, close):
+        change = NAN if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        gain = self.gain.push(change if not change < 0 else 0.0)
+        loss = self.loss.push(change if not change > 0 else 0.0)
+        return (_divide(100 * gain, gain + abs(loss)),)
+
+
+class _ATR(_Indicator):
+    parts = ('rma',)
+    inputs = ('high', 'low', 'close')
+
+    def __init__(self, length):
+        self.rma = _rma(length)
+        self.prev_close = None
+        self.columns = [f"ATRr_{length}"]
+        self.min_bars = length
+
+    def true_range(self, high, low, close):
+        prev_close, self.prev_close = self.prev_close, close
+        if prev_close is None:
+            return NAN
+        return max(abs(high - low), abs(high - prev_close), abs(prev_close - low))
+
+    def push(self, high, low, close):
+        return (self.rma.push(self.true_range(high, low, close)),)
+
+
+class _BBANDS(_Indicator):
+    parts = ('window',)
+
+    def __init__(self, length, std, ddof):
+        self.window = _Window(length)
+        self.std = float(std)
+        self.ddof = ddof
+        suffix = f"_{length}_{self.std}"
+        self.columns = [f"BBL{suffix}", f"BBM{suffix}", f"BBU{suffix}", f"BBB{suffix}", f"BBP{suffix}"]
+        self.min_bars = length
+
+    def push(self, high, low, close):
+        self.window.push(close)
+        mid = self.window.mean()
+        deviation = self.std * self.window.std(self.ddof)
+        lower, upper = mid - deviation, mid + deviation
+        width = upper - lower
+        return lower, mid, upper, _divide(100 * width, mid), _divide(close - lower, width)
+
+
+class _MACD(_Indicator):
+    parts = ('fast', 'slow', 'signal')
+
+    def __init__(self, fast, slow, signal):
+        self.fast = _Ema(fast)
+        self.slow = _Ema(slow)
+        # The signal line starts at the first valid MACD value
+        self.signal = _Ema(signal)
+        suffix = f"_{fast}_{slow}_{signal}"
+        self.columns = [f"MACD{suffix}", f"MACDh{suffix}", f"MACDs{suffix}"]
+        self.min_bars = max(fast, slow, signal)
+
+    def push(self, high, low, close):
+        macd = self.fast.push(close) - self.slow.push(close)
+        signal = self.signal.push(macd) if macd == macd or self.signal.seen else NAN
+        return macd, macd - signal, signal
+
+
+class _STOCH(_Indicator):
+    parts = ('highs', 'lows', 'k', 'd')
+    inputs = ('high', 'low', 'close')
+
+    def __init__(self, k, d, smooth_k):
+        self.highs = _Window(k)
+        self.lows = _Window(k)
+        self.k = _Window(smooth_k)
+        self.d = _Window(d)
+        self.k_started = self.d_started = False
+        suffix = f"_{k}_{d}_{smooth_k}"
+        self.columns = [f"STOCHk{suffix}", f"STOCHd{suffix}"]
+        self.min_bars = max(k, d, smooth_k)
+
+    def push(self, high, low, close):
+        self.highs.push(high)
+        self.lows.push(low)
+        lowest = self.lows.min()
+        stoch = _divide(100 * (close - lowest), self.highs.max() - lowest)
+        # Smoothing windows start at the first valid value, as pandas_ta slices them
+        self.k_started = self.k_started or stoch == stoch
+        if self.k_started:
+            self.k.push(stoch)
+        stoch_k = self.k.mean()
+        self.d_started = self.d_started or stoch_k == stoch_k
+        if self.d_started:
+            self.d.push(stoch_k)
+        return stoch_k, self.d.mean()
+
+
+class _ADX(_Indicator):
+    parts = ('atr', 'plus', 'minus', 'adx')
+    inputs = ('high', 'low', 'close')
+
+    def __init__(self, length, lensig):
+        self.atr = _ATR(length)
+        self.plus = _rma(length)
+        self.minus = _rma(length)
+        self.adx = _rma(lensig)
+        self.prev_high = self.prev_low = None
+        self.columns = [f"ADX_{lensig}", f"DMP_{length}", f"DMN_{length}"]
+        self.min_bars = max(length, lensig)
+
+    def push(self, high, low, close):
+        atr = self.atr.push(high, low, close)[0]
+        if self.prev_high is None:
+            plus_dm = minus_dm = NAN
+        else:
+            up, down = high - self.prev_high, self.prev_low - low
+            plus_dm = up if up > down and up > 0 else 0.0
+            minus_dm = down if down > up and down > 0 else 0.0
+        self.prev_high, self.prev_low = high, low
+        k = _divide(100, atr)
+        dmp = k * self.plus.push(plus_dm)
+        dmn = k * self.minus.push(minus_dm)
+        dx = _divide(100 * abs(dmp - dmn), dmp + dmn)
+        return self.adx.push(dx), dmp, dmn
+
+
+def _positive_int(value, default):
+    return int(value) if value and value > 0 else default
+
+
+def _build_bbands(params):
+    length = _positive_int(params.get('length'), 5)
+    std = params.get('std')
+    ddof = params.get('ddof', 0)
+    return _BBANDS(length, float(std) if std and std > 0 else 2.0, int(ddof) if 0 <= ddof < length else 1)
+
+
+# name -> (indicator class, builder from pandas_ta keyword arguments); other keywords are not streamed
+INDICATORS = {
+    'sma': (_SMA, lambda p: _SMA(_positive_int(p.get('length'), 10)), {'length'}),
+    'ema': (_EMA, lambda p: _EMA(_positive_int(p.get('length'), 10)), {'length'}),
+    'rsi': (_RSI, lambda p: _RSI(_positive_int(p.get('length'), 14)), {'length'}),
+    'atr': (_ATR, lambda p: _ATR(_positive_int(p.get('length'), 14)), {'length'}),
+    'bbands': (_BBANDS, _build_bbands, {'length', 'std', 'ddof'}),
+    'macd': (_MACD, lambda p: _MACD(_positive_int(p.get('fast'), 12), _positive_int(p.get('slow'), 26),
+                                    _positive_int(p.get('signal'), 9)), {'fast', 'slow', 'signal'}),
+    'stoch': (_STOCH, lambda p: _STOCH(_positive_int(p.get('k'), 14), _positive_int(p.get('d'), 3),
+                                       _positive_int(p.get('smooth_k'), 3)), {'k', 'd', 'smooth_k'}),
+    'adx': (_ADX, lambda p: _ADX(_positive_int(p.get('length'), 14),
+                                 _positive_int(p.get('lensig'), _positive_int(p.get('length'), 14))),
+            {'length', 'lensig'}),
+}
+
+NOT_STREAMED = object()
+
+
+class _Tracked:
+    """An indicator plus the values it produced for every closed bar"""
+
+    def __init__(self, indicator):
+        self.indicator = indicator
+        self.history = [[] for _ in indicator.columns]
+        # Per-sync output for the current frame, rebuilt when a bar closes or the forming bar ticks
+        self.output = None
+
+    def push(self, high, low, close):
+        for column, value in zip(self.history, self.indicator.push(high, low, close)):
+            column.append(value)
+
+    def trim(self, keep):
+        for column in self.history:
+            del column[:-keep]
+
+    def frame_values(self, frame):
+        """(bars x columns) values over the synced frame, forming bar included"""
+        if self.output is None:
+            closed = len(frame['close']) - 1
+            output = np.empty((closed + 1, len(self.history)))
+            for j, column in enumerate(self.history):
+                output[:closed, j] = column[len(column) - closed:]
+            output[closed] = self.indicator.peek(frame['high'][-1], frame['low'][-1], frame['close'][-1])
+            self.output = output
+        return self.output
+
+
+class IndicatorStream:
+    """Incremental indicator state for one bot's symbol/timeframe"""
+
+    def __init__(self, max_bars=DEFAULT_MAX_BARS):
+        self.max_bars = max_bars
+        self._bars = {'high': [], 'low': [], 'close': []}
+        self._last_time = None
+        self._tracked = {}
+        self._frame = None
+        self.closed_bars = 0
+        self.reseeds = 0
+        self.served = 0
+        self.fallbacks = 0
+
+    # -- bars --
+
+    def _reset(self):
+        self._bars = {'high': [], 'low': [], 'close': []}
+        self._last_time = None
+        self._tracked = {}
+        self.reseeds += 1
+
+    def _push_bar(self, high, low, close, time):
+        for column, value in (('high', high), ('low', low), ('close', close)):
+            self._bars[column].append(value)
+        for tracked in self._tracked.values():
+            tracked.push(high, low, close)
+        self._last_time = time
+        self.closed_bars += 1
+
+    def sync(self, df):
+        """
+        Align the stream with a freshly polled frame.
+
+        Every row but the last is a closed bar; bars newer than the last one
+        seen advance the state. If the frame no longer contains that bar, or
+        its prices were revised, the state is rebuilt from the frame.
+        """
+        times = pd.DatetimeIndex(df['time'] if 'time' in df.columns else df.index).asi8
+        columns = {name: df[name].to_numpy(dtype=float) for name in ('high', 'low', 'close')}
+        closed = len(df) - 1
+
+        start = 0
+        if self._last_time is not None:
+            position = int(np.searchsorted(times[:closed], self._last_time))
+            revised = (position >= closed or times[position] != self._last_time or
+                       any(self._bars[name][-1] != columns[name][position] for name in columns))
+            if revised:
+                self._reset()
+            else:
+                start = position + 1
+
+        for i in range(start, closed):
+            self._push_bar(columns['high'][i], columns['low'][i], columns['close'][i], times[i])
+
+        keep = max(self.max_bars, closed)
+        if len(self._bars['close']) > 2 * keep:
+            for values in self._bars.values():
+                del values[:-keep]
+            for tracked in self._tracked.values():
+                tracked.trim(keep)
+
+        for tracked in self._tracked.values():
+            tracked.output = None
+        self._frame = columns
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Serve indicator calls made on this thread from the stream"""
+        previous = getattr(_local, 'stream', None)
+        _local.stream = self
+        try:
+            yield self
+        finally:
+            _local.stream = previous
+
+    # -- indicators --
+
+    def _track(self, key, name, params):
+        tracked = _Tracked(INDICATORS[name][1](params))
+        bars = self._bars
+        for high, low, close in zip(bars['high'], bars['low'], bars['close']):
+            tracked.push(high, low, close)
+        self._tracked[key] = tracked
+        return tracked
+
+    def _serve(self, name, params, index):
+        frame = self._frame
+        n = len(frame['close'])
+        if n < 2 or len(self._bars['close']) < n - 1:
+            return NOT_STREAMED
+        key = (name, tuple(sorted((k, repr(v)) for k, v in params.items())))
+        tracked = self._tracked.get(key) or self._track(key, name, params)
+        if n < tracked.indicator.min_bars:
+            return NOT_STREAMED
+        values = tracked.frame_values(frame)
+        self.served += 1
+        columns = tracked.indicator.columns
+        if len(columns) == 1:
+            return pd.Series(values[:, 0].copy(), index=index, name=columns[0])
+        return pd.DataFrame(values.copy(), index=index, columns=columns)
+
+    def _matches(self, name, series):
+        return (self._frame is not None and series.name == name and
+                np.array_equal(series.to_numpy(dtype=float), self._frame[name], equal_nan=True))
+
+    def compute(self, name, inputs, params):
+        """Streamed ``pandas_ta.<name>(*inputs, **params)``, or NOT_STREAMED"""
+        spec = INDICATORS.get(name)
+        if spec is None or not set(params) <= spec[2]:
+            self.fallbacks += 1
+            return NOT_STREAMED
+        expected = spec[0].inputs
+        if (len(inputs) != len(expected) or
+                not all(isinstance(s, pd.Series) and self._matches(col, s) for s, col in zip(inputs, expected))):
+            self.fallbacks += 1
+            return NOT_STREAMED
+        return self._serve(name, params, inputs[0].index)
+
+    def compute_frame(self, df, name, params):
+        """Streamed ``df.ta.<name>(**params)``, or NOT_STREAMED"""
+        spec = INDICATORS.get(name)
+        if (spec is None or not set(params) <= spec[2] or
+                not all(col in df.columns and self._matches(col, df[col]) for col in ('high', 'low', 'close'))):
+            self.fallbacks += 1
+            return NOT_STREAMED
+        return self._serve(name, params, df.index)
+
+    def stats(self) -> dict:
+        return {
+            'closed_bars': self.closed_bars,
+            'reseeds': self.reseeds,
+            'indicators': len(self._tracked),
+            'served': self.served,
+            'fallbacks': self.fallbacks,
+        }
@@ -3,8 +3,12 @@ import os
 import sys
 from werkzeug.security import generate_password_hash
 
-# Nama file database
-DB_FILE = "bots.db"
+from core.db.connection import DB_PATH
+from core.db.queries import BACKTEST_EQUITY_SCHEMA, BACKTEST_TRADES_SCHEMA
+from core.db.migrations import apply_migrations
+
+# File database (path yang sama dengan aplikasi, lihat core/db/connection.py)
+DB_FILE = DB_PATH
 
 def create_connection(db_file):
     """ Membuat koneksi ke database SQLite """ 
@@ -98,6 +102,12 @@ def main():
     );
     """
 
+    # Tabel 'backtest_trades' (trade log lengkap per backtest): skema yang sama dengan aplikasi
+    sql_create_backtest_trades_table = BACKTEST_TRADES_SCHEMA
+
+    # Tabel 'backtest_equity' (equity curve per backtest, satu baris per titik)
+    sql_create_backtest_equity_table = BACKTEST_EQUITY_SCHEMA
+
     # SQL statement untuk membuat tabel 'trading_sessions' (AI Mentor)
     sql_create_trading_sessions_table = """
     CREATE TABLE IF NOT EXISTS trading_sessions (
@@ -169,6 +179,12 @@ def main():
         print("\nMembuat tabel 'backtest_results'...")
         create_table(conn, sql_create_backtest_results_table)
 
+        print("\nMembuat tabel 'backtest_trades'...")
+        create_table(conn, sql_create_backtest_trades_table)
+
+        print("\nMembuat tabel 'backtest_equity'...")
+        create_table(conn, sql_create_backtest_equity_table)
+
         print("\nMembuat tabel 'trading_sessions' (AI Mentor)...")
         create_table(conn, sql_create_trading_sessions_table)
 
@@ -191,6 +207,10 @@ def main():
         except sqlite3.Error as e:
             print(f"Gagal memasukkan pengguna default: {e}")
 
+        # Buat indeks dan tandai versi skema terbaru
+        print("\nMenerapkan migrasi skema...")
+        apply_migrations(conn)
+
         conn.close()
         print(f"\nDatabase '{DB_FILE}' berhasil dibuat dengan semua tabel yang diperlukan.")
     else:
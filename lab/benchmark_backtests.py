@@ -0,0 +1,281 @@
+# benchmark_backtests.py - Repeatable throughput benchmark for the backtest engines
+"""
+Runs every strategy in STRATEGY_MAP through the legacy engine (`run_backtest`)
+and the enhanced engine (`run_enhanced_backtest`) on the bundled
+lab/*_16385_data.csv files and on synthetic random-walk data, and writes one
+JSON document per run so results can be compared across commits.
+
+Each result records total seconds, bars/sec, the split between strategy
+analysis (analyze_df + ATR) and simulation, peak traced memory and trades.
+The enhanced engine is timed phase by phase; for the legacy engine, whose
+analysis and simulation share one function, the analysis time is measured
+separately on the same data and the simulation time is the remainder.
+The indicator cache is cleared before every timed call unless --warm-cache.
+
+Examples:
+    python lab/benchmark_backtests.py --output bench.json
+    python lab/benchmark_backtests.py --strategies MA_CROSSOVER,RSI_CROSSOVER --datasets EURUSD --synthetic 10000
+    python lab/benchmark_backtests.py --output new.json --compare old.json
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import gc
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from core.backtesting.engine import run_backtest
+from core.backtesting.enhanced_engine import (
+    ENGINE_VERSION, backtest_signal_frame, detect_instrument_symbol, prepare_signal_frame
+)
+from core.strategies.strategy_map import STRATEGY_MAP
+from core.utils.indicator_cache import indicator_cache
+from core.utils.market_store import load_csv_dataset
+
+ENGINES = ('enhanced', 'legacy')
+DEFAULT_SYNTHETIC_SIZES = (10_000, 100_000, 1_000_000)
+LAB_DATA_PATTERN = os.path.join(project_root, 'lab', '*_16385_data.csv')
+
+# Parameters shared by both engines (legacy names map to the same ATR multipliers)
+BENCHMARK_PARAMS = {
+    'risk_percent': 1.0, 'sl_atr_multiplier': 2.0, 'tp_atr_multiplier': 4.0,
+    'lot_size': 1.0, 'sl_pips': 2.0, 'tp_pips': 4.0,
+}
+
+
+def synthetic_data(n_bars, seed=42, start_price=1.1):
+    """Hourly random-walk OHLCV frame with `n_bars` rows"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.0015, n_bars)))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.001, n_bars)) * close
+    return pd.DataFrame({
+        'time': pd.date_range('2000-01-03', periods=n_bars, freq='h'),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(100, 5000, n_bars),
+    })
+
+
+def lab_datasets(patterns=None):
+    """(name, symbol, loader) for each bundled lab CSV matching any of `patterns`"""
+    datasets = []
+    for path in sorted(glob.glob(LAB_DATA_PATTERN)):
+        symbol = os.path.basename(path).split('_')[0]
+        if patterns and not any(fnmatch.fnmatch(symbol, p) for p in patterns):
+            continue
+        datasets.append((os.path.basename(path), symbol, lambda path=path: load_csv_dataset(path)))
+    return datasets
+
+
+def synthetic_datasets(sizes):
+    return [(f'synthetic_{n}', 'EURUSD', lambda n=n: synthetic_data(n)) for n in sizes]
+
+
+def _timed(fn, warm_cache):
+    if not warm_cache:
+        indicator_cache.clear()
+    gc.collect()
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def _peak_memory_mb(fn, warm_cache):
+    if not warm_cache:
+        indicator_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def bench_enhanced(strategy_id, df, symbol, warm_cache):
+    instrument = detect_instrument_symbol(df, symbol)
+    frame, analyze_seconds = _timed(lambda: prepare_signal_frame(strategy_id, BENCHMARK_PARAMS, df, instrument), warm_cache)
+    result, simulate_seconds = _timed(
+        lambda: backtest_signal_frame(strategy_id, BENCHMARK_PARAMS, frame, instrument), warm_cache=True
+    )
+    return result, analyze_seconds, simulate_seconds
+
+
+def bench_legacy(strategy_id, df, symbol, warm_cache):
+    result, total_seconds = _timed(lambda: run_backtest(strategy_id, BENCHMARK_PARAMS, df, symbol_name=symbol), warm_cache)
+    _, analyze_seconds = _timed(
+        lambda: prepare_signal_frame(strategy_id, BENCHMARK_PARAMS, df, detect_instrument_symbol(df, symbol)), warm_cache
+    )
+    analyze_seconds = min(analyze_seconds, total_seconds)
+    return result, analyze_seconds, total_seconds - analyze_seconds
+
+
+def run_case(engine, strategy_id, dataset_name, symbol, df, repeat=1, measure_memory=True, warm_cache=False):
+    """Benchmark one engine/strategy/dataset combination; best-of-`repeat` timings"""
+    record = {
+        'engine': engine, 'strategy_id': strategy_id, 'dataset': dataset_name,
+        'symbol': symbol, 'bars': int(len(df)), 'status': 'ok', 'error': None,
+    }
+    bench = bench_enhanced if engine == 'enhanced' else bench_legacy
+    try:
+        timings = []
+        result = None
+        for _ in range(max(1, repeat)):
+            result, analyze_seconds, simulate_seconds = bench(strategy_id, df, symbol, warm_cache)
+            timings.append((analyze_seconds + simulate_seconds, analyze_seconds, simulate_seconds))
+        total, analyze, simulate = min(timings)
+    except Exception as e:
+        record.update(status='error', error=f"{type(e).__name__}: {e}")
+        return record
+
+    if isinstance(result, dict) and result.get('error'):
+        record.update(status='error', error=str(result['error']))
+    record.update({
+        'total_seconds': round(total, 6),
+        'analyze_seconds': round(analyze, 6),
+        'simulate_seconds': round(simulate, 6),
+        'bars_per_second': round(len(df) / total, 1) if total > 0 else None,
+        'trades': int(result.get('total_trades', 0)) if isinstance(result, dict) else 0,
+    })
+    if measure_memory and record['status'] == 'ok':
+        record['peak_memory_mb'] = _peak_memory_mb(lambda: bench(strategy_id, df, symbol, warm_cache), warm_cache)
+    return record
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_root, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(strategies=None, engines=ENGINES, datasets=None, repeat=1, measure_memory=True,
+                   warm_cache=False, max_legacy_bars=100_000, progress=print):
+    """Run the benchmark matrix and return the JSON-ready report"""
+    strategies = strategies or list(STRATEGY_MAP)
+    results = []
+    for dataset_name, symbol, load in datasets:
+        df = load()
+        for strategy_id in strategies:
+            for engine in engines:
+                if engine == 'legacy' and max_legacy_bars and len(df) > max_legacy_bars:
+                    results.append({
+                        'engine': engine, 'strategy_id': strategy_id, 'dataset': dataset_name, 'symbol': symbol,
+                        'bars': int(len(df)), 'status': 'skipped',
+                        'error': f"legacy engine limited to {max_legacy_bars} bars (--max-legacy-bars)",
+                    })
+                    continue
+                record = run_case(engine, strategy_id, dataset_name, symbol, df, repeat, measure_memory, warm_cache)
+                results.append(record)
+                if progress:
+                    if record['status'] == 'ok':
+                        progress(f"{engine:8s} {strategy_id:22s} {dataset_name:28s} {record['bars']:>9} bars "
+                                 f"{record['bars_per_second']:>12,.0f} bars/s  analyze {record['analyze_seconds']:.3f}s "
+                                 f"simulate {record['simulate_seconds']:.3f}s")
+                    else:
+                        progress(f"{engine:8s} {strategy_id:22s} {dataset_name:28s} {record['status']}: {record['error']}")
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'engine_version': ENGINE_VERSION,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'warm_cache': warm_cache,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(old, new):
+    """Rows of (engine, strategy, dataset, old bars/s, new bars/s, speedup) for cases in both reports"""
+    def index(report):
+        return {(r['engine'], r['strategy_id'], r['dataset']): r for r in report['results'] if r.get('status') == 'ok'}
+    old_index, new_index = index(old), index(new)
+    rows = []
+    for key in sorted(old_index.keys() & new_index.keys()):
+        before, after = old_index[key]['bars_per_second'], new_index[key]['bars_per_second']
+        rows.append((*key, before, after, round(after / before, 2) if before else None))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest engine throughput benchmark")
+    parser.add_argument('--strategies', help="Comma-separated strategy ids (default: all in STRATEGY_MAP)")
+    parser.add_argument('--engines', default=','.join(ENGINES), help="enhanced,legacy")
+    parser.add_argument('--datasets', default='*',
+                        help="Comma-separated symbol patterns for lab/*_16385_data.csv; 'none' skips them")
+    parser.add_argument('--synthetic', default=','.join(str(n) for n in DEFAULT_SYNTHETIC_SIZES),
+                        help="Comma-separated synthetic sizes in bars; 'none' skips them")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed runs per case (best is kept)")
+    parser.add_argument('--max-legacy-bars', type=int, default=100_000,
+                        help="Skip the bar-by-bar legacy engine above this size (0 = no limit)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the extra tracemalloc pass")
+    parser.add_argument('--warm-cache', action='store_true', help="Keep the indicator cache between calls")
+    parser.add_argument('--output', help="Write the JSON report here (default: stdout)")
+    parser.add_argument('--compare', help="Earlier JSON report to print speedups against")
+    args = parser.parse_args(argv)
+
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+    strategies = [s.strip() for s in args.strategies.split(',')] if args.strategies else None
+    if strategies:
+        missing = [s for s in strategies if s not in STRATEGY_MAP]
+        if missing:
+            parser.error(f"unknown strategy id(s): {', '.join(missing)}")
+
+    datasets = []
+    if args.datasets.lower() != 'none':
+        datasets += lab_datasets([p.strip() for p in args.datasets.split(',') if p.strip()])
+    if args.synthetic.lower() != 'none':
+        datasets += synthetic_datasets([int(n) for n in args.synthetic.split(',') if n.strip()])
+
+    log = lambda message: print(message, file=sys.stderr)
+    # Strategies print their own diagnostics; keep stdout clean for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_benchmarks(strategies, engines, datasets, args.repeat, not args.no_memory,
+                                args.warm_cache, args.max_legacy_bars, progress=log)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        log(f"✅ {len(report['results'])} results written to {args.output}")
+    else:
+        print(payload)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        for engine, strategy_id, dataset, before, after, speedup in compare_reports(old, report):
+            log(f"{engine:8s} {strategy_id:22s} {dataset:28s} {before:>12,.0f} -> {after:>12,.0f} bars/s  x{speedup}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+# benchmark_bot_runtime.py - Bots-per-core benchmark for the thread and asyncio bot runtimes
+"""
+Starts N live bots against a simulated terminal and database, once per bot
+runtime (one `TradingBot` thread per bot vs `AsyncTradingBot` coroutines on
+the shared event loop), and reports for each run:
+
+- cycles completed and process CPU seconds, from which ``bots_per_core`` is
+  the number of bots at the given check interval one fully busy core sustains
+  (interval / CPU seconds per cycle)
+- peak thread count
+- latency of a small request-sized task run every 10 ms on the main thread,
+  standing in for the Flask server that shares the process (p50/p99 ms)
+
+Terminal calls (rates, symbol info, positions) and history writes are faked
+with a fixed blocking latency, and order placement is disabled, so nothing
+reaches a real terminal or the bots database. The bar-close scheduler is
+turned off so both runtimes poll every `--interval` seconds.
+
+Examples:
+    python lab/benchmark_bot_runtime.py
+    python lab/benchmark_bot_runtime.py --bots 100,400 --interval 1 --duration 20 --output runtime.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import MetaTrader5 as mt5
+
+import core.bots.trading_bot as trading_bot_module
+import core.db.queries as queries
+import core.utils.mt5 as mt5_utils
+from core.bots.async_runtime import AsyncTradingBot
+from core.bots.trading_bot import TradingBot
+from core.utils.market_data_hub import market_data
+
+RUNTIMES = {'thread': TradingBot, 'asyncio': AsyncTradingBot}
+DEFAULT_BOTS = (50, 200)
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD', 'USDCAD', 'NZDUSD', 'EURJPY', 'XAUUSD']
+RATES_DTYPE = [('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+               ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')]
+
+
+class SimulatedTerminal:
+    """Stand-in for the MT5 terminal and history table with fixed call latencies"""
+
+    def __init__(self, terminal_latency=0.002, db_latency=0.001, bars=300, seed=7):
+        self.terminal_latency = terminal_latency
+        self.db_latency = db_latency
+        self.cycles = 0
+        self._lock = threading.Lock()
+        rng = np.random.default_rng(seed)
+        self.rates = {}
+        for symbol in SYMBOLS:
+            rates = np.zeros(bars, dtype=RATES_DTYPE)
+            close = 1.1 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+            rates['time'] = 1_700_000_000 - 1_700_000_000 % 3600 + 3600 * np.arange(bars)
+            rates['open'] = np.concatenate(([close[0]], close[:-1]))
+            rates['high'] = np.maximum(rates['open'], close) * 1.001
+            rates['low'] = np.minimum(rates['open'], close) * 0.999
+            rates['close'] = close
+            rates['tick_volume'] = rng.integers(100, 5000, bars)
+            self.rates[symbol] = rates
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        time.sleep(self.terminal_latency)
+        return self.rates[symbol][-count:].copy()
+
+    def symbol_info(self, symbol):
+        time.sleep(self.terminal_latency)
+        return SimpleNamespace(name=symbol, digits=5, visible=True)
+
+    def positions_get(self, symbol=None):
+        time.sleep(self.terminal_latency)
+        with self._lock:
+            self.cycles += 1
+        return ()
+
+    def add_history_log(self, *args, **kwargs):
+        time.sleep(self.db_latency)
+
+    def install(self):
+        """Patch the terminal, order and history entry points the bots use; returns an undo callable"""
+        patches = [
+            (mt5, 'copy_rates_from_pos', self.copy_rates_from_pos),
+            (mt5, 'symbol_info', self.symbol_info),
+            (mt5, 'positions_get', self.positions_get),
+            (mt5_utils, 'find_mt5_symbol', lambda symbol: symbol),
+            (queries, 'add_history_log', self.add_history_log),
+            (trading_bot_module, 'place_trade', lambda *args, **kwargs: None),
+            (trading_bot_module, 'close_trade', lambda *args, **kwargs: None),
+            # Poll on check_interval in both runtimes
+            (trading_bot_module, 'BAR_SCHEDULER_ENABLED', False),
+        ]
+        missing = object()
+        saved = [(target, name, getattr(target, name, missing)) for target, name, _ in patches]
+        for target, name, value in patches:
+            setattr(target, name, value)
+
+        def undo():
+            for target, name, value in saved:
+                if value is missing:
+                    delattr(target, name)
+                else:
+                    setattr(target, name, value)
+        return undo
+
+
+def _probe_latencies(duration, period=0.01):
+    """Time a small pure-Python task every `period` seconds on the calling thread"""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        sum(i * i for i in range(2000))
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(period)
+    return np.asarray(latencies)
+
+
+def run_case(runtime, n_bots, interval=1.0, duration=10.0, strategy='MA_CROSSOVER', terminal=None):
+    """Run `n_bots` bots on `runtime` for `duration` seconds and measure them"""
+    terminal = terminal or SimulatedTerminal()
+    undo = terminal.install()
+    market_data.invalidate()
+    bot_class = RUNTIMES[runtime]
+    bots = [
+        bot_class(id=100_000 + i, name=f'bench-{i}', market=SYMBOLS[i % len(SYMBOLS)], risk_percent=1.0,
+                  sl_pips=2.0, tp_pips=4.0, timeframe='H1', check_interval=interval, strategy=strategy)
+        for i in range(n_bots)
+    ]
+    try:
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        for bot in bots:
+            bot.start()
+        peak_threads = threading.active_count()
+        latencies = _probe_latencies(duration)
+        peak_threads = max(peak_threads, threading.active_count())
+        cycles = terminal.cycles
+        cpu_seconds = time.process_time() - cpu_started
+        wall_seconds = time.perf_counter() - wall_started
+    finally:
+        for bot in bots:
+            bot.stop()
+        for bot in bots:
+            bot.join(timeout=10)
+        undo()
+
+    cpu_per_cycle = cpu_seconds / cycles if cycles else float('nan')
+    return {
+        'runtime': runtime,
+        'bots': n_bots,
+        'interval_seconds': interval,
+        'wall_seconds': round(wall_seconds, 3),
+        'cycles': cycles,
+        'cycles_per_second': round(cycles / wall_seconds, 2),
+        'cpu_seconds': round(cpu_seconds, 3),
+        'cpu_ms_per_cycle': round(cpu_per_cycle * 1000, 3),
+        'bots_per_core': round(interval / cpu_per_cycle, 1) if cycles else 0,
+        'peak_threads': peak_threads,
+        'probe_p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'probe_p99_ms': round(float(np.percentile(latencies, 99)), 3),
+    }
+
+
+def run_benchmarks(bot_counts=DEFAULT_BOTS, runtimes=tuple(RUNTIMES), interval=1.0, duration=10.0,
+                   strategy='MA_CROSSOVER', progress=print):
+    results = []
+    for n_bots in bot_counts:
+        for runtime in runtimes:
+            record = run_case(runtime, n_bots, interval, duration, strategy)
+            results.append(record)
+            if progress:
+                progress(f"{runtime:>8} {n_bots:>5} bots: {record['cycles_per_second']:>8} cycles/s, "
+                         f"{record['bots_per_core']:>8} bots/core, {record['peak_threads']:>4} threads, "
+                         f"probe p99 {record['probe_p99_ms']} ms")
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'strategy': strategy,
+            'interval_seconds': interval,
+            'duration_seconds': duration,
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Thread vs asyncio bot runtime benchmark")
+    parser.add_argument('--bots', default=','.join(str(n) for n in DEFAULT_BOTS), help="Comma-separated bot counts")
+    parser.add_argument('--runtimes', default=','.join(RUNTIMES), help="thread,asyncio")
+    parser.add_argument('--interval', type=float, default=1.0, help="Bot check interval in seconds")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per run")
+    parser.add_argument('--strategy', default='MA_CROSSOVER')
+    parser.add_argument('--output', help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        [int(n) for n in args.bots.split(',')], [r.strip() for r in args.runtimes.split(',')],
+        args.interval, args.duration, args.strategy, progress=lambda line: print(line, file=sys.stderr),
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == '__main__':
+    main()
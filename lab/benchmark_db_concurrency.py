@@ -0,0 +1,215 @@
+# benchmark_db_concurrency.py - SQLite concurrency benchmark: bot writers vs polling readers
+"""
+Runs N writer threads (bots calling `add_history_log`) against M reader
+threads (the dashboard polling `get_unread_notifications_count` and
+`get_all_bots`) on a scratch copy of the bots schema, once per connection
+mode:
+
+- ``legacy``          a fresh ``sqlite3.connect`` per call, rollback journal,
+                      one commit per history row (the old behaviour)
+- ``pooled``          pooled WAL connections from core.db.connection, one
+                      commit per history row
+- ``pooled+batched``  pooled WAL readers, history rows group-committed by the
+                      background BatchWriter
+
+Each run reports rows committed per second, reads per second, read latency
+p50/p99 and how many database errors ("database is locked") were logged.
+The real `core.db.queries` functions are used; only their connection factory
+and writer are swapped, so nothing touches the real bots.db.
+
+Examples:
+    python lab/benchmark_db_concurrency.py
+    python lab/benchmark_db_concurrency.py --writers 8,64 --readers 4 --duration 10 --output db.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import core.db.queries as queries
+from core.db.batch_writer import BatchWriter
+from core.db.connection import ConnectionPool, connect_db
+from core.db.migrations import apply_migrations
+
+MODES = ('legacy', 'pooled', 'pooled+batched')
+DEFAULT_WRITERS = (8, 32)
+SCHEMA = (
+    '''CREATE TABLE bots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, market TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'Dijeda', lot_size REAL NOT NULL DEFAULT 0.01,
+        sl_pips INTEGER NOT NULL DEFAULT 100, tp_pips INTEGER NOT NULL DEFAULT 200,
+        timeframe TEXT NOT NULL DEFAULT 'H1', check_interval_seconds INTEGER NOT NULL DEFAULT 60,
+        strategy TEXT NOT NULL, strategy_params TEXT, enable_strategy_switching INTEGER NOT NULL DEFAULT 0)''',
+    '''CREATE TABLE trade_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, bot_id INTEGER NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, action TEXT NOT NULL, details TEXT,
+        is_notification INTEGER NOT NULL DEFAULT 0, is_read INTEGER NOT NULL DEFAULT 0)''',
+)
+
+
+class _ErrorCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def _legacy_connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def create_database(path, bots=50, wal=True):
+    with sqlite3.connect(path) as conn:
+        conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.executemany('INSERT INTO bots (name, market, strategy) VALUES (?, ?, ?)',
+                         [(f'bot-{i}', 'EURUSD', 'MA_CROSSOVER') for i in range(bots)])
+        apply_migrations(conn)
+
+
+def run_case(mode, n_writers, n_readers=4, duration=5.0, write_interval=0.002, read_interval=0.01,
+             directory=None):
+    """Run one writers-vs-readers case on a fresh database and measure it"""
+    path = os.path.join(directory or tempfile.mkdtemp(prefix='qbx-db-bench-'),
+                        f"{mode.replace('+', '_')}-{n_writers}w{n_readers}r.db")
+    create_database(path, wal=mode != 'legacy')
+
+    pool = None
+    if mode == 'legacy':
+        connect = lambda: _legacy_connect(path)  # noqa: E731
+        writer = BatchWriter(connect=connect, enabled=False)
+    else:
+        pool = ConnectionPool(path)
+        connect = pool.acquire
+        writer = BatchWriter(connect=lambda: connect_db(path), enabled=mode == 'pooled+batched')
+
+    saved = queries.get_db_connection, queries.db_writer
+    queries.get_db_connection, queries.db_writer = connect, writer
+    errors = _ErrorCounter()
+    db_logger = logging.getLogger('core.db')
+    db_logger.addHandler(errors)
+    stop = threading.Event()
+    submitted = [0] * n_writers
+    read_latencies = [[] for _ in range(n_readers)]
+
+    def bot(index):
+        while not stop.is_set():
+            queries.add_history_log(index + 1, 'INFO', f'cycle {submitted[index]}',
+                                    is_notification=submitted[index] % 10 == 0)
+            submitted[index] += 1
+            time.sleep(write_interval)
+
+    def dashboard(index):
+        while not stop.is_set():
+            started = time.perf_counter()
+            queries.get_unread_notifications_count()
+            queries.get_all_bots()
+            read_latencies[index].append((time.perf_counter() - started) * 1000)
+            time.sleep(read_interval)
+
+    threads = ([threading.Thread(target=bot, args=(i,)) for i in range(n_writers)] +
+               [threading.Thread(target=dashboard, args=(i,)) for i in range(n_readers)])
+    try:
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        writer.close()
+        elapsed = time.perf_counter() - started
+    finally:
+        queries.get_db_connection, queries.db_writer = saved
+        db_logger.removeHandler(errors)
+        if pool is not None:
+            pool.close_all()
+
+    with sqlite3.connect(path) as conn:
+        committed = conn.execute('SELECT COUNT(*) FROM trade_history').fetchone()[0]
+    latencies = np.concatenate([np.asarray(l) for l in read_latencies]) if n_readers else np.zeros(1)
+    return {
+        'mode': mode,
+        'writers': n_writers,
+        'readers': n_readers,
+        'seconds': round(elapsed, 3),
+        'rows_submitted': sum(submitted),
+        'rows_committed': committed,
+        'rows_per_second': round(committed / elapsed, 1),
+        'reads': int(len(latencies)),
+        'reads_per_second': round(len(latencies) / elapsed, 1),
+        'read_p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'read_p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'db_errors': errors.count,
+        'writer': writer.stats(),
+    }
+
+
+def run_benchmarks(writer_counts=DEFAULT_WRITERS, modes=MODES, n_readers=4, duration=5.0, progress=print):
+    results = []
+    directory = tempfile.mkdtemp(prefix='qbx-db-bench-')
+    for n_writers in writer_counts:
+        for mode in modes:
+            record = run_case(mode, n_writers, n_readers, duration, directory=directory)
+            results.append(record)
+            if progress:
+                progress(f"{mode:>15} {n_writers:>4} writers / {n_readers} readers: "
+                         f"{record['rows_per_second']:>9} rows/s, {record['reads_per_second']:>8} reads/s, "
+                         f"read p99 {record['read_p99_ms']} ms, {record['db_errors']} errors")
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'duration_seconds': duration,
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite writers vs readers concurrency benchmark")
+    parser.add_argument('--writers', default=','.join(str(n) for n in DEFAULT_WRITERS),
+                        help="Comma-separated writer (bot) thread counts")
+    parser.add_argument('--readers', type=int, default=4, help="Polling reader threads")
+    parser.add_argument('--modes', default=','.join(MODES), help="legacy,pooled,pooled+batched")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds per run")
+    parser.add_argument('--output', help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        [int(n) for n in args.writers.split(',')], [m.strip() for m in args.modes.split(',')],
+        args.readers, args.duration, progress=lambda line: print(line, file=sys.stderr),
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == '__main__':
+    main()
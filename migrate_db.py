@@ -1,36 +1,36 @@
 import sqlite3
 import os
 
-# Nama file database
-DB_FILE = "bots.db"
+from core.db.connection import DB_PATH
+from core.db.migrations import LATEST_VERSION, MIGRATIONS, apply_migrations, get_schema_version
 
-def migrate_database():
-    """Migrate the database to add the enable_strategy_switching column"""
+# File database (path yang sama dengan aplikasi, lihat core/db/connection.py)
+DB_FILE = DB_PATH
+
+def migrate_database(db_file=None):
+    """Apply pending schema migrations (see core/db/migrations.py)"""
+    db_file = db_file or DB_FILE
     try:
         # Check if database exists
-        if not os.path.exists(DB_FILE):
-            print(f"Database file '{DB_FILE}' not found. Run init_db.py first.")
+        if not os.path.exists(db_file):
+            print(f"Database file '{db_file}' not found. Run init_db.py first.")
             return False
             
         # Connect to database
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        
-        # Check if the column already exists
-        cursor.execute("PRAGMA table_info(bots)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'enable_strategy_switching' in columns:
-            print("Column 'enable_strategy_switching' already exists in bots table.")
+        conn = sqlite3.connect(db_file)
+        try:
+            current = get_schema_version(conn)
+            if current >= LATEST_VERSION:
+                print(f"Database is already at schema version {current}.")
+                return True
+
+            applied = apply_migrations(conn)
+            descriptions = {version: description for version, description, _ in MIGRATIONS}
+            for version in applied:
+                print(f"Applied migration v{version}: {descriptions[version]}")
+            print(f"Database schema is now at version {get_schema_version(conn)}.")
+        finally:
             conn.close()
-            return True
-            
-        # Add the new column
-        cursor.execute("ALTER TABLE bots ADD COLUMN enable_strategy_switching INTEGER NOT NULL DEFAULT 0")
-        conn.commit()
-        print("Successfully added 'enable_strategy_switching' column to bots table.")
-        
-        conn.close()
         return True
         
     except sqlite3.Error as e:
@@ -41,9 +41,9 @@ def migrate_database():
         return False
 
 if __name__ == '__main__':
-    print("Migrating database to add strategy switching support...")
+    print("Migrating database to the latest schema...")
     success = migrate_database()
     if success:
         print("Database migration completed successfully!")
     else:
-        print("Database migration failed!")
\ No newline at end of file
+        print("Database migration failed!")
@@ -9,6 +9,7 @@ from flask import jsonify
 from core import create_app
 from core.utils.mt5 import initialize_mt5
 from core.bots.controller import shutdown_all_bots, ambil_semua_bot
+from core.db.batch_writer import db_writer
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -30,7 +31,8 @@ app = create_app()
 def health_check():
     """Endpoint untuk memastikan server berjalan."""
     mt5_status = "MT5 connected" if mt5.isinitialize() else "MT5 not connected"  # pyright: ignore[reportAttributeAccessIssue]
-    return jsonify({"status": "ok", "message": "Server is running", "mt5": mt5_status})
+    return jsonify({"status": "ok", "message": "Server is running", "mt5": mt5_status,
+                    "db_writer": db_writer.stats()})
 
 if __name__ == '__main__':
     # Skip MT5 initialization if SKIP_MT5_INIT is set (for Vercel deployment)
@@ -13,6 +13,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
     let equityChart = null;
 
+    const TRADES_PER_PAGE = 50;
+
     // Format timestamp dari ISO string ke format lokal
     const formatTimestamp = (isoString) => {
         return new Date(isoString).toLocaleString('id-ID', {
@@ -131,14 +133,12 @@ document.addEventListener('DOMContentLoaded', () => {
                 <div class="p-3 bg-gray-50 rounded"><p class="text-xs text-gray-500">Max Lot</p><p class="font-bold">${maxLot}</p></div>
             `;
 
-            // Tampilkan equity chart
-            displayEquityChart(item.equity_curve);
-
             // Tampilkan parameter
             displayParameters(item.parameters);
 
-            // Tampilkan log trade
-            displayTradeLog(item.trade_log);
+            // Equity curve dan trade log diambil terpisah per run
+            loadEquityCurve(item.id);
+            loadTradePage(item.id, null);
 
         } catch (error) {
             console.error('Error showing detail:', error);
@@ -146,6 +146,48 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    async function loadEquityCurve(backtestId) {
+        try {
+            const response = await fetch(`/api/backtest/history/${backtestId}/equity?per_page=50000`);
+            if (!response.ok) {
+                throw new Error(`Status: ${response.status}`);
+            }
+            const data = await response.json();
+            displayEquityChart(data.equity_curve);
+        } catch (error) {
+            console.error('Error loading equity curve:', error);
+            displayEquityChart([]);
+        }
+    }
+
+    // page = null memuat halaman terakhir (trade terbaru)
+    async function loadTradePage(backtestId, page) {
+        try {
+            const perPage = TRADES_PER_PAGE;
+            let url = `/api/backtest/history/${backtestId}/trades?per_page=${perPage}`;
+            if (page !== null) {
+                url += `&page=${page}`;
+            }
+            let response = await fetch(url);
+            let data = await response.json();
+            if (!response.ok) {
+                throw new Error(data.error || `Status: ${response.status}`);
+            }
+            if (page === null && data.pages > 1) {
+                response = await fetch(`${url}&page=${data.pages}`);
+                data = await response.json();
+            }
+            displayTradeLog(data.trades, data);
+
+            detailLog.querySelectorAll('[data-trade-page]').forEach(button => {
+                button.addEventListener('click', () => loadTradePage(backtestId, parseInt(button.dataset.tradePage)));
+            });
+        } catch (error) {
+            console.error('Error loading trade log:', error);
+            detailLog.innerHTML = '<h4 class="text-lg font-semibold mt-6 mb-2">Trade Log</h4><p class="text-red-500">Error memuat trade log.</p>';
+        }
+    }
+
     function displayEquityChart(equityData) {
         try {
             // Destroy existing chart
@@ -254,7 +296,7 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function displayTradeLog(tradeLog) {
+    function displayTradeLog(tradeLog, pageInfo) {
         try {
             let parsedTrades = [];
             
@@ -274,13 +316,22 @@ document.addEventListener('DOMContentLoaded', () => {
                 return;
             }
 
-            let logHtml = '<h4 class="text-lg font-semibold mt-6 mb-2">Trade Log (Terakhir ' + Math.min(20, parsedTrades.length) + ' Trades)</h4>';
+            const page = pageInfo ? pageInfo.page : 1;
+            const pages = pageInfo ? pageInfo.pages : 1;
+            const total = pageInfo ? pageInfo.total : parsedTrades.length;
+            const firstNumber = (page - 1) * (pageInfo ? pageInfo.per_page : parsedTrades.length) + 1;
+
+            let logHtml = `<h4 class="text-lg font-semibold mt-6 mb-2">Trade Log (${firstNumber}-${firstNumber + parsedTrades.length - 1} dari ${total} Trades)</h4>`;
+            if (pages > 1) {
+                logHtml += '<div class="flex items-center gap-2 mb-2 text-sm">';
+                logHtml += page > 1 ? `<button class="px-2 py-1 border rounded" data-trade-page="${page - 1}">&larr; Sebelumnya</button>` : '';
+                logHtml += `<span>Halaman ${page} / ${pages}</span>`;
+                logHtml += page < pages ? `<button class="px-2 py-1 border rounded" data-trade-page="${page + 1}">Berikutnya &rarr;</button>` : '';
+                logHtml += '</div>';
+            }
             logHtml += '<div class="text-xs font-mono border rounded p-2 bg-gray-50 max-h-64 overflow-y-auto">';
             
-            // Show last 20 trades
-            const trades = parsedTrades.slice(-20);
-            
-            trades.forEach(trade => {
+            parsedTrades.forEach(trade => {
                 const profit = trade.profit || 0;
                 const profitClass = profit > 0 ? 'text-green-600' : 'text-red-600';
                 const entry = trade.entry || trade.entry_price || 0;
@@ -90,12 +90,21 @@ document.addEventListener('DOMContentLoaded', () => {
                 method: 'POST',
                 body: formData, // Kirim sebagai multipart/form-data
             });
-            const results = await response.json();
+            const submitted = await response.json();
 
-            if (response.ok) {
-                displayResults(results);
+            if (!response.ok) {
+                alert(`Error: ${submitted.error}`);
+                return;
+            }
+
+            // Backtest berjalan di background; pantau status job sampai selesai
+            const job = await waitForJob(submitted.status_url);
+            if (job.status === 'completed' && job.result && !job.result.error) {
+                displayResults(job.result);
+            } else if (job.status === 'cancelled') {
+                alert('Backtest dibatalkan.');
             } else {
-                alert(`Error: ${results.error}`);
+                alert(`Error: ${job.error || (job.result && job.result.error) || 'Backtest gagal'}`);
             }
         } catch (err) {
             console.error("Backtest failed:", err);
@@ -107,6 +116,23 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    async function waitForJob(statusUrl) {
+        while (true) {
+            const res = await fetch(statusUrl);
+            const job = await res.json();
+            if (!res.ok) {
+                throw new Error(job.error || 'Status job tidak tersedia');
+            }
+            if (['completed', 'failed', 'cancelled'].includes(job.status)) {
+                return job;
+            }
+            runBtn.textContent = job.status === 'queued'
+                ? 'Menunggu antrian...'
+                : `Menjalankan... ${Math.round(job.progress)}%`;
+            await new Promise(resolve => setTimeout(resolve, 500));
+        }
+    }
+
     function displayResults(data) {
         resultsContainer.classList.remove('hidden');
         
@@ -97,12 +97,7 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-async function fetchAndDisplayAnalysis() {
-    try {
-        const res = await fetch(`/api/bots/${botId}/analysis`);
-        if (!res.ok) throw new Error('Gagal memuat data analisis.');
-        const analysis = await res.json();
-
+function renderAnalysis(analysis) {
         const signal = (analysis.signal || "TAHAN").toUpperCase();
         analysisSignal.textContent = signal;
         let color = 'bg-gray-200 text-gray-800';
@@ -124,7 +119,13 @@ async function fetchAndDisplayAnalysis() {
         if (analysis.explanation) {
             analysisContainer.innerHTML += `<div class="mt-2 text-xs text-gray-500 italic">${analysis.explanation}</div>`;
         }
+}
 
+async function fetchAndDisplayAnalysis() {
+    try {
+        const res = await fetch(`/api/bots/${botId}/analysis`);
+        if (!res.ok) throw new Error('Gagal memuat data analisis.');
+        renderAnalysis(await res.json());
     } catch (e) {
         console.error('Error fetching analysis:', e);
         analysisSignal.textContent = 'ERROR';
@@ -138,15 +139,24 @@ async function fetchAndDisplayAnalysis() {
         // Ambil detail bot dulu untuk menentukan interval
         await fetchBotDetails();
 
-        // Tentukan interval berdasarkan status bot
-        const analysisInterval = botData && botData.status === 'Aktif' ? 5000 : 30000; // 5s untuk aktif, 30s untuk inactive
-
         // Panggil fungsi lainnya untuk data awal
         fetchBotHistory();
-        fetchAndDisplayAnalysis();
+
+        if (window.EventSource) {
+            // Server mengirim analisis hanya saat berubah (termasuk data awal saat terhubung)
+            const analysisStream = new EventSource(`/api/bots/analysis/stream?ids=${botId}`);
+            analysisStream.addEventListener('analysis', (event) => {
+                const data = JSON.parse(event.data);
+                if (String(data.bot_id) === String(botId)) renderAnalysis(data.analysis);
+            });
+        } else {
+            // Tentukan interval berdasarkan status bot
+            const analysisInterval = botData && botData.status === 'Aktif' ? 5000 : 30000; // 5s untuk aktif, 30s untuk inactive
+            fetchAndDisplayAnalysis();
+            setInterval(fetchAndDisplayAnalysis, analysisInterval);
+        }
 
         // Atur interval refresh untuk data yang dinamis
-        setInterval(fetchAndDisplayAnalysis, analysisInterval);
         setInterval(fetchBotHistory, 10000);      // Refresh riwayat setiap 10 detik
     }
 
@@ -35,6 +35,17 @@ document.addEventListener('DOMContentLoaded', function() {
         }).showToast();
     }
 
+    // Tandai notifikasi sebagai sudah dibaca (dipakai stream maupun polling)
+    function markAsRead(notificationIds) {
+        return fetch('/api/notifications/mark-as-read', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ ids: notificationIds }),
+        });
+    }
+
     // Fungsi untuk mengambil notifikasi baru dan menandainya sebagai sudah ditampilkan
     async function fetchAndShowNotifications() {
         try {
@@ -55,13 +66,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 });
 
                 // 3. Tandai notifikasi ini sebagai sudah dibaca
-                await fetch('/api/notifications/mark-as-read', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({ ids: notificationIds }),
-                });
+                await markAsRead(notificationIds);
             }
         } catch (error) {
             console.error('Gagal mengambil notifikasi toast:', error);
@@ -84,12 +89,46 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    // Jalankan saat halaman dimuat, lalu periksa setiap 10 detik
-    setTimeout(() => {
-        fetchAndShowNotifications();
-        checkNotificationStatus();
-    }, 1000); // Beri jeda 1 detik saat awal load
-    
-    setInterval(fetchAndShowNotifications, 10000); // Ambil notif baru & tampilkan toast
-    setInterval(checkNotificationStatus, 10000); // Pastikan status dot selalu sinkron
+    // Server push: notifikasi baru dikirim lewat Server-Sent Events begitu ditulis,
+    // browser otomatis menyambung ulang dari id terakhir (Last-Event-ID)
+    function startNotificationStream() {
+        const stream = new EventSource('/api/notifications/stream');
+        let pendingIds = [];
+        let markTimer = null;
+
+        stream.addEventListener('notification', (event) => {
+            const notif = JSON.parse(event.data);
+            if (notif.is_read) return;
+            showToast(notif.details);
+            if (notificationDot) notificationDot.classList.remove('hidden');
+            // Kumpulkan dulu, lalu tandai sekaligus dalam satu request
+            pendingIds.push(notif.id);
+            clearTimeout(markTimer);
+            markTimer = setTimeout(() => {
+                const ids = pendingIds;
+                pendingIds = [];
+                markAsRead(ids).catch(error => console.error('Gagal menandai notifikasi:', error));
+            }, 500);
+        });
+
+        stream.addEventListener('unread-count', (event) => {
+            if (!notificationDot) return;
+            const data = JSON.parse(event.data);
+            notificationDot.classList.toggle('hidden', !(data.unread_count > 0));
+        });
+    }
+
+    if (window.EventSource) {
+        startNotificationStream();
+    } else {
+        // Browser tanpa EventSource: polling seperti sebelumnya
+        // Jalankan saat halaman dimuat, lalu periksa setiap 10 detik
+        setTimeout(() => {
+            fetchAndShowNotifications();
+            checkNotificationStatus();
+        }, 1000); // Beri jeda 1 detik saat awal load
+        
+        setInterval(fetchAndShowNotifications, 10000); // Ambil notif baru & tampilkan toast
+        setInterval(checkNotificationStatus, 10000); // Pastikan status dot selalu sinkron
+    }
 });
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+📡 Bot Analysis Stream Test
+Checks that bots publish `last_analysis` only when it changes, that the
+on-demand analysis of inactive bots is computed once per bar, and that the
+SSE stream sends each bot's latest analysis once, coalescing bursts.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+import core.routes.api_bots as api_bots_module
+import core.utils.mt5 as mt5_utils
+from core.bots import controller
+from core.bots.trading_bot import TradingBot, analysis_topic
+from core.routes.api_bots import api_bots
+from core.utils.market_data_hub import market_data
+
+H1 = 3600
+
+
+class CountingStrategy:
+    """Signal flips with the close of the last bar; counts analyze() calls"""
+    calls = 0
+
+    def __init__(self, bot_instance=None, params=None):
+        pass
+
+    def analyze(self, df):
+        CountingStrategy.calls += 1
+        close = float(df['close'].iloc[-1])
+        return {'signal': 'BUY' if close > 1.0 else 'HOLD', 'price': close, 'explanation': 'test'}
+
+
+@pytest.fixture
+def inactive_bot(monkeypatch):
+    bot_id = 9101
+    terminal = {'time': 1_700_000_000 - 1_700_000_000 % H1 + 60, 'close': 1.1}
+    CountingStrategy.calls = 0
+    monkeypatch.setattr(controller.queries, 'get_bot_by_id', lambda i: {
+        'id': i, 'market': 'EURUSD', 'timeframe': 'H1', 'strategy': 'COUNTING', 'strategy_params': '{}'})
+    monkeypatch.setitem(controller.STRATEGY_MAP, 'COUNTING', CountingStrategy)
+    monkeypatch.setattr(mt5_utils, 'find_mt5_symbol', lambda market: market)
+    monkeypatch.setattr('MetaTrader5.symbol_info_tick', lambda symbol: SimpleNamespace(time=terminal['time']),
+                        raising=False)
+    monkeypatch.setattr(market_data, 'get_rates', lambda symbol, tf, count: pd.DataFrame(
+        {'close': [1.0, terminal['close']]}))
+    controller.inactive_analysis_cache.pop(bot_id, None)
+    yield bot_id, terminal
+    controller.inactive_analysis_cache.pop(bot_id, None)
+    analysis_topic.discard(bot_id)
+
+
+def read_events(response, count, timeout=5):
+    events, deadline = [], time.monotonic() + timeout
+    chunks = response.iter_encoded()
+    while len(events) < count and time.monotonic() < deadline:
+        chunk = next(chunks).decode()
+        if chunk.startswith('event: analysis'):
+            events.append(json.loads(chunk.split('data: ', 1)[1]))
+    return events
+
+
+def test_bot_publishes_analysis_only_when_it_changes():
+    bot = TradingBot(id=9100, name='pub', market='EURUSD', risk_percent=1.0, sl_pips=2.0, tp_pips=4.0,
+                     timeframe='H1', check_interval=60, strategy='MA_CROSSOVER')
+    version = analysis_topic.version
+    bot.last_analysis = {'signal': 'BUY', 'price': 1.1}
+    bot.last_analysis = {'signal': 'BUY', 'price': 1.1}
+    assert analysis_topic.version == version + 1
+    bot.last_analysis = {'signal': 'SELL', 'price': 1.0}
+    version, changes = analysis_topic.changes_since(version)
+    assert changes[9100] == {'signal': 'SELL', 'price': 1.0}
+    analysis_topic.discard(9100)
+
+
+def test_inactive_analysis_is_cached_per_bar(inactive_bot):
+    bot_id, terminal = inactive_bot
+    first = controller.get_bot_analysis_data(bot_id)
+    for _ in range(5):
+        assert controller.get_bot_analysis_data(bot_id) is first
+    assert CountingStrategy.calls == 1
+
+    # Next bar with the same result: recomputed, but not republished
+    version = analysis_topic.version
+    terminal['time'] += H1
+    assert controller.get_bot_analysis_data(bot_id) == first
+    assert CountingStrategy.calls == 2 and analysis_topic.version == version
+
+    # Next bar with a different result
+    terminal['time'] += H1
+    terminal['close'] = 0.9
+    assert controller.get_bot_analysis_data(bot_id)['signal'] == 'HOLD'
+    assert analysis_topic.changes_since(version)[1] == {bot_id: controller.get_bot_analysis_data(bot_id)}
+    assert CountingStrategy.calls == 3
+
+
+def test_stream_sends_latest_analysis_once(inactive_bot, monkeypatch):
+    bot_id, terminal = inactive_bot
+    active_id = 9102
+    monkeypatch.setitem(controller.active_bots, active_id, SimpleNamespace(last_analysis={'signal': 'MEMUAT'}))
+    monkeypatch.setattr(api_bots_module, 'ANALYSIS_STREAM_KEEPALIVE_SECONDS', 0.1)
+    monkeypatch.setattr(api_bots_module, 'ANALYSIS_STREAM_COALESCE_SECONDS', 0.2)
+    app = Flask(__name__)
+    app.register_blueprint(api_bots)
+    response = app.test_client().get(f'/api/bots/analysis/stream?ids={bot_id},{active_id}')
+
+    initial = {e['bot_id']: e['analysis']['signal'] for e in read_events(response, 2)}
+    assert initial == {bot_id: 'BUY', active_id: 'MEMUAT'}
+
+    def burst():
+        for i in range(5):
+            analysis_topic.publish(active_id, {'signal': 'BUY', 'step': i})
+        analysis_topic.publish(9999, {'signal': 'SELL'})  # not watched
+    threading.Timer(0.1, burst).start()
+    (update,) = read_events(response, 1)
+    assert update == {'bot_id': active_id, 'analysis': {'signal': 'BUY', 'step': 4}}
+
+    # Inactive bot: the stream itself picks up the next bar
+    terminal['time'] += H1
+    terminal['close'] = 0.9
+    (update,) = read_events(response, 1)
+    assert update['bot_id'] == bot_id and update['analysis']['signal'] == 'HOLD'
+    response.close()
+    analysis_topic.discard(active_id)
+    analysis_topic.discard(9999)
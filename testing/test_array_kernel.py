@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+⚡ Array Simulation Kernel Parity Test
+Checks that simulation_mode='array' reproduces the reference bar loop exactly
+(trades, equity curve, drawdown) for every instrument class.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.enhanced_engine import (
+    EnhancedBacktestEngine, InstrumentConfig, _simulate_arrays, _simulate_reference
+)
+
+
+def generate_signal_frame(base_price=1.1, periods=3000, seed=7):
+    """Synthetic post-analysis frame: OHLC, ATRr_14 and a sparse BUY/SELL signal column"""
+    rng = np.random.default_rng(seed)
+    close = base_price * np.cumprod(1 + rng.normal(0, 0.002, periods))
+    spread = np.abs(rng.normal(0, 0.0015, periods)) * close
+    df = pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=periods, freq='h'),
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'ATRr_14': pd.Series(spread * 2).rolling(14, min_periods=1).mean().to_numpy(),
+    })
+    df['signal'] = rng.choice(['HOLD', 'BUY', 'SELL'], size=periods, p=[0.9, 0.05, 0.05])
+    df.loc[::97, 'ATRr_14'] = 0.0  # Exercise the ATR <= 0 skip path
+    return df
+
+
+def run_both(df, symbol, risk_percent=1.0, sl=2.0, tp=4.0, **engine_kwargs):
+    engine = EnhancedBacktestEngine(**engine_kwargs)
+    config = InstrumentConfig.get_config(symbol)
+    args = (df, engine, config, symbol, risk_percent, sl, tp, 10000.0)
+    return _simulate_reference(*args), _simulate_arrays(*args)
+
+
+def test_kernel_matches_reference_all_instruments():
+    """Array kernel must give identical results to the reference loop"""
+    print("\n⚡ Testing array kernel parity")
+    cases = [('EURUSD', 1.1), ('USDJPY', 150.0), ('XAUUSD', 2300.0), ('BTCUSD', 60000.0), ('US500', 5200.0)]
+    for symbol, base_price in cases:
+        df = generate_signal_frame(base_price=base_price)
+        reference, array = run_both(df, symbol)
+        assert array == reference, f"{symbol}: array kernel diverged from reference"
+        print(f"✅ {symbol}: {len(array['trades'])} trades identical")
+
+
+def test_kernel_matches_reference_without_costs():
+    """Parity also holds with spread/slippage disabled and tight SL/TP"""
+    df = generate_signal_frame(seed=11)
+    reference, array = run_both(
+        df, 'EURUSD', risk_percent=2.0, sl=0.5, tp=0.5,
+        enable_spread_costs=False, enable_slippage=False
+    )
+    assert array == reference
+    assert len(array['trades']) > 0
+
+
+def test_kernel_without_signals():
+    """Frames with no entries produce a flat equity curve"""
+    df = generate_signal_frame().drop(columns=['signal'])
+    reference, array = run_both(df, 'EURUSD')
+    assert array == reference
+    assert array['trades'] == [] and array['equity_curve'] == [10000.0]
+
+
+if __name__ == '__main__':
+    test_kernel_matches_reference_all_instruments()
+    test_kernel_matches_reference_without_costs()
+    test_kernel_without_signals()
+    print("\n🎉 Array kernel parity tests passed")
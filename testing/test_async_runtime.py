@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+🔁 asyncio Bot Runtime Test
+Runs AsyncTradingBot against the runtime benchmark's simulated terminal:
+bots analyse on the shared loop, stop promptly, keep the thread interface
+the controller relies on, and the benchmark reports both runtimes.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'lab'))
+
+import threading
+import time
+
+from benchmark_bot_runtime import SimulatedTerminal, run_case
+from core.bots import controller
+from core.bots.async_runtime import AsyncTradingBot, BotRuntime
+
+
+def make_bot(bot_id, runtime, interval=0.05, market='EURUSD'):
+    return AsyncTradingBot(id=bot_id, name=f'async-{bot_id}', market=market, risk_percent=1.0, sl_pips=2.0,
+                           tp_pips=4.0, timeframe='H1', check_interval=interval, strategy='MA_CROSSOVER',
+                           runtime=runtime)
+
+
+def test_bots_run_as_coroutines_on_fixed_threads():
+    terminal = SimulatedTerminal()
+    undo = terminal.install()
+    runtime = BotRuntime({'mt5': 2, 'db': 1, 'cpu': 1})
+    threads_before = threading.active_count()
+    bots = [make_bot(900 + i, runtime, market=market) for i, market in enumerate(['EURUSD', 'XAUUSD'] * 10)]
+    try:
+        for bot in bots:
+            bot.start()
+        deadline = time.monotonic() + 10
+        while terminal.cycles < 3 * len(bots) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert terminal.cycles >= 3 * len(bots)
+        # Loop thread + 4 workers, however many bots
+        assert threading.active_count() - threads_before <= 5
+        assert all(bot.is_alive() and bot.status == 'Aktif' for bot in bots)
+        assert all(bot.last_analysis['signal'] in ('BUY', 'SELL', 'HOLD') for bot in bots)
+    finally:
+        started = time.monotonic()
+        for bot in bots:
+            bot.stop()
+        for bot in bots:
+            bot.join(timeout=5)
+        undo()
+        runtime.shutdown()
+    assert time.monotonic() - started < 5
+    assert not any(bot.is_alive() for bot in bots)
+    assert all(bot.status == 'Dijeda' for bot in bots)
+
+
+def test_controller_starts_async_bots_when_enabled(monkeypatch):
+    terminal = SimulatedTerminal()
+    undo = terminal.install()
+    runtime = BotRuntime({'mt5': 1, 'db': 1, 'cpu': 1})
+    bot_row = {'id': 77, 'name': 'Async', 'market': 'EURUSD', 'lot_size': 1.0, 'sl_pips': 2.0, 'tp_pips': 4.0,
+               'timeframe': 'H1', 'check_interval_seconds': 1, 'strategy': 'MA_CROSSOVER',
+               'strategy_params': '{}', 'status': 'Dijeda'}
+    statuses = []
+    monkeypatch.setattr(controller, 'ASYNC_RUNTIME_ENABLED', True)
+    monkeypatch.setattr(controller.queries, 'get_bot_by_id', lambda bot_id: dict(bot_row))
+    monkeypatch.setattr(controller.queries, 'update_bot_status', lambda bot_id, status: statuses.append(status))
+    monkeypatch.setattr('core.bots.async_runtime.bot_runtime', runtime)
+    try:
+        assert controller.mulai_bot(77)[0]
+        bot = controller.get_bot_instance_by_id(77)
+        assert isinstance(bot, AsyncTradingBot) and bot.is_alive()
+        deadline = time.monotonic() + 10
+        while bot.last_analysis['signal'] == 'MEMUAT' and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert controller.get_bot_analysis_data(77)['signal'] in ('BUY', 'SELL', 'HOLD')
+        assert controller.hentikan_bot(77)[0]
+        assert not bot.is_alive()
+    finally:
+        controller.active_bots.pop(77, None)
+        undo()
+        runtime.shutdown()
+    assert statuses == ['Aktif', 'Dijeda']
+
+
+def test_benchmark_reports_both_runtimes():
+    records = [run_case(runtime, 4, interval=0.2, duration=1.0) for runtime in ('thread', 'asyncio')]
+    for record in records:
+        assert record['cycles'] > 0 and record['bots_per_core'] > 0
+        assert record['probe_p99_ms'] >= record['probe_p50_ms'] > 0
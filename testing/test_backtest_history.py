@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+📚 Backtest History Storage Test
+Covers full trade-log persistence, lightweight history summaries and the
+paginated per-run trade/equity endpoints, including legacy rows, and deleting
+a run together with its trades and equity points.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import sqlite3
+
+import pytest
+from flask import Flask
+
+import core.db.queries as queries
+from core.db.migrations import apply_migrations
+import core.routes.api_backtest as api_backtest_module
+from core.routes.api_backtest import api_backtest, save_backtest_result
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'bots.db')
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('''
+            CREATE TABLE backtest_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                strategy_name TEXT NOT NULL,
+                data_filename TEXT NOT NULL,
+                total_profit_usd REAL NOT NULL,
+                total_trades INTEGER NOT NULL,
+                win_rate_percent REAL NOT NULL,
+                max_drawdown_percent REAL NOT NULL,
+                wins INTEGER NOT NULL,
+                losses INTEGER NOT NULL,
+                equity_curve TEXT,
+                trade_log TEXT,
+                parameters TEXT
+            )
+        ''')
+        # backtest_trades dibuat saat startup, seperti di aplikasi
+        apply_migrations(conn)
+
+    def connect():
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    monkeypatch.setattr(queries, 'get_db_connection', connect)
+    monkeypatch.setattr(api_backtest_module, 'get_db_connection', connect)
+    app = Flask(__name__)
+    app.register_blueprint(api_backtest)
+    client = app.test_client()
+    client.db_path = db_path
+    return client
+
+
+def make_results(n_trades):
+    trades = [{
+        'entry_time': f'2024-01-01 {i % 24:02d}:00:00', 'exit_time': f'2024-01-02 {i % 24:02d}:00:00',
+        'entry': 1.1 + i * 1e-4, 'exit': 1.1 + i * 2e-4, 'profit': float(i), 'spread_cost': 0.5,
+        'reason': 'Take Profit', 'position_type': 'BUY', 'lot_size': 0.1
+    } for i in range(n_trades)]
+    return {
+        'total_profit_usd': float(sum(range(n_trades))), 'total_trades': n_trades, 'win_rate_percent': 50.0,
+        'max_drawdown_percent': 3.0, 'wins': n_trades // 2, 'losses': n_trades - n_trades // 2,
+        'equity_curve': [10000.0 + i for i in range(n_trades + 1)], 'trades': trades
+    }
+
+
+def test_full_trade_log_is_paginated(client):
+    backtest_id = save_backtest_result('MA Crossover', 'EURUSD_H1_data.csv', {'fast_period': 10}, make_results(250))
+    assert backtest_id is not None
+
+    history = client.get('/api/backtest/history').get_json()
+    assert len(history) == 1
+    assert 'trade_log' not in history[0] and 'equity_curve' not in history[0]
+    assert history[0]['parameters']['fast_period'] == 10
+
+    page = client.get(f'/api/backtest/history/{backtest_id}/trades?page=3&per_page=100').get_json()
+    assert page['total'] == 250 and page['pages'] == 3
+    assert [t['profit'] for t in page['trades']] == [float(i) for i in range(200, 250)]
+    assert page['trades'][0]['entry'] == pytest.approx(1.12)
+
+    equity = client.get(f'/api/backtest/history/{backtest_id}/equity?page=2&per_page=200').get_json()
+    assert equity['total'] == 251
+    assert equity['equity_curve'] == [10000.0 + i for i in range(200, 251)]
+    # Stored one row per point instead of a JSON blob on the summary row
+    with sqlite3.connect(client.db_path) as conn:
+        assert conn.execute('SELECT equity_curve FROM backtest_results WHERE id = ?', (backtest_id,)).fetchone() == (None,)
+        assert conn.execute('SELECT COUNT(*) FROM backtest_equity WHERE backtest_id = ?', (backtest_id,)).fetchone() == (251,)
+
+    assert client.get('/api/backtest/history/999/trades').status_code == 404
+    assert client.get('/api/backtest/history/999').status_code == 404
+
+
+def test_legacy_rows_read_trade_log_column(client):
+    legacy_trades = make_results(5)['trades']
+    with sqlite3.connect(client.db_path) as conn:
+        conn.execute('''
+            INSERT INTO backtest_results (strategy_name, data_filename, total_profit_usd, total_trades,
+                win_rate_percent, max_drawdown_percent, wins, losses, equity_curve, trade_log, parameters)
+            VALUES ('Old', 'GBPUSD_H1_data.csv', 1, 5, 40, 2, 2, 3, '[10000, 10001]', ?, '{}')
+        ''', (json.dumps(legacy_trades),))
+    page = client.get('/api/backtest/history/1/trades?per_page=2&page=2').get_json()
+    assert page['total'] == 5
+    assert [t['profit'] for t in page['trades']] == [2.0, 3.0]
+    assert client.get('/api/backtest/history/1/equity').get_json()['equity_curve'] == [10000, 10001]
+
+
+def test_invalid_dataset_range_is_rejected(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(api_backtest_module, 'resolve_lab_dataset', lambda name: str(tmp_path / name))
+    submitted = []
+    monkeypatch.setattr(api_backtest_module.backtest_job_queue, 'submit', lambda *a, **k: submitted.append(a))
+    for form in ({'start': 'not-a-date'}, {'end': '2024-13-45'}, {'start': 'NaT'}):
+        response = client.post('/api/backtest/run', data={'dataset': 'EURUSD_H1_data.csv', 'strategy': 'MA_CROSSOVER',
+                                                          **form})
+        assert response.status_code == 400
+        assert 'tanggal' in response.get_json()['error']
+    assert submitted == []
+
+
+def test_delete_removes_trades_and_equity(client):
+    kept = save_backtest_result('MA Crossover', 'EURUSD_H1_data.csv', {}, make_results(3))
+    deleted = save_backtest_result('MA Crossover', 'EURUSD_H1_data.csv', {}, make_results(4))
+    assert client.delete(f'/api/backtest/history/{deleted}').status_code == 200
+    assert client.delete(f'/api/backtest/history/{deleted}').status_code == 404
+    with sqlite3.connect(client.db_path) as conn:
+        for table in ('backtest_trades', 'backtest_equity'):
+            counts = dict(conn.execute(f'SELECT backtest_id, COUNT(*) FROM {table} GROUP BY backtest_id'))
+            assert counts == {kept: 3 if table == 'backtest_trades' else 4}
+    assert client.get(f'/api/backtest/history/{kept}/trades').get_json()['total'] == 3
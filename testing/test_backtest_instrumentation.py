@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+⏱️ Backtest Instrumentation Test
+Covers the opt-in timings block, strategy/indicator sub-timings and the
+cProfile/tracemalloc reports of run_enhanced_backtest.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.enhanced_engine import run_enhanced_backtest
+from core.utils.indicator_cache import indicator_cache
+from core.utils.instrumentation import PhaseTimer, active_timer, profiling, strategy_section
+
+
+def generate_data(n_bars=1500, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.002, n_bars))
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=n_bars, freq='h'),
+        'open': close,
+        'high': close + 0.003,
+        'low': close - 0.003,
+        'close': close,
+        'volume': rng.integers(100, 1000, n_bars),
+    })
+
+
+def test_timings_block_and_identical_results():
+    df = generate_data()
+    plain = run_enhanced_backtest('MA_CROSSOVER', {}, df, symbol_name='EURUSD')
+    indicator_cache.clear()
+    timed = run_enhanced_backtest('MA_CROSSOVER', {}, df, symbol_name='EURUSD', engine_config={'timings': True})
+
+    assert 'timings' not in plain
+    timings = timed.pop('timings')
+    assert timed == plain
+    for name in ('copy', 'analyze_df', 'atr', 'dropna_reset', 'simulate'):
+        assert timings['phases'][name] >= 0
+    assert timings['bars'] == len(df)
+    assert 0 < timings['analyzed_bars'] <= len(df)
+    assert timings['trades'] == plain['total_trades']
+    assert timings['total_seconds'] >= sum(timings['phases'].values()) * 0.99
+    # Indicator calls made by the strategy and the engine's ATR
+    assert timings['indicators']['sma']['calls'] >= 2
+    assert timings['indicators']['df.atr']['calls'] == 1
+    assert active_timer() is None
+
+
+def test_strategy_sections_only_record_while_active():
+    with strategy_section('signals'):
+        pass
+    timer = PhaseTimer()
+    with timer.activate():
+        with strategy_section('signals'):
+            pass
+        with strategy_section('signals'):
+            pass
+    assert list(timer.to_dict()['strategy']) == ['signals']
+
+
+def test_profile_reports(tmp_path):
+    df = generate_data(800)
+    profile_path = str(tmp_path / 'backtest.prof')
+    cprofiled = run_enhanced_backtest('RSI_CROSSOVER', {}, df, symbol_name='EURUSD',
+                                      engine_config={'profile': 'cprofile', 'profile_top': 5,
+                                                     'profile_path': profile_path})
+    assert cprofiled['profile']['mode'] == 'cprofile'
+    assert len(cprofiled['profile']['top']) == 5
+    assert os.path.exists(profile_path)
+    assert 'timings' not in cprofiled
+
+    traced = run_enhanced_backtest('RSI_CROSSOVER', {}, df, symbol_name='EURUSD',
+                                   engine_config={'profile': 'tracemalloc', 'timings': True})
+    assert traced['profile']['peak_mb'] > 0
+    assert traced['profile']['top']
+    assert 'timings' in traced
+
+    assert 'error' in run_enhanced_backtest('RSI_CROSSOVER', {}, df, engine_config={'profile': 'perf'})
+
+
+def test_concurrent_tracemalloc_profiles():
+    df = generate_data(800)
+    results, errors = [None, None], []
+
+    def run(index):
+        try:
+            results[index] = run_enhanced_backtest('RSI_CROSSOVER', {}, df, symbol_name='EURUSD',
+                                                   engine_config={'profile': 'tracemalloc'})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    for result in results:
+        assert 'error' not in result
+        assert result['profile']['peak_mb'] > 0 and result['profile']['top']
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracemalloc_blocks_do_not_overlap():
+    first_inside, second_started, first_done = threading.Event(), threading.Event(), threading.Event()
+    reports, errors = {}, []
+
+    def first():
+        with profiling('tracemalloc') as report:
+            first_inside.set()
+            second_started.wait(5)
+            time.sleep(0.05)  # the second run is now trying to enter
+            data = [bytearray(1024 * 1024) for _ in range(8)]  # noqa: F841
+        first_done.set()
+        reports['first'] = report
+
+    def second():
+        first_inside.wait(5)
+        second_started.set()
+        try:
+            with profiling('tracemalloc') as report:
+                # Without serialization this block overlaps the first one and its
+                # snapshot fails once the first run stops tracemalloc
+                first_done.wait(0.5)
+            reports['second'] = report
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert reports['first']['peak_mb'] >= 8
+    # Each run reports its own peak, not the other run's
+    assert reports['second']['peak_mb'] < 1
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+⏳ Backtest Job Queue Test
+Covers completion, progress reporting, cancellation and the active-job limit.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+
+import pytest
+
+from core.backtesting.jobs import BacktestJobQueue, QueueFull
+
+
+def wait_until_finished(queue, job, timeout=5.0):
+    version = None
+    while job.status not in ('completed', 'failed', 'cancelled'):
+        new_version = queue.wait_for_change(job, version, timeout=timeout)
+        assert new_version != version, "job did not change before timeout"
+        version = new_version
+    return job
+
+
+def test_job_completes_with_result_and_progress():
+    queue = BacktestJobQueue(max_workers=1)
+    seen = []
+
+    def work(job, n_bars):
+        job.set_phase('simulating')
+        for i in range(1, n_bars + 1):
+            job.report_progress(i, n_bars)
+            seen.append(job.progress)
+        return {'bars': n_bars}
+
+    job = queue.submit(work, 10, description={'strategy': 'TEST'})
+    wait_until_finished(queue, job)
+    queue.shutdown(wait=True)
+
+    assert job.status == 'completed'
+    assert job.result == {'bars': 10}
+    assert job.progress == 100.0
+    assert seen == sorted(seen)
+    assert job.to_dict(include_result=False).get('result') is None
+    assert queue.get(job.id) is job
+
+
+def test_failed_job_records_error():
+    queue = BacktestJobQueue(max_workers=1)
+
+    def work(job):
+        raise ValueError("bad data")
+
+    job = wait_until_finished(queue, queue.submit(work))
+    queue.shutdown(wait=True)
+    assert job.status == 'failed'
+    assert 'bad data' in job.error
+
+
+def test_running_job_stops_at_next_progress_report():
+    queue = BacktestJobQueue(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def work(job):
+        started.set()
+        release.wait(5)
+        job.report_progress(1, 2)
+        return 'not reached'
+
+    job = queue.submit(work)
+    assert started.wait(5)
+    assert queue.cancel(job.id)
+    release.set()
+    wait_until_finished(queue, job)
+    queue.shutdown(wait=True)
+
+    assert job.status == 'cancelled'
+    assert job.result is None
+    assert not queue.cancel(job.id)
+
+
+def test_queued_job_cancelled_before_start_and_limit_enforced():
+    queue = BacktestJobQueue(max_workers=1, max_active=2)
+    release = threading.Event()
+
+    blocker = queue.submit(lambda job: release.wait(5))
+    waiting = queue.submit(lambda job: 'never')
+    with pytest.raises(QueueFull):
+        queue.submit(lambda job: None)
+
+    assert queue.cancel(waiting.id)
+    assert waiting.status == 'cancelled'
+    release.set()
+    wait_until_finished(queue, blocker)
+    queue.shutdown(wait=True)
+    assert blocker.status == 'completed'
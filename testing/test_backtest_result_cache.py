@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+🗃️ Backtest Result Cache Test
+Covers key stability, memory/disk hits, invalidation on data changes and eviction.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.enhanced_engine import run_enhanced_backtest
+from core.backtesting import result_cache
+from core.backtesting.result_cache import BacktestResultCache, cached_backtest, make_cache_key
+from core.db.connection import DB_PATH
+
+
+def generate_data(n_bars=400, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.001, n_bars))
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=n_bars, freq='h'),
+        'open': close,
+        'high': close + 0.0015,
+        'low': close - 0.0015,
+        'close': close,
+        'volume': rng.integers(100, 1000, n_bars),
+    })
+
+
+def test_key_depends_on_inputs_not_index():
+    df = generate_data()
+    key = make_cache_key('MA_CROSSOVER', {'fast_period': 10}, df, 'EURUSD')
+    assert key == make_cache_key('MA_CROSSOVER', {'fast_period': 10}, df.set_index(df.index + 5), 'EURUSD')
+    assert key != make_cache_key('MA_CROSSOVER', {'fast_period': 11}, df, 'EURUSD')
+    assert key != make_cache_key('MA_CROSSOVER', {'fast_period': 10}, df, 'GBPUSD')
+    assert key != make_cache_key('MA_CROSSOVER', {'fast_period': 10}, df, 'EURUSD', {'enable_slippage': False})
+    changed = df.copy()
+    changed.loc[200, 'close'] += 0.0001
+    assert key != make_cache_key('MA_CROSSOVER', {'fast_period': 10}, changed, 'EURUSD')
+
+
+
+def test_key_follows_strategy_sources_and_engine_version(monkeypatch):
+    df = generate_data()
+    real_getsource = result_cache.inspect.getsource
+    edited = set()
+
+    def getsource(module):
+        source = real_getsource(module)
+        return source + '\n# edited' if module.__name__ in edited else source
+
+    def key(strategy_id):
+        result_cache._strategy_code_digest.cache_clear()
+        return make_cache_key(strategy_id, {}, df, 'US30')
+
+    monkeypatch.setattr(result_cache.inspect, 'getsource', getsource)
+    try:
+        before = {strategy_id: key(strategy_id) for strategy_id in ('MA_CROSSOVER', 'INDEX_BREAKOUT_PRO')}
+        # A helper module only the index strategy lists
+        edited.add('core.utils.pivots')
+        assert key('INDEX_BREAKOUT_PRO') != before['INDEX_BREAKOUT_PRO']
+        assert key('MA_CROSSOVER') == before['MA_CROSSOVER']
+        # Shared base class
+        edited.clear()
+        edited.add('core.strategies.base_strategy')
+        assert key('MA_CROSSOVER') != before['MA_CROSSOVER']
+        # Unrelated modules and engine edits without a version bump leave keys alone
+        edited.clear()
+        edited.update({'core.db.queries', 'core.backtesting.enhanced_engine'})
+        assert key('MA_CROSSOVER') == before['MA_CROSSOVER']
+        monkeypatch.setattr(result_cache, 'ENGINE_VERSION', 'next')
+        assert key('MA_CROSSOVER') != before['MA_CROSSOVER']
+    finally:
+        result_cache._strategy_code_digest.cache_clear()
+
+
+def test_disk_tier_uses_pooled_wal_connections(tmp_path):
+    cache = BacktestResultCache(path=str(tmp_path / 'cache.db'))
+    cache.put('k', {'value': 1})
+    assert cache.get('k') == {'value': 1}
+    with cache._connect() as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    stats = cache._disk_pool.stats()
+    assert stats['opened'] == 1 and stats['in_use'] == 0
+
+
+def test_default_cache_path_is_next_to_bots_db():
+    assert result_cache.default_cache_path() == os.path.join(os.path.dirname(DB_PATH), 'backtest_cache.db')
+
+def test_cached_backtest_matches_engine_and_persists(tmp_path):
+    df = generate_data()
+    path = str(tmp_path / 'cache.db')
+    cache = BacktestResultCache(path=path)
+    expected = run_enhanced_backtest('MA_CROSSOVER', {}, df, symbol_name='EURUSD')
+
+    first = cached_backtest('MA_CROSSOVER', {}, df, symbol_name='EURUSD', cache=cache)
+    second = cached_backtest('MA_CROSSOVER', {}, df, symbol_name='EURUSD', cache=cache)
+    assert first['total_trades'] == second['total_trades'] == expected['total_trades']
+    assert second['total_profit_usd'] == expected['total_profit_usd']
+    assert second['equity_curve'] == expected['equity_curve']
+    assert cache.stats()['misses'] == 1 and cache.stats()['memory_hits'] == 1
+
+    # Hits are independent copies
+    second['total_trades'] = -1
+    assert cached_backtest('MA_CROSSOVER', {}, df, symbol_name='EURUSD', cache=cache)['total_trades'] != -1
+
+    # A fresh process-level cache reads the disk tier
+    reopened = BacktestResultCache(path=path)
+    third = cached_backtest('MA_CROSSOVER', {}, df, symbol_name='EURUSD', cache=reopened)
+    assert third['total_profit_usd'] == expected['total_profit_usd']
+    assert reopened.stats()['disk_hits'] == 1
+
+
+def test_memory_and_disk_bounds(tmp_path):
+    cache = BacktestResultCache(path=str(tmp_path / 'cache.db'), max_bytes=200, max_disk_entries=2)
+    for i in range(4):
+        cache.put(f'k{i}', {'value': i, 'padding': 'x' * 60})
+    assert cache.stats()['memory_bytes'] <= 200
+    cache.clear(disk=False)
+    assert cache.get('k0') is None and cache.get('k1') is None
+    assert cache.get('k3') == {'value': 3, 'padding': 'x' * 60}
+
+
+def test_error_results_are_not_cached(tmp_path):
+    cache = BacktestResultCache(path=str(tmp_path / 'cache.db'))
+    result = cached_backtest('NO_SUCH_STRATEGY', {}, generate_data(), cache=cache)
+    assert 'error' in result
+    assert cache.get(make_cache_key('NO_SUCH_STRATEGY', {}, generate_data())) is None
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+⏰ Bar-Close Scheduler Test
+Drives BarCloseScheduler with a fake tick clock: bots wake once per closed
+bar (plus their intrabar cadence), the shared data buffer is expired on each
+close and stopping a bot wakes it immediately.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import threading
+import time
+from datetime import datetime, timezone
+
+from core.bots import bar_scheduler as scheduler_module
+from core.bots.bar_scheduler import BarCloseScheduler, bar_open_time
+from core.bots.trading_bot import TradingBot
+
+mt5 = scheduler_module.mt5
+H1, M5 = mt5.TIMEFRAME_H1, mt5.TIMEFRAME_M5
+START = 1_700_000_000 - 1_700_000_000 % 3600  # an H1 boundary
+
+
+class FakeHub:
+    def __init__(self):
+        self.expired = []
+
+    def expire(self, symbol, timeframe):
+        self.expired.append((symbol, timeframe))
+
+
+class Market:
+    """Server tick time per symbol and a monotonic clock moving with it"""
+
+    def __init__(self):
+        self.server_time = {'EURUSD': START + 10, 'XAUUSD': START + 10}
+        self.now = 0.0
+
+    def advance(self, seconds, symbols=('EURUSD', 'XAUUSD')):
+        self.now += seconds
+        for symbol in symbols:
+            self.server_time[symbol] += seconds
+
+
+def make_scheduler(market, hub):
+    return BarCloseScheduler(tick_source=market.server_time.get, clock=lambda: market.now, data_hub=hub)
+
+
+def pending(subscription):
+    return subscription.wait(timeout=0)
+
+
+def test_bar_open_alignment():
+    assert bar_open_time(START + 3599, H1) == START
+    assert bar_open_time(START + 3600, H1) == START + 3600
+    assert bar_open_time(START + 301, M5) == START + 300
+    sunday = int(datetime(2024, 6, 9, tzinfo=timezone.utc).timestamp())
+    assert bar_open_time(sunday + 4 * 86400, mt5.TIMEFRAME_W1) == sunday
+    first = int(datetime(2024, 6, 1, tzinfo=timezone.utc).timestamp())
+    assert bar_open_time(first + 20 * 86400 + 5, mt5.TIMEFRAME_MN1) == first
+
+
+def test_bots_wake_once_per_closed_bar(monkeypatch):
+    monkeypatch.setattr(scheduler_module.BarCloseScheduler, 'start', lambda self: None)
+    market, hub = Market(), FakeHub()
+    scheduler = make_scheduler(market, hub)
+    h1_bots = [scheduler.subscribe('EURUSD', H1) for _ in range(3)]
+    m5_bot = scheduler.subscribe('EURUSD', M5)
+    gold_bot = scheduler.subscribe('XAUUSD', H1)
+
+    scheduler.poll()  # anchors the forming bars
+    assert [pending(s) for s in h1_bots + [m5_bot, gold_bot]] == [None] * 5
+
+    wakes = {id(s): 0 for s in h1_bots + [m5_bot, gold_bot]}
+    for _ in range(2 * 3600 // 30):
+        market.advance(30)
+        scheduler.poll()
+        for subscription in h1_bots + [m5_bot, gold_bot]:
+            if pending(subscription) == 'bar_close':
+                wakes[id(subscription)] += 1
+    assert [wakes[id(s)] for s in h1_bots] == [2, 2, 2]
+    assert wakes[id(m5_bot)] == 24 and wakes[id(gold_bot)] == 2
+    assert hub.expired.count(('EURUSD', H1)) == 2 and hub.expired.count(('EURUSD', M5)) == 24
+    assert scheduler.stats()['bar_closes'] == 28
+
+
+def test_no_ticks_no_wakeups_and_intrabar_cadence(monkeypatch):
+    monkeypatch.setattr(scheduler_module.BarCloseScheduler, 'start', lambda self: None)
+    market, hub = Market(), FakeHub()
+    scheduler = make_scheduler(market, hub)
+    closed_only = scheduler.subscribe('EURUSD', H1)
+    intrabar = scheduler.subscribe('EURUSD', H1, tick_interval=60)
+    scheduler.poll()
+
+    # Market closed: the clock moves, the server tick time does not
+    market.advance(3 * 3600, symbols=())
+    scheduler.poll()
+    assert pending(closed_only) is None
+    assert pending(intrabar) == 'tick'
+
+    reasons = []
+    for _ in range(10):
+        market.advance(30)
+        scheduler.poll()
+        reasons.append(pending(intrabar))
+    assert reasons.count('tick') == 5
+    # A bar close and a due tick in the same pass wake the bot once, as a close
+    market.advance(3600 - 300 + 60)
+    scheduler.poll()
+    assert pending(intrabar) == 'bar_close' and pending(intrabar) is None
+
+    scheduler.unsubscribe(closed_only)
+    scheduler.unsubscribe(intrabar)
+    assert scheduler.stats()['keys'] == 0
+
+
+def test_stopping_a_bot_wakes_its_wait():
+    scheduler = BarCloseScheduler(tick_source=lambda symbol: None, poll_interval=0.01)
+    bot = TradingBot(1, 'Test', 'EURUSD', 1.0, 2.0, 4.0, 'H1', 3600, 'MA_CROSSOVER')
+    bot.bar_subscription = scheduler.subscribe('EURUSD', H1)
+    waiter = threading.Thread(target=bot._wait_for_next_cycle)
+    started = time.monotonic()
+    waiter.start()
+    bot.stop()
+    waiter.join(timeout=5)
+    assert not waiter.is_alive() and time.monotonic() - started < 5
+    scheduler.unsubscribe(bot.bar_subscription)
+    time.sleep(0.05)
+    assert scheduler._thread is None
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+🗃️ Batched History Writer Test
+Checks the background BatchWriter against a temporary SQLite database:
+group commits on size/time thresholds, ordering under concurrent bots,
+flush on shutdown (including rows submitted while it closes) and the
+metrics it exposes.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from core.bots import controller
+from core.db import queries
+from core.db.batch_writer import BatchWriter
+
+INSERT = 'INSERT INTO trade_history (bot_id, action, details, is_notification, is_read) VALUES (?, ?, ?, ?, ?)'
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'history.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute('''
+            CREATE TABLE trade_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                bot_id INTEGER NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                action TEXT NOT NULL,
+                details TEXT,
+                is_notification INTEGER NOT NULL DEFAULT 0,
+                is_read INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+    return path
+
+
+def make_writer(db_path, **kwargs):
+    return BatchWriter(connect=lambda: sqlite3.connect(db_path), **kwargs)
+
+
+def rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT bot_id, action, details, timestamp FROM trade_history ORDER BY id').fetchall()
+
+
+def test_concurrent_bots_are_group_committed_in_order(db_path):
+    writer = make_writer(db_path, batch_size=50, flush_interval=0.05)
+
+    def bot(bot_id):
+        for i in range(100):
+            writer.submit(INSERT, (bot_id, 'INFO', f'event {i}', False, False))
+
+    threads = [threading.Thread(target=bot, args=(bot_id,)) for bot_id in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writer.flush(timeout=5)
+
+    written = rows(db_path)
+    assert len(written) == 800
+    for bot_id in range(8):
+        assert [d for b, _, d, _ in written if b == bot_id] == [f'event {i}' for i in range(100)]
+    stats = writer.stats()
+    assert stats['rows_written'] == 800 and stats['queue_depth'] == 0
+    assert stats['batches'] < 100 and stats['max_flush_ms'] >= stats['avg_flush_ms'] > 0
+    writer.close()
+
+
+def test_size_and_time_thresholds(db_path):
+    writer = make_writer(db_path, batch_size=10, flush_interval=30)
+    for i in range(25):
+        writer.submit(INSERT, (1, 'INFO', str(i), False, False))
+    deadline = time.monotonic() + 5
+    while len(rows(db_path)) < 20 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Two full batches committed, the rest waits for the interval or a flush
+    assert len(rows(db_path)) == 20
+    assert writer.stats()['batches'] == 2
+    writer.close()
+    assert len(rows(db_path)) == 25
+
+    writer = make_writer(db_path, batch_size=1000, flush_interval=0.05)
+    writer.submit(INSERT, (2, 'INFO', 'late', False, False))
+    deadline = time.monotonic() + 5
+    while len(rows(db_path)) < 26 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert rows(db_path)[-1][2] == 'late'
+    writer.close()
+
+
+def test_closed_or_disabled_writer_writes_synchronously(db_path):
+    writer = make_writer(db_path, enabled=False)
+    writer.submit(INSERT, (3, 'INFO', 'sync', False, False))
+    assert rows(db_path)[-1][2] == 'sync'
+
+    writer = make_writer(db_path)
+    writer.submit(INSERT, (3, 'INFO', 'queued', False, False))
+    writer.close()
+    writer.submit(INSERT, (3, 'INFO', 'after close', False, False))
+    assert [r[2] for r in rows(db_path)] == ['sync', 'queued', 'after close']
+
+
+def test_rows_submitted_during_close_are_not_lost(db_path):
+    writer = make_writer(db_path, flush_interval=30)
+    writer.submit(INSERT, (4, 'INFO', 'first', False, False))
+    # Hold one submitter between the _closed check and its queue.put while close() runs
+    entered, release = threading.Event(), threading.Event()
+    real_put = writer._queue.put
+
+    def slow_put(item, *args, **kwargs):
+        if isinstance(item, tuple) and item[1][2] == 'racing':
+            entered.set()
+            release.wait(5)
+        return real_put(item, *args, **kwargs)
+
+    writer._queue.put = slow_put
+    submitter = threading.Thread(target=writer.submit, args=(INSERT, (4, 'INFO', 'racing', False, False)))
+    submitter.start()
+    assert entered.wait(5)
+    closer = threading.Thread(target=writer.close)
+    closer.start()
+    time.sleep(0.1)
+    release.set()
+    submitter.join(5)
+    closer.join(5)
+    assert [r[2] for r in rows(db_path)] == ['first', 'racing']
+
+    # Many bots logging while the writer shuts down
+    writer = make_writer(db_path, batch_size=7, flush_interval=0.01)
+
+    def bot(bot_id):
+        for i in range(200):
+            writer.submit(INSERT, (bot_id, 'INFO', f'event {i}', False, False))
+
+    threads = [threading.Thread(target=bot, args=(bot_id,)) for bot_id in range(10, 16)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.005)
+    writer.close()
+    for thread in threads:
+        thread.join()
+    assert len(rows(db_path)) == 2 + 6 * 200
+    assert writer.flush(timeout=1)
+
+
+def test_history_log_and_shutdown_use_the_writer(db_path, monkeypatch):
+    writer = make_writer(db_path, flush_interval=30)
+    monkeypatch.setattr(queries, 'db_writer', writer)
+    monkeypatch.setattr(controller, 'db_writer', writer)
+    monkeypatch.setattr(controller, 'hentikan_semua_bot', lambda: (False, "Tidak ada bot yang sedang berjalan."))
+
+    queries.add_history_log(5, 'STOP', "Bot 'A' dihentikan.", is_notification=True)
+    assert rows(db_path) == []
+    controller.shutdown_all_bots()
+    (bot_id, action, details, timestamp), = rows(db_path)
+    assert (bot_id, action) == (5, 'STOP')
+    assert time.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
+
+
+def test_on_commit_runs_once_per_batch_after_commit(db_path):
+    writer = make_writer(db_path, batch_size=1000, flush_interval=30)
+    seen = []
+    on_commit = lambda: seen.append(len(rows(db_path)))  # noqa: E731
+    for i in range(5):
+        writer.submit(INSERT, (4, 'INFO', str(i), True, False), on_commit=on_commit)
+    writer.submit(INSERT, (4, 'INFO', 'plain', False, False))
+    assert seen == []
+    assert writer.flush(timeout=5)
+    # Called once, with every row of the batch already visible
+    assert seen == [6]
+    writer.close()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+⏱️ Backtest Benchmark Harness Test
+Runs the benchmark matrix on a tiny synthetic dataset and checks the JSON report.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'lab'))
+
+import json
+
+from benchmark_backtests import compare_reports, main, run_benchmarks, synthetic_datasets
+
+
+def test_report_has_timings_for_both_engines():
+    report = run_benchmarks(['MA_CROSSOVER'], datasets=synthetic_datasets([1500]), progress=None)
+    assert report['meta']['engine_version']
+    records = {r['engine']: r for r in report['results']}
+    assert set(records) == {'enhanced', 'legacy'}
+    for record in records.values():
+        assert record['status'] == 'ok'
+        assert record['bars'] == 1500
+        assert record['bars_per_second'] > 0
+        assert record['analyze_seconds'] >= 0 and record['simulate_seconds'] >= 0
+        assert record['peak_memory_mb'] > 0
+    # Both engines see the same signals on the same data
+    assert records['enhanced']['trades'] > 0
+
+
+def test_legacy_size_limit_and_compare(tmp_path):
+    report = run_benchmarks(['MA_CROSSOVER'], datasets=synthetic_datasets([1200]), measure_memory=False,
+                            max_legacy_bars=1000, progress=None)
+    statuses = {r['engine']: r['status'] for r in report['results']}
+    assert statuses == {'enhanced': 'ok', 'legacy': 'skipped'}
+    rows = compare_reports(report, report)
+    assert len(rows) == 1 and rows[0][-1] == 1.0
+
+
+def test_cli_writes_json(tmp_path):
+    output = tmp_path / 'bench.json'
+    main(['--strategies', 'RSI_CROSSOVER', '--engines', 'enhanced', '--datasets', 'none',
+          '--synthetic', '800', '--no-memory', '--output', str(output)])
+    report = json.loads(output.read_text())
+    assert [r['dataset'] for r in report['results']] == ['synthetic_800']
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+🗄️ SQLite Connection Pool Test
+Checks the pooled WAL connections from core.db.connection: reuse and the
+pool bound, pragmas, release through `with`/close(), close_all() for
+connections still in use, the single resolved
+database path, and a short run of the concurrency benchmark.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'lab'))
+
+import sqlite3
+import threading
+
+import pytest
+
+from benchmark_db_concurrency import run_case
+from core.db import connection
+from core.db.connection import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_size=2, timeout=0.2)
+    yield pool
+    pool.close_all()
+
+
+def test_connections_are_reused_and_bounded(pool):
+    with pool.acquire() as conn:
+        conn.execute('CREATE TABLE t (x INTEGER)')
+        conn.execute('INSERT INTO t VALUES (1)')
+        first = conn._conn
+    with pool.acquire() as conn:
+        assert conn._conn is first
+        assert conn.execute('SELECT x FROM t').fetchone()['x'] == 1
+
+    a, b = pool.acquire(), pool.acquire()
+    with pytest.raises(sqlite3.OperationalError):
+        pool.acquire()
+    # A waiting thread gets the connection as soon as one is released
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    pool.timeout = 5
+    waiter.start()
+    a.close()
+    waiter.join(5)
+    assert got and got[0]._conn is not None
+    got[0].close()
+    b.close()
+    stats = pool.stats()
+    assert (stats['open'], stats['in_use'], stats['idle']) == (2, 0, 2)
+    assert stats['opened'] == 2 and stats['waits'] == 2
+
+
+def test_pragmas_and_release_semantics(pool):
+    conn = pool.acquire()
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+    assert conn.execute('PRAGMA cache_size').fetchone()[0] == -16000
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.commit()
+    conn.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute('SELECT 1')
+    conn.close()  # idempotent
+
+    # An uncommitted transaction is rolled back when the connection goes back
+    conn = pool.acquire()
+    conn.execute('INSERT INTO t VALUES (1)')
+    conn.close()
+    with pytest.raises(ZeroDivisionError):
+        with pool.acquire() as conn:
+            conn.execute('INSERT INTO t VALUES (2)')
+            1 / 0
+    with pool.acquire() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 0
+    assert pool.stats()['in_use'] == 0
+
+
+def test_close_all_closes_connections_released_later(pool):
+    idle = pool.acquire()
+    busy = pool.acquire()
+    raw_idle, raw_busy = idle._conn, busy._conn
+    idle.close()
+    pool.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        raw_idle.execute('SELECT 1')
+    # Still usable by its holder until released, then closed instead of pooled
+    assert busy.execute('SELECT 1').fetchone()[0] == 1
+    busy.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        raw_busy.execute('SELECT 1')
+    stats = pool.stats()
+    assert (stats['open'], stats['in_use'], stats['idle']) == (0, 0, 0)
+
+    # The pool keeps working with fresh connections
+    with pool.acquire() as conn:
+        assert conn._conn not in (raw_idle, raw_busy)
+    assert pool.stats()['idle'] == 1
+
+
+def test_every_module_uses_the_same_database_path(monkeypatch, tmp_path):
+    import init_db
+    import migrate_db
+    assert os.path.isabs(connection.DB_PATH)
+    assert os.path.dirname(connection.DB_PATH) == project_root
+    assert init_db.DB_FILE == migrate_db.DB_FILE == connection.DB_PATH
+    assert connection.db_pool.path is None  # falls back to DB_PATH when connecting
+
+    monkeypatch.setenv('BOT_DB_PATH', str(tmp_path / 'custom.db'))
+    assert connection.resolve_db_path() == str(tmp_path / 'custom.db')
+
+
+def test_benchmark_runs_all_modes(tmp_path):
+    for mode in ('legacy', 'pooled', 'pooled+batched'):
+        record = run_case(mode, 4, n_readers=2, duration=0.5, directory=str(tmp_path))
+        assert record['rows_committed'] == record['rows_submitted'] > 0
+        assert record['reads'] > 0 and record['read_p99_ms'] >= record['read_p50_ms'] > 0
+        assert record['db_errors'] == 0
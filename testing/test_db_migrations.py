@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+🧭 Database Migration Test
+Builds bots.db with init_database() in a temporary directory, migrates a
+pre-versioning database with migrate_db, and checks with EXPLAIN QUERY PLAN
+that the hot history, notification, backtest and AI mentor queries use the
+new indexes instead of scanning their tables.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import sqlite3
+
+import pytest
+
+import migrate_db
+from core import init_database
+from core.db import connection
+from core.db.migrations import LATEST_VERSION, apply_migrations, get_schema_version
+
+HOT_QUERIES = {
+    'get_history_by_bot_id': (
+        'SELECT * FROM trade_history WHERE bot_id = ? ORDER BY timestamp DESC', (1,), 'idx_trade_history_bot_time'),
+    'get_notifications': ('''
+        SELECT h.id, h.action, h.details, h.is_read, h.timestamp, b.name as bot_name
+        FROM trade_history h
+        LEFT JOIN bots b ON h.bot_id = b.id
+        WHERE h.is_notification = 1
+        ORDER BY h.timestamp DESC''', (), 'idx_trade_history_notifications'),
+    'get_unread_notifications_count': (
+        'SELECT COUNT(id) as unread_count FROM trade_history WHERE is_notification = 1 AND is_read = 0', (),
+        'idx_trade_history_unread'),
+    'get_unread_notifications': (
+        'SELECT h.id, h.details FROM trade_history h WHERE h.is_notification = 1 AND h.is_read = 0 '
+        'ORDER BY h.timestamp ASC', (), 'idx_trade_history_unread'),
+    'mark_all_notifications_read': (
+        'UPDATE trade_history SET is_read = 1 WHERE is_notification = 1 AND is_read = 0', (),
+        'idx_trade_history_unread'),
+    'get_notifications_since': ('''
+        SELECT h.id, h.action, h.details, h.is_read, h.timestamp, b.name as bot_name
+        FROM trade_history h
+        LEFT JOIN bots b ON h.bot_id = b.id
+        WHERE h.is_notification = 1 AND h.id > ?
+        ORDER BY h.id
+        LIMIT ?''', (0, 100), 'idx_trade_history_notification_id'),
+    'get_latest_notification_id': (
+        'SELECT MAX(id) FROM trade_history WHERE is_notification = 1', (), 'idx_trade_history_notification_id'),
+    'get_backtest_history': (
+        'SELECT id, strategy_name FROM backtest_results ORDER BY timestamp DESC, id DESC LIMIT 20', (),
+        'idx_backtest_results_timestamp'),
+    'get_or_create_today_session': (
+        'SELECT id FROM trading_sessions WHERE session_date = ?', ('2026-01-02',), 'idx_trading_sessions_date'),
+    'get_recent_mentor_reports': ('''
+        SELECT ts.session_date, ts.total_trades, mr.motivation_message
+        FROM trading_sessions ts
+        LEFT JOIN ai_mentor_reports mr ON ts.id = mr.session_id
+        ORDER BY ts.session_date DESC
+        LIMIT ?''', (7,), 'idx_ai_mentor_reports_session'),
+    'get_session_trades': (
+        'SELECT symbol, profit_loss FROM daily_trading_data WHERE session_id = ?', (1,),
+        'idx_daily_trading_data_session'),
+}
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'bots.db')
+    monkeypatch.setattr(connection, 'DB_PATH', path)
+    return path
+
+
+def query_plan(conn, sql, params):
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+
+def test_hot_queries_use_indexes(db_path):
+    init_database()
+    with sqlite3.connect(db_path) as conn:
+        # Enough rows that the planner has a real choice to make
+        conn.executemany('INSERT INTO trade_history (bot_id, action, details, is_notification, is_read) '
+                         'VALUES (?, ?, ?, ?, ?)',
+                         [(i % 20, 'INFO', str(i), i % 10 == 0, i % 30 != 0) for i in range(3000)])
+        conn.execute('ANALYZE')
+        assert get_schema_version(conn) == LATEST_VERSION
+        for name, (sql, params, index) in HOT_QUERIES.items():
+            plan = query_plan(conn, sql, params)
+            assert any(index in step for step in plan), f'{name} does not use {index}: {plan}'
+            # No full table scans and no temporary sort for the ORDER BY
+            assert all('INDEX' in step for step in plan if step.startswith('SCAN')), f'{name}: {plan}'
+            assert not any('TEMP B-TREE' in step for step in plan), f'{name}: {plan}'
+
+
+def test_migrating_a_pre_versioning_database(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('CREATE TABLE bots (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL)')
+        conn.execute('''CREATE TABLE trade_history (id INTEGER PRIMARY KEY AUTOINCREMENT, bot_id INTEGER NOT NULL,
+                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, action TEXT NOT NULL, details TEXT,
+                        is_notification INTEGER NOT NULL DEFAULT 0, is_read INTEGER NOT NULL DEFAULT 0)''')
+        conn.execute("INSERT INTO bots (name) VALUES ('old bot')")
+
+    assert migrate_db.migrate_database(db_path)
+    with sqlite3.connect(db_path) as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+        columns = [column[1] for column in conn.execute('PRAGMA table_info(bots)')]
+        assert 'enable_strategy_switching' in columns
+        assert conn.execute('SELECT enable_strategy_switching FROM bots').fetchone() == (0,)
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        # AI mentor tables do not exist here; their indexes are simply skipped
+        assert {'idx_trade_history_bot_time', 'idx_trade_history_unread'} <= indexes
+        assert 'idx_trading_sessions_date' not in indexes
+        # No backtest_results either, so its detail tables are not created
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name IN ('backtest_trades', 'backtest_equity')"
+                            ).fetchone() is None
+
+        # Already up to date: nothing runs again
+        assert apply_migrations(conn) == []
+    assert migrate_db.migrate_database(db_path)
+
+
+def test_backtest_trades_created_for_old_backtest_databases(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('CREATE TABLE backtest_results (id INTEGER PRIMARY KEY AUTOINCREMENT, strategy_name TEXT)')
+        conn.execute('PRAGMA user_version = 3')
+
+    assert migrate_db.migrate_database(db_path)
+    with sqlite3.connect(db_path) as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+        columns = [column[1] for column in conn.execute('PRAGMA table_info(backtest_trades)')]
+        assert columns[:2] == ['backtest_id', 'seq']
+        columns = [column[1] for column in conn.execute('PRAGMA table_info(backtest_equity)')]
+        assert columns == ['backtest_id', 'seq', 'equity']
+
+
+def test_failed_migration_is_rolled_back(db_path, monkeypatch):
+    from core.db import migrations
+
+    def broken(conn):
+        conn.execute('CREATE TABLE half_done (x INTEGER)')
+        raise sqlite3.OperationalError('boom')
+
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS + ((LATEST_VERSION + 1, 'broken', broken),))
+    conn = sqlite3.connect(db_path)
+    with pytest.raises(sqlite3.OperationalError):
+        apply_migrations(conn)
+    assert get_schema_version(conn) == LATEST_VERSION
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+    conn.close()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+📈 Index Breakout Pro Vectorization Test
+Checks the vectorized analyze_df against the original bar-by-bar loop on the
+bundled SP500m/ND100m index data: signals, strengths and explanations must match.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.strategies.index_breakout_pro import IndexBreakoutProStrategy
+
+
+def load_index_data(name, bars):
+    df = pd.read_csv(os.path.join(project_root, 'lab', f'{name}_16385_data.csv'), parse_dates=['time'])
+    # The reference loop is quadratic, so only the most recent bars are compared
+    return df.tail(bars).reset_index(drop=True)
+
+
+def assert_same_signals(strategy, df):
+    reference = strategy._analyze_df_reference(df.copy())
+    vectorized = strategy.analyze_df(df.copy())
+    assert vectorized['signal'].tolist() == reference['signal'].tolist()
+    assert vectorized['explanation'].tolist() == reference['explanation'].tolist()
+    assert np.array_equal(vectorized['signal_strength'].to_numpy(), reference['signal_strength'].to_numpy())
+    return vectorized
+
+
+@pytest.mark.parametrize('name', ['SP500m', 'ND100m'])
+def test_vectorized_matches_loop_on_bundled_indices(name):
+    result = assert_same_signals(IndexBreakoutProStrategy(None, {}), load_index_data(name, 2000))
+    assert (result['signal'] != 'HOLD').any()
+
+
+@pytest.mark.parametrize('params', [
+    {'breakout_period': 10, 'volume_surge_multiplier': 1.2, 'min_breakout_size': 0.1},
+    {'breakout_period': 50, 'volume_surge_multiplier': 3.0, 'min_breakout_size': 0.8},
+    # Longer than the 60-bar warmup: the loop's window is shorter on early bars
+    {'breakout_period': 80},
+])
+def test_vectorized_matches_loop_with_custom_params(params):
+    assert_same_signals(IndexBreakoutProStrategy(None, params), load_index_data('SP500m', 600))
+
+
+def test_short_frames_are_returned_untouched():
+    df = load_index_data('ND100m', 40)
+    assert 'signal' not in IndexBreakoutProStrategy(None, {}).analyze_df(df.copy()).columns
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+🧮 Indicator Cache Test
+Covers cache hits across frames, result isolation, append parity with the
+pandas_ta accessor and byte-bounded LRU eviction.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pandas_ta  # noqa: F401  (registers the DataFrame accessor)
+
+from core.utils.indicator_cache import CachedTA, IndicatorCache, append_indicator
+
+
+def generate_test_data(periods=500, seed=2):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, periods))
+    return pd.DataFrame({
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.integers(100, 1000, periods),
+    })
+
+
+def test_hit_on_same_data_with_other_index():
+    cache = IndicatorCache()
+    ta = CachedTA(cache)
+    df = generate_test_data()
+    first = ta.sma(df['close'], length=20)
+    shifted = df.set_index(pd.RangeIndex(1000, 1000 + len(df)))
+    second = ta.sma(shifted['close'], length=20)
+
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    assert second.index.equals(shifted.index)
+    np.testing.assert_array_equal(first.to_numpy(), second.to_numpy())
+
+    ta.sma(df['close'], length=21)
+    ta.sma(df['close'] * 2, length=20)
+    assert cache.stats()['misses'] == 3
+
+
+def test_hits_are_isolated_copies():
+    ta = CachedTA(IndicatorCache())
+    df = generate_test_data()
+    first = ta.rsi(df['close'], length=14)
+    first[:] = 0.0
+    second = ta.rsi(df['close'], length=14)
+    assert second.iloc[-1] != 0.0
+
+
+def test_append_matches_accessor():
+    df = generate_test_data()
+    expected = df.copy()
+    expected.ta.bbands(length=20, std=2.0, append=True)
+    for _ in range(2):
+        actual = df.copy()
+        append_indicator(actual, 'bbands', length=20, std=2.0)
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_lru_eviction_by_bytes():
+    df = generate_test_data()
+    entry_bytes = df['close'].to_numpy().nbytes
+    cache = IndicatorCache(max_bytes=entry_bytes * 2)
+    ta = CachedTA(cache)
+    for length in (5, 10, 15):
+        ta.sma(df['close'], length=length)
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1
+    assert stats['bytes'] <= stats['max_bytes']
+
+    ta.sma(df['close'], length=15)
+    ta.sma(df['close'], length=5)
+    assert cache.stats()['hits'] == 1
+
+
+if __name__ == '__main__':
+    test_hit_on_same_data_with_other_index()
+    test_hits_are_isolated_copies()
+    test_append_matches_accessor()
+    test_lru_eviction_by_bytes()
+    print("🎉 Indicator cache tests passed")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+🔬 Intrabar Exit Resolution Test
+Covers the parent -> sub-bar index, SL/TP ordering on ambiguous bars and the
+engine's intrabar mode against the stop-loss-first rule.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from core.backtesting.enhanced_engine import backtest_signal_frame
+from core.backtesting.intrabar import IntrabarIndex, find_intrabar_file, intrabar_window, load_intrabar_data
+
+
+def make_sub_bars(parent_times, minutes=60, seed=5):
+    """M1 bars whose high/low exactly span a random walk inside each parent bar"""
+    rng = np.random.default_rng(seed)
+    times = (pd.DatetimeIndex(parent_times).repeat(minutes)
+             + pd.to_timedelta(np.tile(np.arange(minutes), len(parent_times)), unit='min'))
+    path = 1.1 + np.cumsum(rng.normal(0, 0.0003, len(times)))
+    return pd.DataFrame({'time': times, 'high': path + 0.0001, 'low': path - 0.0001})
+
+
+def parent_from_sub(sub):
+    grouped = sub.groupby(sub['time'].dt.floor('h'))
+    return pd.DataFrame({
+        'time': grouped['time'].first().dt.floor('h').to_numpy(),
+        'open': grouped['high'].first().to_numpy() - 0.0001,
+        'high': grouped['high'].max().to_numpy(),
+        'low': grouped['low'].min().to_numpy(),
+        'close': grouped['low'].last().to_numpy() + 0.0001,
+    })
+
+
+def test_index_ranges_and_gaps():
+    parent_times = pd.to_datetime(['2024-01-05 21:00', '2024-01-05 22:00', '2024-01-08 00:00'])
+    sub = make_sub_bars(parent_times)
+    index = IntrabarIndex(parent_times, sub['time'], sub['high'], sub['low'])
+    # The bar before the weekend gap only covers its own hour
+    assert list(index.starts) == [0, 60, 120]
+    assert list(index.stops) == [60, 120, 180]
+    assert index.coverage() == 1.0
+
+
+def test_stop_loss_first_follows_sub_bar_order():
+    parent_times = pd.to_datetime(['2024-01-01 00:00'])
+    sub_times = pd.date_range('2024-01-01 00:00', periods=4, freq='min')
+    high = np.array([1.10, 1.12, 1.10, 1.10])
+    low = np.array([1.095, 1.09, 1.07, 1.095])
+    index = IntrabarIndex(parent_times, sub_times, high, low)
+    # BUY: TP 1.115 at minute 1 comes before SL 1.075 at minute 2
+    assert index.stop_loss_first(0, True, 1.075, 1.115) is False
+    # SELL: SL 1.115 at minute 1 comes before TP 1.075 at minute 2
+    assert index.stop_loss_first(0, False, 1.115, 1.075) is True
+    # Both on the same sub-bar stays undecided
+    assert index.stop_loss_first(0, True, 1.092, 1.115) is None
+    assert index.stats()['ambiguous_exits'] == 3
+    assert index.stats()['resolved_exits'] == 2
+
+
+def test_engine_intrabar_mode_only_changes_ambiguous_exits():
+    rng = np.random.default_rng(2)
+    sub = make_sub_bars(pd.date_range('2024-01-01', periods=1500, freq='h'))
+    frame = parent_from_sub(sub)
+    frame['ATRr_14'] = (frame['high'] - frame['low']).rolling(14, min_periods=1).mean()
+    frame['signal'] = np.where(rng.random(len(frame)) < 0.2, np.where(rng.random(len(frame)) < 0.5, 'BUY', 'SELL'), 'HOLD')
+    params = {'risk_percent': 1.0, 'sl_atr_multiplier': 0.6, 'tp_atr_multiplier': 0.6}
+
+    base = backtest_signal_frame('MA_CROSSOVER', params, frame, 'EURUSD', {'include_all_trades': True})
+    refined = backtest_signal_frame('MA_CROSSOVER', params, frame, 'EURUSD',
+                                    {'include_all_trades': True, 'intrabar_data': sub})
+    stats = refined['engine_config']['intrabar']
+    assert stats['coverage'] == 1.0
+    assert stats['ambiguous_exits'] > 0
+    assert stats['resolved_exits'] > 0
+    assert base['engine_config']['intrabar'] is None
+    # Refinement turns some assumed stop losses into take profits
+    base_tp = sum(t['reason'] == 'Take Profit' for t in base['trades'])
+    refined_tp = sum(t['reason'] == 'Take Profit' for t in refined['trades'])
+    assert refined_tp > base_tp
+
+    reference = backtest_signal_frame('MA_CROSSOVER', params, frame, 'EURUSD',
+                                      {'simulation_mode': 'reference', 'intrabar_data': sub})
+    assert 'error' in reference
+
+
+def test_intrabar_window_covers_the_last_parent_bar(tmp_path):
+    parent_times = pd.date_range('2024-01-01', periods=5, freq='h')
+    start, end = intrabar_window(parent_times)
+    assert start == pd.Timestamp('2024-01-01 00:00')
+    assert end == pd.Timestamp('2024-01-01 04:59:59')
+
+    # The M1 file runs one hour past the parent data
+    make_sub_bars(pd.date_range('2024-01-01', periods=6, freq='h')).to_csv(tmp_path / 'EURUSD_M1_data.csv', index=False)
+    intrabar_df, timeframe = load_intrabar_data('EURUSD', [str(tmp_path)], start=start, end=end)
+    assert timeframe == 'M1'
+    # All 60 sub-bars of the last H1 bar, and nothing from the next hour
+    assert len(intrabar_df) == 5 * 60
+    assert intrabar_df['time'].iloc[-1] == pd.Timestamp('2024-01-01 04:59')
+    assert IntrabarIndex(parent_times, intrabar_df['time'], intrabar_df['high'], intrabar_df['low']).coverage() == 1.0
+
+    assert intrabar_window(parent_times[:1]) == (pd.Timestamp('2024-01-01'), None)
+
+
+def test_find_intrabar_file_prefers_m1(tmp_path):
+    (tmp_path / 'EURUSD_M5_data.csv').write_text('time,high,low\n')
+    assert find_intrabar_file('EURUSD', [str(tmp_path)])[1] == 'M5'
+    (tmp_path / 'EURUSD_1_data.csv').write_text('time,high,low\n')
+    assert find_intrabar_file('EURUSD', [str(tmp_path)])[1] == 'M1'
+    assert find_intrabar_file('GBPUSD', [str(tmp_path)]) == (None, None)
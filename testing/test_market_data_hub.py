@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+🛰️ Market Data Hub Test
+Drives the shared MarketDataHub against a fake terminal: one fetch per
+cycle for many readers, tail-only refreshes merged by bar time, full
+refetches on gaps and read-only buffers.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.utils import market_data_hub
+from core.utils.market_data_hub import MarketDataHub
+
+H1 = market_data_hub.mt5.TIMEFRAME_H1
+RATES_DTYPE = [('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+               ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')]
+
+
+class FakeTerminal:
+    """copy_rates_from_pos over a bar history whose last bar is forming"""
+
+    def __init__(self, bars=1000):
+        self.history = np.zeros(bars, dtype=RATES_DTYPE)
+        self.history['time'] = 1_700_000_000 + 3600 * np.arange(bars)
+        self.history['close'] = 1.1 + np.cumsum(np.sin(np.arange(bars))) / 1000
+        self.visible = 600
+        self.calls = []
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        self.calls.append(count)
+        return self.history[max(0, self.visible - count):self.visible].copy()
+
+    def tick(self, close):
+        self.history['close'][self.visible - 1] = close
+
+    def new_bar(self, bars=1):
+        self.visible += bars
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    fake = FakeTerminal()
+    monkeypatch.setattr(market_data_hub.mt5, 'copy_rates_from_pos', fake.copy_rates_from_pos, raising=False)
+    return fake
+
+
+def expected_frame(terminal, count):
+    df = pd.DataFrame(terminal.copy_rates_from_pos('EURUSD', H1, 0, count))
+    terminal.calls.pop()
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    return df.set_index('time')
+
+
+def test_readers_in_one_cycle_share_a_fetch(terminal):
+    hub = MarketDataHub(max_age=5, clock=Clock())
+    frames = [hub.get_rates('EURUSD', H1, 250) for _ in range(10)]
+    assert terminal.calls == [250]
+    pd.testing.assert_frame_equal(frames[0], expected_frame(terminal, 250))
+    # Smaller requests are served from the same buffer
+    pd.testing.assert_frame_equal(hub.get_rates('EURUSD', H1, 30), expected_frame(terminal, 30))
+    assert terminal.calls == [250]
+    # Each reader owns its frame
+    frames[0].dropna(inplace=True)
+    frames[0]['close'] = 0.0
+    assert (frames[1]['close'] != 0.0).all()
+    stats = hub.stats()
+    assert stats['requests'] == 11 and stats['hits'] == 10 and stats['full_fetches'] == 1
+
+
+def test_stale_buffer_fetches_only_the_tail(terminal):
+    clock = Clock()
+    hub = MarketDataHub(max_age=5, clock=clock)
+    hub.get_rates('EURUSD', H1, 250)
+    for cycle in range(1, 30):
+        clock.now += 600
+        terminal.tick(1.2 + cycle / 100)
+        if cycle % 6 == 0:
+            terminal.new_bar()
+        pd.testing.assert_frame_equal(hub.get_rates('EURUSD', H1, 250), expected_frame(terminal, 250))
+    # One full fetch, then one or two bars per ten-minute cycle
+    assert terminal.calls[0] == 250 and max(terminal.calls[1:]) <= 3
+    assert hub.stats()['incremental_fetches'] == 29
+
+
+def test_gaps_and_larger_requests_refetch_in_full(terminal):
+    clock = Clock()
+    hub = MarketDataHub(max_age=5, clock=clock)
+    hub.get_rates('EURUSD', H1, 30)
+    # A longer request than the buffer holds
+    pd.testing.assert_frame_equal(hub.get_rates('EURUSD', H1, 250), expected_frame(terminal, 250))
+    assert terminal.calls == [30, 250]
+    # The terminal jumped further ahead than the tail covers
+    clock.now += 3600
+    terminal.new_bar(20)
+    pd.testing.assert_frame_equal(hub.get_rates('EURUSD', H1, 250), expected_frame(terminal, 250))
+    assert terminal.calls == [30, 250, 3, 250]
+    assert hub.stats()['full_fetches'] == 3
+
+
+def test_arrays_are_read_only_views(terminal):
+    hub = MarketDataHub(clock=Clock())
+    rates = hub.get_arrays('EURUSD', H1, 100)
+    assert len(rates) == 100 and not rates.flags.writeable
+    with pytest.raises(ValueError):
+        rates['close'][0] = 0.0
+
+
+def test_missing_data_returns_empty_frame(monkeypatch):
+    monkeypatch.setattr(market_data_hub.mt5, 'copy_rates_from_pos', lambda *args: None, raising=False)
+    hub = MarketDataHub(clock=Clock())
+    assert hub.get_rates('NOPE', H1, 250).empty
+    assert hub.stats()['errors'] == 1
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+🗄️ Columnar Market Data Store Test
+Checks read_csv parity (text columns included), time-range slicing,
+staleness detection and that edits to a loaded frame never reach the stored
+columns.
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from core.utils.market_store import is_stale, load_csv_dataset, store_path_for
+
+
+def write_test_csv(path, periods=1000, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 1.1 * np.cumprod(1 + rng.normal(0, 0.002, periods))
+    pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=periods, freq='h').strftime('%Y-%m-%d %H:%M:%S'),
+        'open': close,
+        'high': close * 1.001,
+        'low': close * 0.999,
+        'close': close,
+        'volume': rng.integers(100, 1000, periods),
+    }).to_csv(path, index=False)
+
+
+def test_load_matches_read_csv_and_slices():
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'EURUSD_H1_data.csv')
+        write_test_csv(csv_path)
+        expected = pd.read_csv(csv_path, parse_dates=['time'])
+
+        assert is_stale(csv_path)
+        pd.testing.assert_frame_equal(load_csv_dataset(csv_path), expected)
+        assert not is_stale(csv_path)
+        assert os.path.exists(os.path.join(store_path_for(csv_path), 'close.npy'))
+
+        window = load_csv_dataset(csv_path, start='2024-01-05', end='2024-01-10 12:00')
+        mask = (expected['time'] >= '2024-01-05') & (expected['time'] <= '2024-01-10 12:00')
+        pd.testing.assert_frame_equal(window, expected[mask].reset_index(drop=True))
+
+        tail = load_csv_dataset(csv_path, tail=100, columns=['close'])
+        assert list(tail.columns) == ['time', 'close'] and len(tail) == 100
+        assert tail['time'].iloc[-1] == expected['time'].iloc[-1]
+
+
+def test_text_columns_are_kept():
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'GBPUSD_H1_data.csv')
+        write_test_csv(csv_path, periods=50)
+        df = pd.read_csv(csv_path)
+        df['symbol'] = 'GBPUSD'
+        df['comment'] = ['news' if i % 7 == 0 else None for i in range(50)]
+        df.to_csv(csv_path, index=False)
+        expected = pd.read_csv(csv_path, parse_dates=['time'])
+
+        loaded = load_csv_dataset(csv_path)
+        pd.testing.assert_frame_equal(loaded, expected)
+        assert loaded['comment'].isna().sum() == 42
+        window = load_csv_dataset(csv_path, start='2024-01-01 07:00', end='2024-01-01 08:00', columns=['comment'])
+        assert window['comment'].iloc[0] == 'news' and pd.isna(window['comment'].iloc[1])
+        assert load_csv_dataset(csv_path, tail=1, columns=['symbol'])['symbol'].iloc[0] == 'GBPUSD'
+
+
+def test_edits_stay_in_memory_and_changes_reconvert():
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'XAUUSD_H1_data.csv')
+        write_test_csv(csv_path)
+        df = load_csv_dataset(csv_path)
+        original = df['close'].iloc[0]
+        df.loc[0, 'close'] = -1.0
+        assert load_csv_dataset(csv_path)['close'].iloc[0] == original
+
+        time.sleep(0.01)
+        write_test_csv(csv_path, periods=800, seed=2)
+        assert is_stale(csv_path)
+        assert len(load_csv_dataset(csv_path)) == 800
+
+
+if __name__ == '__main__':
+    test_load_matches_read_csv_and_slices()
+    test_text_columns_are_kept()
+    test_edits_stay_in_memory_and_changes_reconvert()
+    print("🎉 Market store tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+🎲 Monte Carlo Robustness Test
+Covers trade-return replay, the three resampling methods, risk of ruin and
+losses larger than the account.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from core.backtesting.monte_carlo import run_monte_carlo, trade_returns
+from core.strategies.performance_scorer import PerformanceScorer
+
+
+def generate_trades(count=500, seed=4):
+    rng = np.random.default_rng(seed)
+    return [{'profit': float(p)} for p in rng.normal(5, 100, count)]
+
+
+def test_trade_returns_replay_capital():
+    returns = trade_returns([{'profit': 1000.0}, {'profit': -1100.0}], initial_capital=10000.0)
+    assert np.allclose(returns, [0.1, -0.1])
+
+
+def test_shuffle_preserves_final_capital():
+    """Compounded returns are order-independent, so only drawdowns vary under shuffle"""
+    trades = generate_trades()
+    result = run_monte_carlo(trades, n_paths=500, method='shuffle', seed=1)
+    original = result['original']['final_capital']
+    assert result['final_capital']['p5'] == pytest.approx(original, abs=0.05)
+    assert result['final_capital']['p95'] == pytest.approx(original, abs=0.05)
+    assert result['max_drawdown_percent']['p5'] <= result['max_drawdown_percent']['p95']
+
+
+def test_bootstrap_is_seeded_and_ordered():
+    trades = generate_trades()
+    first = run_monte_carlo(trades, n_paths=2000, seed=7, include_bands=True)
+    second = run_monte_carlo(trades, n_paths=2000, seed=7, include_bands=True)
+    assert first == second
+    dist = first['final_capital']
+    assert dist['p5'] <= dist['p25'] <= dist['p50'] <= dist['p75'] <= dist['p95']
+    assert len(first['equity_bands']['p50']) == len(trades) + 1
+
+
+def test_skip_and_ruin():
+    """A steadily losing trade list is ruined even with some trades skipped"""
+    losing = [{'profit': -400.0}] * 40
+    result = run_monte_carlo(losing, n_paths=200, method='skip', skip_fraction=0.2, seed=3)
+    assert result['risk_of_ruin'] == 1.0
+    assert result['probability_of_profit'] == 0.0
+    assert run_monte_carlo([], n_paths=10) == {"error": "No trades to resample"}
+
+
+def test_losing_more_than_the_account_is_absorbing():
+    """Two losses beyond the whole account must not multiply back into a profit"""
+    trades = [{'profit': -15000.0}, {'profit': 100.0}]
+    result = run_monte_carlo(trades, n_paths=2000, seed=5, include_bands=True)
+    assert result['original']['final_capital'] == 0.0
+    assert result['original']['max_drawdown_percent'] == 100.0
+    assert result['final_capital']['p95'] <= 10000.0
+    assert 0.0 <= result['final_capital']['mean'] < 10000.0
+    assert result['probability_of_profit'] == 0.0
+    assert result['max_drawdown_percent']['worst'] == 100.0
+    assert min(result['equity_bands']['p5']) == 0.0
+
+
+def test_confidence_bands_use_the_given_capital():
+    backtest = {'trades': [{'profit': 500.0}, {'profit': -200.0}], 'total_trades': 2}
+    bands = PerformanceScorer().calculate_confidence_bands(backtest, initial_capital=5000.0, n_paths=50, seed=1)
+    assert bands['initial_capital'] == 5000.0
+    assert bands['original']['final_capital'] == pytest.approx(5300.0)
+
+
+if __name__ == '__main__':
+    test_trade_returns_replay_capital()
+    test_shuffle_preserves_final_capital()
+    test_bootstrap_is_seeded_and_ordered()
+    test_skip_and_ruin()
+    test_losing_more_than_the_account_is_absorbing()
+    test_confidence_bands_use_the_given_capital()
+    print("🎉 Monte Carlo tests passed")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+🔔 Notification Feed & Stream Test
+Covers the in-process Topic pub/sub, the cursor-based notification feed
+and the Server-Sent Events stream fed by add_history_log once the batch
+writer has committed the rows.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+import core.routes.api_notifications as api_notifications_module
+from core.db import queries
+from core.db.batch_writer import BatchWriter
+from core.db.connection import ConnectionPool, connect_db
+from core.db.migrations import apply_migrations
+from core.routes.api_notifications import api_notifications
+from core.utils.pubsub import Topic
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = str(tmp_path / 'bots.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE bots (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL)")
+        conn.execute('''CREATE TABLE trade_history (id INTEGER PRIMARY KEY AUTOINCREMENT, bot_id INTEGER NOT NULL,
+                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, action TEXT NOT NULL, details TEXT,
+                        is_notification INTEGER NOT NULL DEFAULT 0, is_read INTEGER NOT NULL DEFAULT 0)''')
+        conn.execute("INSERT INTO bots (name) VALUES ('Gold Bot')")
+        apply_migrations(conn)
+    pool = ConnectionPool(path)
+    writer = BatchWriter(connect=lambda: connect_db(path), flush_interval=0.05)
+    monkeypatch.setattr(queries, 'get_db_connection', pool.acquire)
+    monkeypatch.setattr(queries, 'db_writer', writer)
+    monkeypatch.setattr(queries, 'notification_topic', Topic('notifications'))
+    monkeypatch.setattr(api_notifications_module, 'STREAM_KEEPALIVE_SECONDS', 0.1)
+    app = Flask(__name__)
+    app.register_blueprint(api_notifications)
+    yield app.test_client()
+    writer.close()
+    pool.close_all()
+
+
+def read_events(response, count, keepalives=False, timeout=5):
+    """Parse SSE chunks until `count` events arrived (keep-alives count as ':' only if asked)"""
+    events, deadline = [], time.monotonic() + timeout
+    chunks = response.iter_encoded()
+    while len(events) < count and time.monotonic() < deadline:
+        chunk = next(chunks).decode()
+        if chunk.startswith('retry:'):
+            continue
+        if chunk.startswith(':'):
+            if keepalives:
+                events.append((':', None, None))
+            continue
+        fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+        events.append((fields['event'], fields.get('id'), json.loads(fields['data'])))
+    return events
+
+
+def test_topic_wakes_readers_and_coalesces_per_key():
+    topic = Topic('test')
+    assert topic.wait_for_change(0, timeout=0.01) == 0
+    for price in (1.1, 1.2, 1.3):
+        topic.publish('EURUSD', price)
+    topic.publish('XAUUSD', 2400.0)
+    version, changes = topic.changes_since(0)
+    assert version == 4 and changes == {'EURUSD': 1.3, 'XAUUSD': 2400.0}
+    assert topic.changes_since(3) == (4, {'XAUUSD': 2400.0})
+
+    woke = []
+    reader = threading.Thread(target=lambda: woke.append(topic.wait_for_change(4, timeout=5)))
+    reader.start()
+    time.sleep(0.05)
+    assert topic.stats()['waiting'] == 1
+    topic.publish()
+    reader.join(5)
+    assert woke == [5] and topic.stats()['waiting'] == 0
+
+
+def test_feed_returns_only_rows_after_the_cursor(client):
+    for i in range(5):
+        queries.add_history_log(1, 'INFO', f'log {i}')
+        queries.add_history_log(1, 'BUY', f'notif {i}', is_notification=True)
+    queries.db_writer.flush(timeout=5)
+
+    page = client.get('/api/notifications/feed?limit=3').get_json()
+    assert [n['details'] for n in page['notifications']] == ['notif 0', 'notif 1', 'notif 2']
+    assert page['has_more'] and page['notifications'][0]['bot_name'] == 'Gold Bot'
+    page = client.get(f"/api/notifications/feed?after={page['cursor']}&limit=3").get_json()
+    assert [n['details'] for n in page['notifications']] == ['notif 3', 'notif 4'] and not page['has_more']
+    page = client.get(f"/api/notifications/feed?after={page['cursor']}").get_json()
+    assert page['notifications'] == [] and page['cursor'] > 0
+
+    queries.mark_notifications_as_read([page['cursor']])
+    unread = client.get('/api/notifications/feed?unread=1').get_json()['notifications']
+    assert [n['details'] for n in unread] == ['notif 0', 'notif 1', 'notif 2', 'notif 3']
+
+
+def test_stream_pushes_committed_notifications(client):
+    queries.add_history_log(1, 'BUY', 'already unread', is_notification=True)
+    queries.db_writer.flush(timeout=5)
+    topic = queries.notification_topic
+    response = client.get('/api/notifications/stream')
+    # New client: unread backlog first, then the unread count
+    (event, event_id, data), (count_event, _, count) = read_events(response, 2)
+    assert (event, data['details']) == ('notification', 'already unread')
+    assert count_event == 'unread-count' and count == {'unread_count': 1}
+    # Idle: only keep-alives, no queries and no publishes
+    assert read_events(response, 1, keepalives=True) == [(':', None, None)]
+    published = topic.stats()['published']
+
+    threading.Timer(0.2, lambda: [queries.add_history_log(1, 'INFO', 'not pushed'),
+                                  queries.add_history_log(1, 'SELL', 'pushed', is_notification=True)]).start()
+    events = read_events(response, 2)
+    assert [e[0] for e in events] == ['notification', 'unread-count'] and events[1][2] == {'unread_count': 2}
+    assert events[0][2]['details'] == 'pushed' and int(events[0][1]) == events[0][2]['id']
+    # One publish per committed batch, and only for notifications
+    assert topic.stats()['published'] == published + 1
+    response.close()
+
+    # Reconnect with Last-Event-ID resumes after that notification
+    queries.add_history_log(1, 'TP', 'after reconnect', is_notification=True)
+    queries.db_writer.flush(timeout=5)
+    response = client.get('/api/notifications/stream', headers={'Last-Event-ID': events[0][1]})
+    (event, _, data), = read_events(response, 1)
+    assert (event, data['details']) == ('notification', 'after reconnect')
+    response.close()
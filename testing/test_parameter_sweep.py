@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+🔬 Parameter Sweep Optimizer Test
+Covers grid/random combination building, ranking and checkpoint resume.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.backtesting import optimizer
+from core.backtesting.optimizer import build_param_combinations, run_parameter_sweep
+
+
+def generate_test_data(periods=1500, seed=3):
+    """Random-walk EURUSD-like H1 data"""
+    rng = np.random.default_rng(seed)
+    close = 1.10 * np.cumprod(1 + rng.normal(0, 0.002, periods))
+    spread = np.abs(rng.normal(0, 0.001, periods)) * close
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=periods, freq='h'),
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(100, 1000, periods),
+    })
+
+
+def test_grid_combinations():
+    """Grid mode expands ranges into the full cartesian product"""
+    combos = build_param_combinations('MA_CROSSOVER', {
+        'fast_period': {'min': 5, 'max': 15, 'step': 5},
+        'slow_period': [50, 100],
+        'sl_atr_multiplier': [1.5],
+    })
+    assert len(combos) == 6
+    assert {'fast_period': 10, 'slow_period': 100, 'sl_atr_multiplier': 1.5} in combos
+
+
+def test_random_combinations_are_reproducible():
+    """Random mode is seeded so a resumed sweep draws the same combinations"""
+    ranges = {'bb_std': {'min': 1.5, 'max': 2.5}, 'adx_period': {'min': 10, 'max': 20}}
+    first = build_param_combinations('QUANTUMBOTX_HYBRID', ranges, mode='random', n_samples=15, seed=9)
+    second = build_param_combinations('QUANTUMBOTX_HYBRID', ranges, mode='random', n_samples=15, seed=9)
+    assert first == second and len(first) == 15
+
+
+def test_unknown_params_rejected():
+    with pytest.raises(ValueError):
+        build_param_combinations('MA_CROSSOVER', {'not_a_param': [1, 2]})
+
+
+def test_sweep_ranks_and_resumes():
+    """A second run over the same checkpoint re-simulates nothing and ranks identically"""
+    df = generate_test_data()
+    ranges = {'fast_period': [10, 20], 'slow_period': [40, 60]}
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, 'sweep.jsonl')
+        first = run_parameter_sweep('MA_CROSSOVER', df, ranges, 'EURUSD', workers=1, checkpoint_path=checkpoint)
+        second = run_parameter_sweep('MA_CROSSOVER', df, ranges, 'EURUSD', workers=1, checkpoint_path=checkpoint)
+
+    assert first['total_combinations'] == 4
+    assert second['resumed_from_checkpoint'] == 4
+    profits = [row['total_profit_usd'] for row in first['results']]
+    assert profits == sorted(profits, reverse=True)
+    assert [row['rank'] for row in first['results']] == [1, 2, 3, 4]
+    assert profits == [row['total_profit_usd'] for row in second['results']]
+    # The in-process path leaves no DataFrame pinned in the worker global
+    assert optimizer._worker_state == {}
+
+
+
+def test_resume_rejects_changed_settings():
+    """A checkpoint is only reused for the same fixed params, engine settings and sampling"""
+    df = generate_test_data(600)
+    ranges = {'fast_period': [10, 20], 'slow_period': [40]}
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, 'sweep.jsonl')
+        run_parameter_sweep('MA_CROSSOVER', df, ranges, 'EURUSD', workers=1, checkpoint_path=checkpoint,
+                            base_params={'sl_atr_multiplier': 2.0})
+        with pytest.raises(ValueError):
+            run_parameter_sweep('MA_CROSSOVER', df, ranges, 'EURUSD', workers=1, checkpoint_path=checkpoint,
+                                base_params={'sl_atr_multiplier': 1.0})
+        with pytest.raises(ValueError):
+            run_parameter_sweep('MA_CROSSOVER', df, ranges, 'EURUSD', workers=1, checkpoint_path=checkpoint,
+                                base_params={'sl_atr_multiplier': 2.0}, engine_config={'simulation_mode': 'loop'})
+        with pytest.raises(ValueError):
+            run_parameter_sweep('MA_CROSSOVER', df, {'fast_period': [10], 'slow_period': [40]}, 'EURUSD',
+                                workers=1, checkpoint_path=checkpoint, base_params={'sl_atr_multiplier': 2.0})
+        resumed = run_parameter_sweep('MA_CROSSOVER', df, ranges, 'EURUSD', workers=1, checkpoint_path=checkpoint,
+                                      base_params={'sl_atr_multiplier': 2.0})
+    assert resumed['resumed_from_checkpoint'] == 2
+
+
+if __name__ == '__main__':
+    test_grid_combinations()
+    test_random_combinations_are_reproducible()
+    test_unknown_params_rejected()
+    test_sweep_ranks_and_resumes()
+    test_resume_rejects_changed_settings()
+    print("🎉 Parameter sweep tests passed")
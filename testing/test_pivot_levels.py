@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+📐 Pivot Support/Resistance Test
+Checks the rolling-window pivot detector against the per-bar slice scan it
+replaced, the sort-based level clustering and IndexBreakoutPro's live analysis.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+
+from core.strategies.index_breakout_pro import IndexBreakoutProStrategy
+from core.utils.pivots import cluster_levels, pivot_levels, pivot_points
+
+
+def scan_levels(df, lookback):
+    """The O(n * lookback) scan IndexBreakoutPro used before"""
+    levels = []
+    for i in range(lookback, len(df) - lookback):
+        if (df['high'].iloc[i] > df['high'].iloc[i-lookback:i].max() and
+                df['high'].iloc[i] > df['high'].iloc[i+1:i+lookback+1].max()):
+            levels.append({'level': df['high'].iloc[i], 'type': 'resistance', 'strength': 1})
+        if (df['low'].iloc[i] < df['low'].iloc[i-lookback:i].min() and
+                df['low'].iloc[i] < df['low'].iloc[i+1:i+lookback+1].min()):
+            levels.append({'level': df['low'].iloc[i], 'type': 'support', 'strength': 1})
+    return levels
+
+
+def load_sp500(bars):
+    df = pd.read_csv(os.path.join(project_root, 'lab', 'SP500m_16385_data.csv'), parse_dates=['time'])
+    return df.tail(bars).reset_index(drop=True)
+
+
+def test_pivots_match_slice_scan():
+    df = load_sp500(1500)
+    for lookback in (5, 20):
+        assert pivot_levels(df, lookback) == scan_levels(df, lookback)
+
+
+def test_pivots_need_strict_extremes_and_full_windows():
+    high = np.array([1, 2, 3, 2, 3, 1, 4, 1, 2, 9], dtype=float)
+    low = np.array([5, 4, 3, 4, 5, 4, 3, 4, 5, 0], dtype=float)
+    pivot_high, pivot_low = pivot_points(high, low, 2)
+    # Bar 2 only ties bar 4; bar 9 is the extreme but has no right window
+    assert list(np.flatnonzero(pivot_high)) == [6]
+    assert list(np.flatnonzero(pivot_low)) == [2, 6]
+    assert not pivot_points(high, low, 5)[0].any()
+
+
+def test_cluster_levels_groups_by_price():
+    levels = [
+        {'level': 100.0, 'type': 'resistance', 'strength': 1},
+        {'level': 110.0, 'type': 'support', 'strength': 1},
+        {'level': 100.1, 'type': 'support', 'strength': 1},
+        {'level': 100.15, 'type': 'resistance', 'strength': 1},
+        # More than 0.2% above the 100.0 anchor, starts a new cluster
+        {'level': 100.25, 'type': 'support', 'strength': 1},
+    ]
+    clusters = cluster_levels(levels)
+    assert clusters[0] == {'level': (100.0 + 100.1 + 100.15) / 3, 'type': 'resistance', 'strength': 3}
+    # Ties keep the order in which their first level appeared
+    assert [c['level'] for c in clusters[1:]] == [110.0, 100.25]
+    assert len(cluster_levels(levels, max_levels=2)) == 2
+    assert cluster_levels([]) == []
+
+
+def test_live_analysis_uses_shared_levels():
+    strategy = IndexBreakoutProStrategy(None, {})
+    df = load_sp500(250)
+    levels = strategy._identify_support_resistance(df.copy())
+    assert 0 < len(levels) <= 10
+    assert sum(level['strength'] for level in levels) <= len(scan_levels(df, 20))
+    assert strategy.analyze(df.copy())['signal'] in ('BUY', 'SELL', 'HOLD')
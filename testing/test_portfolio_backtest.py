@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+📊 Portfolio Backtest Test
+Checks single-symbol parity with run_enhanced_backtest, per-symbol attribution
+and the shared position cap.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.backtesting.enhanced_engine import run_enhanced_backtest
+from core.backtesting.portfolio import run_portfolio_backtest
+
+
+def generate_test_data(base_price=1.1, periods=2000, seed=5, start='2024-01-01'):
+    """Random-walk H1 data"""
+    rng = np.random.default_rng(seed)
+    close = base_price * np.cumprod(1 + rng.normal(0, 0.002, periods))
+    spread = np.abs(rng.normal(0, 0.001, periods)) * close
+    return pd.DataFrame({
+        'time': pd.date_range(start, periods=periods, freq='h'),
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(100, 1000, periods),
+    })
+
+
+def test_single_symbol_matches_enhanced_engine():
+    """One symbol in a portfolio trades exactly like the single-symbol engine"""
+    df = generate_test_data()
+    single = run_enhanced_backtest('MA_CROSSOVER', {}, df, 'EURUSD', {'include_all_trades': True})
+    portfolio = run_portfolio_backtest({'EURUSD': df}, {'EURUSD': 'MA_CROSSOVER'},
+                                       engine_config={'include_all_trades': True})
+    assert portfolio['total_trades'] == single['total_trades'] > 0
+    assert portfolio['final_capital'] == single['final_capital']
+    assert portfolio['equity_curve'] == single['equity_curve']
+    assert portfolio['max_drawdown_percent'] == single['max_drawdown_percent']
+
+
+def test_attribution_and_position_cap():
+    data = {
+        'EURUSD': generate_test_data(seed=1),
+        'USDJPY': generate_test_data(base_price=150.0, seed=2, start='2024-01-01 00:00'),
+        'XAUUSD': generate_test_data(base_price=2300.0, seed=3, start='2024-01-10'),
+    }
+    assignments = {
+        'EURUSD': 'MA_CROSSOVER',
+        'USDJPY': {'strategy_id': 'RSI_CROSSOVER', 'params': {'risk_percent': 0.5}},
+        'XAUUSD': 'MA_CROSSOVER',
+        'GBPUSD': 'NOT_A_STRATEGY',
+    }
+    result = run_portfolio_backtest(data, assignments)
+    assert result['symbol_errors'] == {'GBPUSD': 'Strategy not found'}
+    assert set(result['symbols']) == {'EURUSD', 'USDJPY', 'XAUUSD'}
+    assert sum(s['total_trades'] for s in result['symbols'].values()) == result['total_trades']
+    assert sum(s['profit_usd'] for s in result['symbols'].values()) == pytest.approx(result['total_profit_usd'], abs=0.05)
+    assert result['equity_times'] == sorted(result['equity_times'])
+
+    capped = run_portfolio_backtest(data, assignments, max_open_positions=1)
+    assert capped['total_trades'] < result['total_trades']
+
+
+if __name__ == '__main__':
+    test_single_symbol_matches_enhanced_engine()
+    test_attribution_and_position_cap()
+    print("🎉 Portfolio backtest tests passed")
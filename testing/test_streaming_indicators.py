@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+📡 Streaming Indicator Test
+Checks the per-bot IndicatorStream against full pandas_ta recomputation,
+its bar-close bookkeeping (forming bar, revisions, fallbacks) and that live
+strategy signals are unchanged when it serves their indicators.
+"""
+
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+import pandas_ta
+
+from core.strategies.strategy_map import STRATEGY_MAP
+from core.utils.indicator_cache import append_indicator, ta
+from core.utils.streaming_indicators import IndicatorStream
+
+CALLS = [
+    ('sma', ('close',), {'length': 20}),
+    ('ema', ('close',), {'length': 50}),
+    ('rsi', ('close',), {'length': 14}),
+    ('atr', ('high', 'low', 'close'), {'length': 14}),
+    ('bbands', ('close',), {'length': 20, 'std': 2.0}),
+    ('macd', ('close',), {'fast': 12, 'slow': 26, 'signal': 9}),
+    ('stoch', ('high', 'low', 'close'), {'k': 14, 'd': 3, 'smooth_k': 3}),
+    ('adx', ('high', 'low', 'close'), {'length': 14}),
+]
+
+
+def load_rates(bars=600):
+    """Lab bars shaped like get_rates_mt5 output (time index)"""
+    df = pd.read_csv(os.path.join(project_root, 'lab', 'XAUUSD_16385_data.csv'), parse_dates=['time'])
+    return df.set_index('time').iloc[:bars]
+
+
+def streamed(stream, name, columns, params, frame):
+    with stream.activate():
+        return getattr(ta, name)(*[frame[c] for c in columns], **params)
+
+
+def assert_same_values(expected, actual):
+    assert type(expected) is type(actual)
+    if isinstance(expected, pd.DataFrame):
+        assert list(actual.columns) == list(expected.columns)
+    else:
+        assert actual.name == expected.name
+    assert actual.index.equals(expected.index)
+    np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float),
+                               rtol=1e-7, atol=1e-9, equal_nan=True)
+
+
+def test_stream_matches_full_history_recomputation():
+    rates = load_rates()
+    stream = IndicatorStream()
+    for end in range(60, len(rates), 9):
+        frame = rates.iloc[:end].copy()
+        # The forming bar keeps ticking between bar closes
+        for tick in (0.0, 0.4, -0.7):
+            frame.iloc[-1, frame.columns.get_loc('close')] += tick
+            stream.sync(frame)
+            for name, columns, params in CALLS:
+                expected = getattr(pandas_ta, name)(*[frame[c] for c in columns], **params)
+                assert_same_values(expected, streamed(stream, name, columns, params, frame))
+    stats = stream.stats()
+    assert stats['closed_bars'] == end - 1
+    assert stats['reseeds'] == 0 and stats['fallbacks'] == 0
+    assert stats['indicators'] == len(CALLS)
+
+
+def test_sliding_window_only_advances_on_bar_close():
+    rates = load_rates()
+    stream = IndicatorStream()
+    for end in range(300, 340):
+        frame = rates.iloc[end - 250:end]
+        for _ in range(3):
+            stream.sync(frame)
+        # Past the window's own warm-up, windowed indicators equal a
+        # recomputation on the polled window
+        for name, columns, params in (CALLS[0], CALLS[4], CALLS[6]):
+            expected = getattr(pandas_ta, name)(*[frame[c] for c in columns], **params)
+            actual = streamed(stream, name, columns, params, frame)
+            assert_same_values(expected.iloc[30:], actual.iloc[30:])
+        with stream.activate():
+            appended = append_indicator(frame.copy(), 'bbands', length=20, std=2.0)
+        assert_same_values(pandas_ta.bbands(frame['close'], length=20, std=2.0).iloc[30:], appended.iloc[30:])
+    # 249 closed bars from the first window, then one per new window
+    assert stream.stats()['closed_bars'] == 249 + 39
+
+
+def test_revisions_reseed_and_unknown_calls_fall_back():
+    rates = load_rates(400)
+    stream = IndicatorStream()
+    stream.sync(rates.iloc[:300])
+    streamed(stream, 'ema', ('close',), {'length': 20}, rates.iloc[:300])
+
+    revised = rates.iloc[:301].copy()
+    revised.iloc[298, revised.columns.get_loc('close')] += 5.0
+    stream.sync(revised)
+    assert stream.stats()['reseeds'] == 1
+    assert_same_values(pandas_ta.ema(revised['close'], length=20),
+                       streamed(stream, 'ema', ('close',), {'length': 20}, revised))
+
+    # A jump past the stream's last closed bar also rebuilds it
+    stream.sync(rates.iloc[350:400])
+    assert stream.stats()['reseeds'] == 2
+
+    frame = rates.iloc[350:400]
+    before = stream.stats()['served']
+    with stream.activate():
+        ta.sma((frame['high'] + frame['low']) / 2, length=10)  # derived series
+        ta.ema(frame['close'], length=10, offset=1)              # unsupported option
+    assert stream.stats()['served'] == before
+    assert stream.stats()['fallbacks'] == 2
+
+
+def test_live_signals_unchanged_with_stream():
+    rates = load_rates()
+
+    class Bot:
+        market_for_mt5 = 'XAUUSD'
+        in_position = False
+        position_type = None
+
+    for strategy_id in ('MA_CROSSOVER', 'QUANTUMBOTX_HYBRID', 'MERCY_EDGE'):
+        strategy = STRATEGY_MAP[strategy_id](Bot(), {})
+        stream = IndicatorStream()
+        for end in range(300, len(rates), 5):
+            frame = rates.iloc[end - 250:end]
+            plain = strategy.analyze(frame.copy())
+            stream.sync(frame)
+            with stream.activate():
+                fast = strategy.analyze(frame.copy())
+            assert fast['signal'] == plain['signal']
+        assert stream.stats()['served'] > 0